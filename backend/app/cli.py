@@ -0,0 +1,158 @@
+"""
+CLI Commands Module
+
+This module registers the application's ``flask`` CLI command groups.
+"""
+
+import json
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from . import db
+from .models.product_search import install_search_index
+from .services.category_service import CategoryService
+from .services.export_service import ProductExportService
+from .services.import_service import ProductImportService
+from .services.inventory_service import InventoryService, ReservationSweeper
+from .services.outbox_service import OutboxService, OutboxWorkerPool
+from .utils.catalog_generator import generate_catalog
+from .utils.db_init import init_db
+
+search_cli = AppGroup('search', help='Manage the product full-text index.')
+
+@search_cli.command('install-index')
+def install_index_command():
+    """Create or rebuild the full-text index on an existing database."""
+    with db.engine.begin() as connection:
+        if install_search_index(connection):
+            click.echo('Full-text index installed.')
+        else:
+            click.echo(f'{connection.dialect.name} has no full-text support; search uses ilike.')
+
+outbox_cli = AppGroup('outbox', help='Deliver queued emails.')
+
+@outbox_cli.command('run')
+@click.option('--workers', default=2, show_default=True, help='Worker threads.')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Seconds between polls when idle.')
+def run_outbox_command(workers, poll_interval):
+    """Run outbox workers until interrupted."""
+    pool = OutboxWorkerPool(current_app._get_current_object(), workers, poll_interval)
+    pool.start()
+    click.echo(f'Outbox running with {workers} worker(s). Press Ctrl+C to stop.')
+    try:
+        while not pool.wait(3600):
+            pass
+    except KeyboardInterrupt:
+        pool.stop(timeout=30)
+
+@outbox_cli.command('drain')
+def drain_outbox_command():
+    """Deliver every due message, then exit."""
+    total = 0
+    while True:
+        claimed = OutboxService.run_once()
+        if not claimed:
+            break
+        total += claimed
+    click.echo(f'Processed {total} message(s).')
+
+@outbox_cli.command('requeue-dead')
+def requeue_dead_command():
+    """Retry dead-lettered messages."""
+    click.echo(f'Requeued {OutboxService.requeue_dead()} message(s).')
+
+catalog_cli = AppGroup('catalog', help='Manage the product catalog.')
+
+@catalog_cli.command('import-products')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension.')
+@click.option('--batch-size', default=1000, show_default=True)
+def import_products_command(path, fmt, batch_size):
+    """Stream-import products from a CSV or NDJSON file."""
+    fmt = fmt or ProductImportService.detect_format(path, None)
+    if not fmt:
+        raise click.UsageError('Cannot detect the format from the file name; pass --format.')
+    with open(path, 'rb') as stream:
+        report = ProductImportService.import_products(stream, fmt, batch_size=batch_size)
+    click.echo(json.dumps(report, indent=2))
+
+@catalog_cli.command('export-products')
+@click.argument('output', type=click.File('w', encoding='utf-8'))
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--fields', help='Comma-separated columns to export.')
+@click.option('--updated-since', help='Only products updated at or after this ISO 8601 time.')
+def export_products_command(output, fmt, fields, updated_since):
+    """Stream the product catalog to OUTPUT ('-' for stdout)."""
+    for chunk in ProductExportService.generate(
+        fmt,
+        ProductExportService.parse_fields(fields),
+        ProductExportService.parse_since(updated_since)
+    ):
+        output.write(chunk)
+
+@catalog_cli.command('seed')
+@click.option('--file', 'path', type=click.Path(exists=True, dir_okay=False), help='Defaults to utils/seed_data.json.')
+def seed_command(path):
+    """Recreate all tables and load the seed categories and products."""
+    init_db(path)
+
+@catalog_cli.command('generate')
+@click.option('--products', default=100_000, show_default=True)
+@click.option('--categories', default=200, show_default=True)
+@click.option('--branching', default=8, show_default=True, help='Average children per category.')
+@click.option('--depth', default=3, show_default=True, help='Maximum category tree depth.')
+@click.option('--seed', default=42, show_default=True)
+@click.option('--batch-size', default=5000, show_default=True)
+@click.option('--reset/--no-reset', default=False, help='Drop and recreate all tables first.')
+def generate_catalog_command(products, categories, branching, depth, seed, batch_size, reset):
+    """Fill the database with a deterministic synthetic catalog."""
+    if reset:
+        db.drop_all()
+        db.create_all()
+
+    def progress(done, total):
+        click.echo(f'\r{done}/{total} products', nl=False)
+
+    summary = generate_catalog(
+        products, categories, branching, depth, seed, batch_size, progress=progress
+    )
+    click.echo()
+    click.echo(json.dumps(summary, indent=2))
+
+@catalog_cli.command('rebuild-category-paths')
+def rebuild_category_paths_command():
+    """Recompute category paths, e.g. after bulk inserts or adding the column."""
+    click.echo(f'Updated {CategoryService.rebuild_paths()} category path(s).')
+
+inventory_cli = AppGroup('inventory', help='Manage stock reservations.')
+
+@inventory_cli.command('sweep')
+@click.option('--batch-size', default=500, show_default=True)
+def sweep_reservations_command(batch_size):
+    """Release every expired reservation, then exit."""
+    total = 0
+    while True:
+        released = InventoryService.release_expired(batch_size)
+        total += released
+        if released < batch_size:
+            break
+    click.echo(f'Released {total} reservation line(s).')
+
+@inventory_cli.command('sweeper')
+@click.option('--interval', default=30.0, show_default=True, help='Seconds between sweeps.')
+def run_sweeper_command(interval):
+    """Release expired reservations until interrupted."""
+    sweeper = ReservationSweeper(current_app._get_current_object(), interval)
+    sweeper.start()
+    click.echo(f'Reservation sweeper running every {interval:g}s. Press Ctrl+C to stop.')
+    try:
+        while not sweeper.wait(3600):
+            pass
+    except KeyboardInterrupt:
+        sweeper.stop(timeout=30)
+
+def init_app(app):
+    app.cli.add_command(search_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(catalog_cli)
+    app.cli.add_command(inventory_cli)
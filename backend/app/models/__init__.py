@@ -4,5 +4,8 @@ from .user import User
 from .product import Product
 from .category import Category
 from .order import Order
+from .email_outbox import EmailOutbox
+from .stock_reservation import StockReservation
+from . import product_search  # noqa: F401  (registers the full-text index DDL)
 
-__all__ = ['BaseModel', 'User', 'Category', 'Product', 'Order']
+__all__ = ['BaseModel', 'User', 'Category', 'Product', 'Order', 'EmailOutbox', 'StockReservation']
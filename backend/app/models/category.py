@@ -1,8 +1,16 @@
+from sqlalchemy import event, inspect, literal, select, func
+from sqlalchemy.orm.attributes import set_committed_value
 from .. import db
 from .base import BaseModel
+from ..utils.cache import track_changes
+from ..utils.exceptions import ValidationError
 
 class Category(BaseModel):
     __tablename__ = 'categories'
+    __table_args__ = (
+        # text_pattern_ops lets PostgreSQL use the index for ``LIKE 'prefix%'``
+        db.Index('ix_categories_path', 'path', postgresql_ops={'path': 'text_pattern_ops'}),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -12,13 +20,16 @@ class Category(BaseModel):
     slug = db.Column(db.String(100), unique=True, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     display_order = db.Column(db.Integer, default=0)
+    # Materialized path of ancestor ids ending with this one, e.g. '/1/4/';
+    # a subtree is every row whose path starts with its root's path
+    path = db.Column(db.String(255))
     
     subcategories = db.relationship(
         'Category', 
         backref=db.backref('parent', remote_side=[id]),
         cascade='all, delete-orphan'
     )
-    products = db.relationship('Product', lazy='dynamic')
+    products = db.relationship('Product', back_populates='category', lazy='dynamic')
     
     def __repr__(self):
         return f'<Category {self.name}>'
@@ -33,6 +44,51 @@ class Category(BaseModel):
             'slug': self.slug,
             'is_active': self.is_active,
             'display_order': self.display_order,
+            'path': self.path,
             'subcategories': [child.to_dict() for child in self.subcategories],
             'products': [product.to_dict() for product in self.products]
         }
+
+def _parent_path(connection, parent_id):
+    if parent_id is None:
+        return '/'
+    table = Category.__table__
+    return connection.execute(
+        select(table.c.path).where(table.c.id == parent_id)
+    ).scalar() or f'/{parent_id}/'
+
+@event.listens_for(Category, 'after_insert')
+def _set_path(mapper, connection, target):
+    """Give a new category its path once its id is known."""
+    path = f'{_parent_path(connection, target.parent_id)}{target.id}/'
+    table = Category.__table__
+    connection.execute(table.update().where(table.c.id == target.id).values(path=path))
+    set_committed_value(target, 'path', path)
+
+@event.listens_for(Category, 'before_update')
+def _check_move(mapper, connection, target):
+    """Refuse to move a category under itself or one of its descendants."""
+    if not inspect(target).attrs.parent_id.history.has_changes() or target.parent_id is None:
+        return
+    if target.parent_id == target.id or f'/{target.id}/' in _parent_path(connection, target.parent_id):
+        raise ValidationError("A category cannot be moved under itself or its descendants")
+
+@event.listens_for(Category, 'after_update')
+def _move_subtree(mapper, connection, target):
+    """Rewrite the path prefix of a moved category and all its descendants."""
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    old_path = target.path
+    new_path = f'{_parent_path(connection, target.parent_id)}{target.id}/'
+    table = Category.__table__
+    if old_path:
+        connection.execute(
+            table.update()
+            .where(table.c.path.like(f'{old_path}%'))
+            .values(path=literal(new_path) + func.substr(table.c.path, len(old_path) + 1))
+        )
+    else:
+        connection.execute(table.update().where(table.c.id == target.id).values(path=new_path))
+    set_committed_value(target, 'path', new_path)
+
+track_changes(Category, lambda category: ('categories',))
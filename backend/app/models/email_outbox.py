@@ -0,0 +1,46 @@
+from datetime import datetime
+from .. import db
+from .base import BaseModel
+
+class EmailOutbox(BaseModel):
+    """
+    A queued email. Requests only insert rows; ``services.outbox_service``
+    delivers them in batches and records the outcome.
+
+    Status moves from ``pending`` to ``sending`` (claimed by a worker until
+    ``next_attempt_at``) and ends as ``sent``, or ``dead`` once
+    ``attempts`` reaches the retry limit.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    sender = db.Column(db.String(120))
+    recipients = db.Column(db.Text, nullable=False)  # comma-separated
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text)
+    html = db.Column(db.Text)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(36), index=True)
+    last_error = db.Column(db.Text)
+    sent_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<EmailOutbox {self.id} {self.status}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'recipients': self.recipients.split(','),
+            'subject': self.subject,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
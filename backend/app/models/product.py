@@ -1,8 +1,19 @@
 from .. import db
 from .base import BaseModel
+from ..utils.cache import track_changes
 
 class Product(BaseModel):
     __tablename__ = 'products'
+    __table_args__ = (
+        # (sort_key, id) indexes back keyset pagination on every sortable column
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+        db.Index('ix_products_updated_at_id', 'updated_at', 'id'),
+        db.Index('ix_products_name_id', 'name', 'id'),
+        db.Index('ix_products_price_id', 'price', 'id'),
+        db.Index('ix_products_stock_id', 'stock', 'id'),
+        # Cursor pages sort a NULL stock as 0 (see ``CURSOR_NULL_KEYS``)
+        db.Index('ix_products_stock_key_id', db.text('coalesce(stock, 0)'), 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -14,12 +25,16 @@ class Product(BaseModel):
     slug = db.Column(db.String(100), unique=True, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     
+    category = db.relationship('Category', back_populates='products')
+    
     def __repr__(self):
         return f'<Product {self.name}>'
     
     def to_dict(self):
-        from .category import Category
-        category = Category.query.get(self.category_id)
+        # Many-to-one lazy loads are served from the identity map when the
+        # category is already present, so listings that eager-load it (see
+        # ``utils.serializers.serialize_products``) don't pay a query per row.
+        category = self.category
         return {
             'id': self.id,
             'name': self.name,
@@ -38,3 +53,5 @@ class Product(BaseModel):
                 'slug': category.slug
             } if category else None
         }
+
+track_changes(Product, lambda product: ('products', f'product:{product.id}'))
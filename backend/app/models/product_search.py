@@ -0,0 +1,85 @@
+"""
+Product Search Index Module
+
+This module defines the full-text index behind product search. It is
+created alongside the ``products`` table and kept in sync by the database
+itself, so ORM writes, bulk statements and raw SQL are all covered:
+
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index
+- SQLite: an external-content FTS5 table maintained by triggers
+"""
+
+from sqlalchemy import DDL, event
+from .product import Product
+
+FTS_TABLE = 'products_fts'
+
+POSTGRES_DDL = (
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING GIN (search_vector)",
+)
+
+SQLITE_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, content='products', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+for statement in POSTGRES_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(
+    Product.__table__,
+    'before_drop',
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect='sqlite')
+)
+
+def install_search_index(connection) -> bool:
+    """
+    Create (or repair) the full-text index on an existing database.
+
+    Returns:
+        True if the dialect supports full-text search, False otherwise
+    """
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        for statement in POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+        return True
+    if dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+        # Repopulate from the content table in case rows predate the triggers
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        return True
+    return False
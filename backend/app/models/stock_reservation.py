@@ -0,0 +1,26 @@
+from .. import db
+from .base import BaseModel
+
+class StockReservation(BaseModel):
+    """
+    Stock held for a checkout. One row per product line; the lines of one
+    checkout share a ``reservation_id``. Reserving decrements
+    ``Product.stock`` up front, so ``active`` rows are stock already taken:
+    committing keeps it, releasing (or expiry) gives it back.
+    """
+    __tablename__ = 'stock_reservations'
+    __table_args__ = (
+        db.Index('ix_stock_reservations_status_expires', 'status', 'expires_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    reservation_id = db.Column(db.String(36), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    order_id = db.Column(db.Integer, nullable=True)
+    quantity = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')  # active, committed, released
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f'<StockReservation {self.reservation_id} product={self.product_id} qty={self.quantity}>'
@@ -5,30 +5,42 @@ This module defines the User model for the application.
 """
 
 from .. import db
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from sqlalchemy import event, inspect
+from ..utils.cache import track_changes
+from ..utils.passwords import get_hasher
 
 class User(db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(256))
     name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20), nullable=True)
     address = db.Column(db.Text, nullable=True)
     role = db.Column(db.String(20), default='user')  # 'user' or 'admin'
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped whenever access changes; tokens carrying an older value are rejected
+    token_version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_hasher().hash(password)
     
     def check_password(self, password):
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return get_hasher().verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """True if the stored hash predates the configured method or cost."""
+        return bool(self.password_hash) and get_hasher().needs_rehash(self.password_hash)
+    
+    def token_claims(self):
+        """Claims embedded in access tokens so authorization needs no lookup."""
+        return {'role': self.role, 'ver': self.token_version or 0}
     
     def to_dict(self):
         return {
@@ -45,3 +57,12 @@ class User(db.Model):
     
     def __repr__(self):
         return f'<User {self.email}>'
+
+@event.listens_for(User, 'before_update')
+def _bump_token_version(mapper, connection, target):
+    """Revoke outstanding tokens when a user's role or active flag changes."""
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        target.token_version = (target.token_version or 0) + 1
+
+track_changes(User, lambda user: (f'user:{user.id}',))
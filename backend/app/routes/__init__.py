@@ -1,6 +1,10 @@
 from flask import Blueprint
+from .. import cli
+from ..services import suggest_service
+from ..utils import async_db, db_routing, instrumentation, json_provider
 from .auth import auth_bp
 from .product import product_bp
+from .product_async import product_async_bp
 from .category import category_bp
 from .order import order_bp
 
@@ -11,3 +15,11 @@ def init_app(app):
     app.register_blueprint(product_bp, url_prefix='/api/products')
     app.register_blueprint(category_bp, url_prefix='/api/categories')
     app.register_blueprint(order_bp, url_prefix='/api/orders')
+    if app.config.get('ASYNC_READS_ENABLED', False):
+        app.register_blueprint(product_async_bp, url_prefix='/api/async')
+    cli.init_app(app)
+    instrumentation.init_app(app)
+    json_provider.init_app(app)
+    db_routing.init_app(app)
+    async_db.init_app(app)
+    suggest_service.init_app(app)
@@ -9,9 +9,21 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from flask_cors import cross_origin
 from .. import db
 from ..models.user import User
+from ..utils.exceptions import APIError, AuthenticationError
+from ..utils.identity import current_identity
+from ..utils.serializers import serialize_user
 
 auth_bp = Blueprint('auth', __name__)
 
+@auth_bp.errorhandler(APIError)
+def handle_api_error(error):
+    """Handle custom API errors, e.g. a saturated password hashing pool."""
+    response = {
+        'error': error.message,
+        'status': error.status_code
+    }
+    return jsonify(response), error.status_code
+
 @auth_bp.route('/register', methods=['POST'])
 @cross_origin()
 def register():
@@ -40,12 +52,15 @@ def register():
     db.session.add(new_user)
     db.session.commit()
     
-    access_token = create_access_token(identity=new_user.id)
+    access_token = create_access_token(
+        identity=new_user.id,
+        additional_claims=new_user.token_claims()
+    )
     
     return jsonify({
         'message': 'Registration successful',
         'access_token': access_token,
-        'user': new_user.to_dict()
+        'user': serialize_user(new_user)
     }), 201
 
 @auth_bp.route('/login', methods=['POST'])
@@ -66,31 +81,43 @@ def login():
             
     if not user.is_active:
         return jsonify({'error': 'Account is inactive'}), 401
+    
+    # Transparently upgrade hashes made with an outdated method or cost
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
         
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(
+        identity=user.id,
+        additional_claims=user.token_claims()
+    )
     
     return jsonify({
         'message': 'Login successful',
         'access_token': access_token,
-        'user': user.to_dict()
+        'user': serialize_user(user)
     }), 200
 
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 @cross_origin()
 def get_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    try:
+        identity = current_identity()
+    except AuthenticationError as e:
+        return jsonify({'error': e.message}), e.status_code
             
-    return jsonify(user.to_dict()), 200
+    return jsonify(identity['profile']), 200
 
 @auth_bp.route('/profile', methods=['PUT'])
 @jwt_required()
 @cross_origin()
 def update_profile():
+    try:
+        current_identity()
+    except AuthenticationError as e:
+        return jsonify({'error': e.message}), e.status_code
+    
     user_id = get_jwt_identity()
     user = User.query.get(user_id)
     
@@ -112,5 +139,5 @@ def update_profile():
         
     return jsonify({
         'message': 'Profile updated successfully',
-        'user': user.to_dict()
+        'user': serialize_user(user)
     }), 200
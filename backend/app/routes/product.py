@@ -8,12 +8,20 @@ This module handles all product-related routes including:
 - Category management
 """
 
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from flask_cors import cross_origin
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..services.product_service import ProductService
-from ..utils.exceptions import APIError, ValidationError
-from ..utils.decorators import admin_required
+from ..services.cart_service import CartService
+from ..services.category_service import CategoryService
+from ..services.export_service import EXPORT_FORMATS, ProductExportService
+from ..services.import_service import ProductImportService
+from ..services.inventory_service import InventoryService
+from ..services.suggest_service import DEFAULT_SUGGESTIONS, get_suggest_service
+from ..utils.exceptions import APIError, InsufficientStockError, ResourceNotFoundError, ValidationError
+from ..utils.cache import get_cache
+from ..utils.decorators import admin_required, cached_response, conditional_response, tag_validator
+from ..utils.serializers import parse_product_fields, serialize_products
 from ..models.category import Category
 from ..models.product import Product
 from .. import db
@@ -21,6 +29,22 @@ import traceback
 
 product_bp = Blueprint('product', __name__)
 
+# Keys returned by the batch endpoint's availability view
+AVAILABILITY_FIELDS = ('id', 'price', 'stock', 'is_active')
+
+def _as_bool(value):
+    """Parse a boolean query-string flag."""
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+def _listing_filters():
+    """Read the product listing filters from the query string."""
+    return {
+        'category_id': request.args.get('category_id', type=int),
+        'search': request.args.get('search'),
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float)
+    }
+
 @product_bp.errorhandler(APIError)
 def handle_api_error(error):
     """Handle custom API errors."""
@@ -33,11 +57,27 @@ def handle_api_error(error):
 # Category routes
 @product_bp.route('/categories', methods=['GET'])
 @cross_origin()
+@conditional_response(tag_validator('categories', 'products'))
+@cached_response('categories', 'products')
 def get_categories():
-    """Get all categories."""
+    """
+    Get all categories.
+
+    With ``tree=true`` the categories are returned as a nested tree built
+    from a single cached query; ``depth`` limits the number of levels.
+    ``include_products`` attaches each category's products in either mode.
+    """
     try:
-        categories = Category.query.all()
-        return jsonify([cat.to_dict() for cat in categories]), 200
+        include_products = request.args.get('include_products', False, type=_as_bool)
+        if request.args.get('tree', type=_as_bool):
+            tree = CategoryService.get_category_tree(
+                depth=request.args.get('depth', type=int),
+                include_products=include_products,
+                active_only=request.args.get('active_only', False, type=_as_bool)
+            )
+            return jsonify(tree), 200
+        
+        return jsonify(CategoryService.get_categories(include_products)), 200
     except Exception as e:
         current_app.logger.error(f"Error in get_categories: {str(e)}")
         current_app.logger.error(traceback.format_exc())
@@ -45,11 +85,16 @@ def get_categories():
 
 @product_bp.route('/categories/<int:category_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(tag_validator('categories', 'products'))
+@cached_response('categories', 'products')
 def get_category(category_id):
     """Get a single category by ID."""
     try:
-        category = Category.query.get_or_404(category_id)
-        return jsonify(category.to_dict()), 200
+        response = CategoryService.get_category(category_id)
+        response['breadcrumbs'] = CategoryService.get_breadcrumbs(category_id)
+        return jsonify(response), 200
+    except ResourceNotFoundError as e:
+        return jsonify({'error': e.message}), 404
     except Exception as e:
         current_app.logger.error(f"Error in get_category: {str(e)}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
@@ -95,46 +140,155 @@ def create_category():
 # Product routes
 @product_bp.route('/products', methods=['GET'])
 @cross_origin()
+@conditional_response(tag_validator('products', 'categories'))
+@cached_response('products', 'categories')
 def get_products():
     """Get all products with optional filtering."""
     try:
-        # Get query parameters
-        category_id = request.args.get('category_id', type=int)
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        
-        # Base query
-        query = Product.query
-        
-        # Apply filters
-        if category_id:
-            query = query.filter_by(category_id=category_id)
-        
-        # Apply pagination
-        products = query.paginate(page=page, per_page=per_page, error_out=False)
+        cursor = request.args.get('cursor')
+        fields = parse_product_fields(request.args.get('fields'))
+        result = ProductService.get_products(
+            **_listing_filters(),
+            sort_by=request.args.get('sort_by'),
+            sort_order=request.args.get('sort_order', 'desc'),
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 10, type=int),
+            cursor=cursor,
+            include_total=request.args.get('include_total', False, type=_as_bool),
+            include_facets=request.args.get('include_facets', False, type=_as_bool),
+            fields=fields
+        )
         
-        return jsonify({
-            'items': [p.to_dict() for p in products.items],
-            'total': products.total,
-            'pages': products.pages,
-            'current_page': products.page
-        }), 200
+        # Keyset mode: ?cursor= for the first page, then next_cursor
+        if cursor is not None:
+            response = {
+                'items': serialize_products(result['items'], fields),
+                'next_cursor': result['next_cursor'],
+                'has_more': result['has_more']
+            }
+            if 'total' in result:
+                response['total'] = result['total']
+        else:
+            response = {
+                'items': serialize_products(result['items'], fields),
+                'total': result['total'],
+                'pages': result['pages'],
+                'current_page': result['current_page']
+            }
+        if 'facets' in result:
+            response['facets'] = result['facets']
+        return jsonify(response), 200
         
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error in get_products: {str(e)}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+@product_bp.route('/products/facets', methods=['GET'])
+@cross_origin()
+@conditional_response(tag_validator('products', 'categories'))
+@cached_response('products', 'categories')
+def get_product_facets():
+    """
+    Get category counts, price range and price histogram for a filter set
+    without any product rows; ``buckets`` sets the histogram size.
+    """
+    try:
+        facets = ProductService.get_facets(
+            **_listing_filters(),
+            buckets=request.args.get('buckets', 10, type=int)
+        )
+        return jsonify(facets), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in get_product_facets: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
 @product_bp.route('/products/<int:product_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(ProductService.get_product_validator)
+@cached_response(lambda product_id: f'product:{product_id}', 'categories')
 def get_product(product_id):
-    """Get a single product by ID."""
+    """Get a single product by ID; ``fields=`` limits the keys returned."""
     try:
-        product = Product.query.get_or_404(product_id)
-        return jsonify(product.to_dict()), 200
+        fields = parse_product_fields(request.args.get('fields'))
+        if fields is None:
+            product = Product.query.get_or_404(product_id)
+            return jsonify(serialize_products([product])[0]), 200
+        
+        product = ProductService.get_product(product_id, fields)
+        return jsonify(serialize_products([product], fields)[0]), 200
+    except ResourceNotFoundError as e:
+        return jsonify({'error': e.message}), 404
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error in get_product: {str(e)}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+@product_bp.route('/products/batch', methods=['GET', 'POST'])
+@cross_origin()
+@cached_response('products', 'categories')
+def get_products_batch():
+    """
+    Get many products in one request, e.g. to refresh a cart.
+
+    Takes ``ids`` (``?ids=3,1,2`` or a JSON body ``{"ids": [3, 1, 2]}``),
+    plus optional ``fields``, or ``view=availability`` for just the price,
+    stock and availability. Items keep the request order, and ids that
+    don't exist are listed in ``missing``.
+    """
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            if not isinstance(data, dict):
+                raise ValidationError("Expected a JSON object")
+        else:
+            data = request.args
+        fields = data.get('fields')
+        if isinstance(fields, list):
+            fields = ','.join(map(str, fields))
+        availability = data.get('view') == 'availability'
+        fields = AVAILABILITY_FIELDS if availability else parse_product_fields(fields)
+        
+        products, missing = ProductService.get_products_by_ids(data.get('ids', []), fields)
+        items = serialize_products(products, fields)
+        if availability:
+            for item in items:
+                item['available'] = bool(item['is_active']) and (item['stock'] or 0) > 0
+        return jsonify({'items': items, 'missing': missing}), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in get_products_batch: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/products/suggest', methods=['GET'])
+@cross_origin()
+def suggest_products():
+    """
+    Autocomplete a search box from the in-memory suggest index.
+
+    Takes ``q`` and an optional ``limit``. Every word in ``q`` matches the
+    start of a word in a product or category name. If nothing matches,
+    misspelt words are corrected and the corrected query is returned in
+    ``corrected``.
+    """
+    try:
+        query = request.args.get('q', '')
+        result = get_suggest_service().suggest(
+            query, limit=request.args.get('limit', DEFAULT_SUGGESTIONS, type=int)
+        )
+        return jsonify({'query': query, **result}), 200
+        
+    except Exception as e:
+        current_app.logger.error(f"Error in suggest_products: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
 @product_bp.route('/products', methods=['POST'])
 @cross_origin()
 @jwt_required()
@@ -179,6 +333,163 @@ def create_product():
         current_app.logger.error(f"Error in create_product: {str(e)}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+@product_bp.route('/products/export', methods=['GET'])
+@cross_origin()
+@jwt_required()
+@admin_required
+def export_products():
+    """
+    Stream the product catalog as NDJSON (default) or CSV.
+
+    ``fields`` projects columns (e.g. ``id,name,price,category_name``) and
+    ``updated_since`` (ISO 8601) limits the export to recent changes.
+    """
+    try:
+        fmt = request.args.get('format', 'ndjson')
+        chunks = ProductExportService.generate(
+            fmt,
+            ProductExportService.parse_fields(request.args.get('fields')),
+            ProductExportService.parse_since(request.args.get('updated_since'))
+        )
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename=products.{fmt}'}
+    )
+
+@product_bp.route('/products/import', methods=['POST'])
+@cross_origin()
+@jwt_required()
+@admin_required
+def import_products():
+    """
+    Bulk-import products from a CSV or NDJSON file, upserting on slug.
+
+    The file is sent as the ``file`` field of a multipart form or as the raw
+    request body; ``format`` overrides format detection and ``batch_size``
+    sets the rows per commit.
+    """
+    try:
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        fmt = request.args.get('format') or ProductImportService.detect_format(
+            upload.filename if upload else None,
+            upload.content_type if upload else request.content_type
+        )
+        if not fmt:
+            raise ValidationError("Could not detect the file format; pass ?format=csv or ?format=ndjson")
+        
+        report = ProductImportService.import_products(
+            stream,
+            fmt,
+            batch_size=min(max(request.args.get('batch_size', 1000, type=int), 1), 10000)
+        )
+        return jsonify(report), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in import_products: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/products/bulk', methods=['PATCH'])
+@cross_origin()
+@jwt_required()
+@admin_required
+def bulk_update_products():
+    """
+    Update price, stock and/or is_active for many products in one transaction.
+
+    Body: ``[{"id": 1, "price": 99.5}, {"slug": "round-12", "stock": 40}]``
+    (or the same list under ``items``).
+    """
+    try:
+        data = request.get_json()
+        items = data.get('items') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValidationError("Expected a list of items")
+        
+        return jsonify(ProductService.bulk_update(items)), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in bulk_update_products: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/products/cart/quote', methods=['POST'])
+@cross_origin()
+def quote_cart():
+    """
+    Price a cart on the server.
+
+    Body: ``{"items": [{"product_id": 1, "quantity": 2}, ...]}``. Returns
+    line totals, the subtotal, and any lines short of stock in
+    ``shortfalls``.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('items') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise ValidationError("Expected a list of items")
+        
+        return jsonify(CartService.quote(items)), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in quote_cart: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/products/reservations', methods=['POST'])
+@cross_origin()
+@jwt_required()
+def reserve_stock():
+    """
+    Hold stock for a checkout until it is committed or expires.
+
+    Body: ``{"items": [{"product_id": 1, "quantity": 2}, ...]}``. Either
+    every line is reserved or none is; a 409 lists the shortfalls. Lines
+    and quantities are capped, and a 429 means the user already holds the
+    most open reservations allowed.
+    """
+    try:
+        data = request.get_json() or {}
+        items = data.get('items') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise ValidationError("Expected a list of items")
+        
+        reservation = InventoryService.reserve(items, user_id=get_jwt_identity())
+        return jsonify(reservation), 201
+        
+    except InsufficientStockError as e:
+        return jsonify({'error': e.message, 'shortfalls': e.shortfalls}), 409
+    except APIError as e:
+        return jsonify({'error': e.message}), e.status_code
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in reserve_stock: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/products/reservations/<reservation_id>', methods=['DELETE'])
+@cross_origin()
+@jwt_required()
+def release_stock(reservation_id):
+    """Release a reservation held by the current user."""
+    try:
+        released = InventoryService.release(reservation_id, user_id=get_jwt_identity())
+        return jsonify({'released': released}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error in release_stock: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
 @product_bp.route('/products/<int:product_id>', methods=['PUT'])
 @cross_origin()
 @jwt_required()
@@ -221,3 +532,19 @@ def update_product(product_id):
         db.session.rollback()
         current_app.logger.error(f"Error in update_product: {str(e)}")
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_bp.route('/cache/stats', methods=['GET'])
+@cross_origin()
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    """Get response cache hit, miss and eviction counters."""
+    return jsonify(get_cache().stats()), 200
+
+@product_bp.route('/products/suggest/stats', methods=['GET'])
+@cross_origin()
+@jwt_required()
+@admin_required
+def get_suggest_stats():
+    """Get the suggest index's size, memory footprint and last sync time."""
+    return jsonify(get_suggest_service().stats()), 200
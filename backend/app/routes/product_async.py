@@ -0,0 +1,74 @@
+"""
+Async Product Routes Module
+
+This module serves the catalog reads through ``AsyncProductService``:
+- Product listing, with its count and facets queried concurrently
+- Product details
+
+The responses match the sync endpoints in ``routes.product``. Its
+blueprint is registered only when ``ASYNC_READS_ENABLED`` is set (see
+``utils.async_db``).
+"""
+
+from flask import Blueprint, jsonify, request, current_app
+from flask_cors import cross_origin
+from ..services.async_product_service import AsyncProductService
+from ..services.product_service import ProductService
+from ..utils.decorators import cached_response, conditional_response, tag_validator
+from ..utils.exceptions import ResourceNotFoundError, ValidationError
+from ..utils.serializers import parse_product_fields, serialize_products
+from .product import _as_bool, _listing_filters
+
+product_async_bp = Blueprint('product_async', __name__)
+
+@product_async_bp.route('/products', methods=['GET'])
+@cross_origin()
+@conditional_response(tag_validator('products', 'categories'))
+@cached_response('products', 'categories')
+async def get_products():
+    """Get products with optional filtering; ``include_facets`` adds facets."""
+    try:
+        fields = parse_product_fields(request.args.get('fields'))
+        result = await AsyncProductService.get_products(
+            **_listing_filters(),
+            sort_by=request.args.get('sort_by'),
+            sort_order=request.args.get('sort_order', 'desc'),
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 10, type=int),
+            include_facets=request.args.get('include_facets', False, type=_as_bool),
+            fields=fields
+        )
+
+        response = {
+            'items': serialize_products(result['items'], fields),
+            'total': result['total'],
+            'pages': result['pages'],
+            'current_page': result['current_page']
+        }
+        if 'facets' in result:
+            response['facets'] = result['facets']
+        return jsonify(response), 200
+
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in async get_products: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@product_async_bp.route('/products/<int:product_id>', methods=['GET'])
+@cross_origin()
+@conditional_response(ProductService.get_product_validator)
+@cached_response(lambda product_id: f'product:{product_id}', 'categories')
+async def get_product(product_id):
+    """Get a single product by ID; ``fields=`` limits the keys returned."""
+    try:
+        fields = parse_product_fields(request.args.get('fields'))
+        product = await AsyncProductService.get_product(product_id, fields)
+        return jsonify(serialize_products([product], fields)[0]), 200
+    except ResourceNotFoundError as e:
+        return jsonify({'error': e.message}), 404
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in async get_product: {str(e)}")
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
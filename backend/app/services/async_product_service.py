@@ -0,0 +1,140 @@
+"""
+Async Product Service Module
+
+This module contains async versions of the read-only ``ProductService``
+methods. The filters, ordering and facet queries come from
+``ProductService``, so both paths return the same results. Here they run on
+the async engine (see ``utils.async_db``), and independent queries run at
+the same time: a listing fetches its page, its count and its facets in
+parallel.
+
+Building a filter can read through the sync session (category subtrees,
+the search backend), so statements are built with ``run_in_thread`` rather
+than on the shared loop. The session factory is picked there too, which
+sends the reads to the replica under the same rules as the sync path.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import func, select
+from ..models.product import Product
+from ..utils.async_db import get_async_sessionmaker, run_in_thread
+from ..utils.cache import get_cache, versioned_key
+from ..utils.db_routing import cache_fill_allowed
+from ..utils.exceptions import ResourceNotFoundError
+from ..utils.serializers import product_load_options
+from .product_service import DEFAULT_PRICE_BUCKETS, MAX_PRICE_BUCKETS, SORT_COLUMNS, ProductService
+
+async def _rows(sessions, statement):
+    """Run a row-returning statement on its own connection."""
+    async with sessions() as session:
+        return (await session.execute(statement)).all()
+
+async def _scalars(sessions, statement):
+    """Run an ORM statement on its own connection and return the entities."""
+    async with sessions() as session:
+        return (await session.execute(statement)).unique().scalars().all()
+
+def _listing_statements(category_id, search, min_price, max_price, sort_by, sort_order, page, per_page, fields):
+    query, relevance = ProductService._filtered_query(
+        category_id, search, min_price, max_price, eager=False
+    )
+    count_statement = select(func.count()).select_from(query.statement.subquery())
+
+    sort_column = SORT_COLUMNS.get(sort_by, Product.created_at)
+    query = query.options(*product_load_options(fields, extra_columns=(sort_column,)))
+    query = ProductService._ordered(query, relevance, sort_by, 'desc' if sort_order == 'desc' else 'asc')
+    items_statement = query.limit(per_page).offset((page - 1) * per_page).statement
+    return get_async_sessionmaker(), items_statement, count_statement
+
+def _facet_statement(*args):
+    return get_async_sessionmaker(), ProductService._facet_statement(*args)
+
+class AsyncProductService:
+    @staticmethod
+    async def get_products(
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = 'desc',
+        page: int = 1,
+        per_page: int = 20,
+        include_facets: bool = False,
+        fields: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a page of products like ``ProductService.get_products``.
+
+        Only page numbers are supported, not cursors. The page, the total
+        count and, with ``include_facets``, the facets are queried
+        concurrently.
+
+        Returns:
+            Dict with ``items``, ``total``, ``pages`` and ``current_page``,
+            plus ``facets`` when requested
+        """
+        page = max(page, 1)
+        per_page = max(per_page, 1)
+        sessions, items_statement, count_statement = await run_in_thread(
+            _listing_statements, category_id, search, min_price, max_price,
+            sort_by, sort_order, page, per_page, fields
+        )
+
+        tasks = [_scalars(sessions, items_statement), _rows(sessions, count_statement)]
+        if include_facets:
+            tasks.append(AsyncProductService.get_facets(category_id, search, min_price, max_price))
+        items, count_rows, *facets = await asyncio.gather(*tasks)
+
+        total = count_rows[0][0]
+        result = {
+            'items': items,
+            'total': total,
+            'pages': -(-total // per_page),
+            'current_page': page
+        }
+        if facets:
+            result['facets'] = facets[0]
+        return result
+
+    @staticmethod
+    async def get_facets(
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        buckets: int = DEFAULT_PRICE_BUCKETS
+    ) -> Dict[str, Any]:
+        """
+        Get filter facets like ``ProductService.get_facets``. The unfiltered
+        snapshot shares its cache entry with the sync path.
+        """
+        buckets = min(max(buckets, 1), MAX_PRICE_BUCKETS)
+        if category_id or search or min_price is not None or max_price is not None:
+            return await AsyncProductService._compute_facets(category_id, search, min_price, max_price, buckets)
+
+        backend = get_cache()
+        key = versioned_key(backend, f'facets:{buckets}', ('products', 'categories'))
+        facets = backend.get(key)
+        if facets is None:
+            facets = await AsyncProductService._compute_facets(None, None, None, None, buckets)
+            if cache_fill_allowed():
+                backend.set(key, facets)
+        return facets
+
+    @staticmethod
+    async def _compute_facets(category_id, search, min_price, max_price, buckets) -> Dict[str, Any]:
+        sessions, statement = await run_in_thread(
+            _facet_statement, category_id, search, min_price, max_price, buckets
+        )
+        return ProductService._facets_payload(await _rows(sessions, statement), buckets)
+
+    @staticmethod
+    async def get_product(product_id: int, fields: Optional[Tuple[str, ...]] = None) -> Product:
+        """Get a single product by ID, loading only what ``fields`` needs when given."""
+        statement = select(Product).options(*product_load_options(fields)).where(Product.id == product_id)
+        products = await _scalars(await run_in_thread(get_async_sessionmaker), statement)
+        if not products:
+            raise ResourceNotFoundError(f"Product with ID {product_id} not found")
+        return products[0]
@@ -0,0 +1,143 @@
+"""
+Cart Service Module
+
+This module prices carts on the server. A quote takes ``(product_id,
+quantity)`` lines and returns line totals, the subtotal and stock
+shortfalls. Every product the quote needs comes from one ``IN`` query.
+
+Quotes are open to anonymous clients, so a cart is capped at
+``MAX_CART_LINES`` lines.
+
+Product snapshots (name, price, stock, active flag) are kept in a small
+TTL cache. Any committed write to a product drops its snapshot in this
+process, and the short TTL limits staleness in other processes. Checkout
+code that must not act on a stale snapshot passes ``cached=False``. The
+reservation step checks stock atomically either way.
+
+Configuration:
+    PRICE_CACHE_MAXSIZE: Product snapshots kept (default 10000)
+    PRICE_CACHE_TTL: Seconds a snapshot is trusted (default 10)
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import select
+from .. import db
+from ..models.product import Product
+from ..utils.cache import LRUCache, on_invalidate
+from .inventory_service import merge_lines
+from .product_service import MAX_BATCH_IDS
+
+# Most lines one quote may price, like a batch product lookup
+MAX_CART_LINES = MAX_BATCH_IDS
+
+# Cached in place of a snapshot for products that don't exist
+_MISSING = object()
+_CENT = Decimal('0.01')
+
+def get_price_cache(app=None) -> LRUCache:
+    """Return the app's product snapshot cache (``PRICE_CACHE_MAXSIZE``/``_TTL``)."""
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get('edhaus_price_cache')
+    if cache is None:
+        cache = app.extensions.setdefault('edhaus_price_cache', LRUCache(
+            maxsize=app.config.get('PRICE_CACHE_MAXSIZE', 10000),
+            ttl=app.config.get('PRICE_CACHE_TTL', 10)
+        ))
+    return cache
+
+@on_invalidate
+def _drop_changed_products(tags):
+    if not has_app_context():
+        return
+    cache = get_price_cache()
+    for tag in tags:
+        if tag.startswith('product:'):
+            cache.delete(tag)
+
+def _money(value) -> Decimal:
+    return Decimal(str(value)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+class CartService:
+    @staticmethod
+    def quote(lines: Iterable[Dict[str, Any]], cached: bool = True) -> Dict[str, Any]:
+        """
+        Price a cart and check it against current stock.
+
+        Lines for the same product are merged, and at most
+        ``MAX_CART_LINES`` lines are accepted. Missing and inactive products
+        are priced at nothing and reported as shortfalls with nothing
+        available, like ``InventoryService.reserve`` does. So a quote
+        without shortfalls predicts a successful reservation.
+
+        Args:
+            lines: ``[{"product_id": 1, "quantity": 2}, ...]``
+            cached: Use the product snapshot cache; pass False at checkout
+
+        Returns:
+            Dict with ``lines`` (in request order), ``subtotal``,
+            ``item_count``, ``shortfalls`` and ``missing`` product ids
+        """
+        quantities = merge_lines(lines, max_lines=MAX_CART_LINES)
+        snapshots = CartService._snapshots(quantities, cached)
+
+        quoted, shortfalls, missing = [], [], []
+        subtotal = Decimal('0')
+        for product_id, quantity in quantities.items():
+            snapshot = snapshots.get(product_id)
+            if snapshot is None:
+                missing.append(product_id)
+                shortfalls.append({'product_id': product_id, 'requested': quantity, 'available': 0})
+                continue
+
+            available = (snapshot['stock'] or 0) if snapshot['is_active'] else 0
+            unit_price = _money(snapshot['price'])
+            line_total = unit_price * quantity if snapshot['is_active'] else Decimal('0')
+            subtotal += line_total
+            quoted.append({
+                'product_id': product_id,
+                'name': snapshot['name'],
+                'quantity': quantity,
+                'unit_price': float(unit_price),
+                'line_total': float(line_total),
+                'is_active': snapshot['is_active'],
+                'available': available
+            })
+            if available < quantity:
+                shortfalls.append({'product_id': product_id, 'requested': quantity, 'available': available})
+
+        return {
+            'lines': quoted,
+            'subtotal': float(subtotal),
+            'item_count': sum(line['quantity'] for line in quoted if line['is_active']),
+            'shortfalls': shortfalls,
+            'missing': missing
+        }
+
+    @staticmethod
+    def _snapshots(product_ids: Iterable[int], cached: bool) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Get a snapshot per product, fetching every cache miss in one query."""
+        cache = get_price_cache() if cached else None
+        snapshots, misses = {}, []
+        for product_id in product_ids:
+            snapshot = cache.get(f'product:{product_id}') if cache is not None else None
+            if snapshot is None:
+                misses.append(product_id)
+            elif snapshot is not _MISSING:
+                snapshots[product_id] = snapshot
+
+        if misses:
+            rows = db.session.execute(
+                select(Product.id, Product.name, Product.price, Product.stock, Product.is_active)
+                .where(Product.id.in_(misses))
+            ).all()
+            found = {
+                row.id: {'name': row.name, 'price': row.price, 'stock': row.stock, 'is_active': bool(row.is_active)}
+                for row in rows
+            }
+            snapshots.update(found)
+            if cache is not None:
+                for product_id in misses:
+                    cache.set(f'product:{product_id}', found.get(product_id, _MISSING))
+        return snapshots
@@ -0,0 +1,273 @@
+"""
+Category Service Module
+
+This module contains the business logic for category-related operations,
+most notably building the category tree used by the storefront menu.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from flask import current_app
+from sqlalchemy import bindparam, select, update
+from .. import db
+from ..models.category import Category
+from ..models.product import Product
+from ..utils.cache import invalidate_after_commit, on_invalidate
+from ..utils.db_routing import cache_fill_allowed, replica_reads
+from ..utils.exceptions import ResourceNotFoundError
+from ..utils.serializers import serialize_products, with_category
+
+CATEGORY_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.description,
+    Category.image_url,
+    Category.parent_id,
+    Category.slug,
+    Category.is_active,
+    Category.display_order,
+    Category.path,
+)
+
+class _CategoryRowCache:
+    """Process-local cache of the flat category rows the tree is built from."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = None
+        self._loaded_at = 0.0
+
+    def get(self, ttl: float) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            if self._rows is None or time.monotonic() - self._loaded_at > ttl:
+                return None
+            return self._rows
+
+    def set(self, rows: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._rows = rows
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rows = None
+
+_row_cache = _CategoryRowCache()
+
+def invalidate_category_tree() -> None:
+    """Drop the cached category rows; the next tree request reloads them."""
+    _row_cache.invalidate()
+
+@on_invalidate
+def _invalidate_on_category_write(tags):
+    if 'categories' in tags:
+        invalidate_category_tree()
+
+class CategoryService:
+    @staticmethod
+    @replica_reads()
+    def _load_rows() -> List[Dict[str, Any]]:
+        """Load every category in a single query, using the cache when warm."""
+        ttl = current_app.config.get('CATEGORY_TREE_CACHE_TTL', 300)
+        rows = _row_cache.get(ttl)
+        if rows is None:
+            stmt = select(*CATEGORY_COLUMNS).order_by(Category.display_order, Category.id)
+            rows = [dict(row._mapping) for row in db.session.execute(stmt)]
+            if cache_fill_allowed():
+                _row_cache.set(rows)
+        return rows
+
+    @staticmethod
+    def get_path(category_id: int) -> Optional[str]:
+        """Get a category's materialized path from the cached rows."""
+        for row in CategoryService._load_rows():
+            if row['id'] == category_id:
+                return row['path']
+        return None
+
+    @staticmethod
+    def get_breadcrumbs(category_id: int) -> List[Dict[str, Any]]:
+        """
+        Get a category's ancestors, root first, ending with the category.
+
+        Read from the path and the cached rows, so there is no recursive
+        lookup and usually no query at all.
+        """
+        rows = {row['id']: row for row in CategoryService._load_rows()}
+        row = rows.get(category_id)
+        if row is None:
+            return []
+        ids = [int(part) for part in (row['path'] or f"/{category_id}/").strip('/').split('/')]
+        return [
+            {'id': rows[cid]['id'], 'name': rows[cid]['name'], 'slug': rows[cid]['slug']}
+            for cid in ids if cid in rows
+        ]
+
+    @staticmethod
+    def rebuild_paths() -> int:
+        """
+        Recompute every category path from ``parent_id``.
+
+        Needed for rows written without the ORM (bulk inserts, SQL
+        migrations), which bypass the mapper events that keep paths current.
+
+        Returns:
+            Number of categories whose path changed
+        """
+        parents = dict(db.session.execute(select(Category.id, Category.parent_id)).all())
+        current = dict(db.session.execute(select(Category.id, Category.path)).all())
+        paths = {}
+
+        def path_of(category_id, seen=()):
+            if category_id not in paths:
+                parent_id = parents.get(category_id)
+                if parent_id is None or parent_id not in parents or parent_id in seen:
+                    prefix = '/'
+                else:
+                    prefix = path_of(parent_id, seen + (category_id,))
+                paths[category_id] = f'{prefix}{category_id}/'
+            return paths[category_id]
+
+        changed = [
+            {'_id': category_id, 'path': path_of(category_id)}
+            for category_id in parents if path_of(category_id) != current.get(category_id)
+        ]
+        if changed:
+            table = Category.__table__
+            db.session.execute(
+                update(table).where(table.c.id == bindparam('_id')).values(path=bindparam('path')),
+                changed
+            )
+            invalidate_after_commit(db.session, 'categories', 'products')
+        db.session.commit()
+        return len(changed)
+
+    @staticmethod
+    @replica_reads()
+    def get_category_tree(
+        depth: Optional[int] = None,
+        include_products: bool = False,
+        active_only: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the category tree in memory from ``parent_id``.
+
+        Args:
+            depth: Number of levels to return (1 = root categories only).
+                None returns the whole tree.
+            include_products: Attach each returned category's products,
+                loaded with one extra query.
+            active_only: Skip inactive categories and their descendants.
+
+        Returns:
+            List of root category dicts, each with nested ``subcategories``
+        """
+        if depth is not None and depth < 1:
+            return []
+
+        children = defaultdict(list)
+        for row in CategoryService._load_rows():
+            if active_only and not row['is_active']:
+                continue
+            children[row['parent_id']].append(row)
+
+        products_by_category = {}
+        if include_products:
+            visible_ids = CategoryService._collect_ids(children, depth)
+            products_by_category = CategoryService._products_for(visible_ids, active_only)
+
+        def build(row, level):
+            node = dict(row)
+            if depth is None or level < depth:
+                node['subcategories'] = [build(child, level + 1) for child in children.get(row['id'], [])]
+            else:
+                node['subcategories'] = []
+            if include_products:
+                node['products'] = products_by_category.get(row['id'], [])
+            return node
+
+        return [build(row, 1) for row in children.get(None, [])]
+
+    @staticmethod
+    @replica_reads()
+    def get_categories(include_products: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get every category with its nested ``subcategories``, like
+        ``serialize_category``.
+
+        Built from the cached rows. ``include_products`` attaches each
+        category's ``products`` with one extra query, which reads the whole
+        catalog, so it is off by default.
+        """
+        rows = CategoryService._load_rows()
+        return CategoryService._category_payloads(rows, [row['id'] for row in rows], include_products)
+
+    @staticmethod
+    @replica_reads()
+    def get_category(category_id: int) -> Dict[str, Any]:
+        """
+        Get one category like ``get_categories``, with products attached;
+        only its subtree's products are loaded.
+
+        Raises:
+            ResourceNotFoundError: If the category doesn't exist
+        """
+        rows = CategoryService._load_rows()
+        row = next((row for row in rows if row['id'] == category_id), None)
+        if row is None:
+            raise ResourceNotFoundError(f"Category with ID {category_id} not found")
+        path = row['path'] or f'/{category_id}/'
+        subtree = [other for other in rows if other['id'] == category_id or (other['path'] or '').startswith(path)]
+        return CategoryService._category_payloads(subtree, [category_id], True)[0]
+
+    @staticmethod
+    def _category_payloads(
+        rows: List[Dict[str, Any]],
+        category_ids: List[int],
+        include_products: bool
+    ) -> List[Dict[str, Any]]:
+        """Nest ``rows``, optionally attaching their products; return the ``category_ids`` nodes."""
+        children = defaultdict(list)
+        for row in rows:
+            children[row['parent_id']].append(row)
+        products_by_category = {}
+        if include_products:
+            products_by_category = CategoryService._products_for([row['id'] for row in rows], False)
+
+        nodes = {}
+        def build(row):
+            node = nodes.get(row['id'])
+            if node is None:
+                node = nodes[row['id']] = dict(row)
+                node['subcategories'] = [build(child) for child in children.get(row['id'], [])]
+                if include_products:
+                    node['products'] = products_by_category.get(row['id'], [])
+            return node
+
+        by_id = {row['id']: row for row in rows}
+        return [build(by_id[category_id]) for category_id in category_ids]
+
+    @staticmethod
+    def _collect_ids(children, depth: Optional[int]) -> List[int]:
+        ids = []
+        level_rows = children.get(None, [])
+        level = 1
+        while level_rows and (depth is None or level <= depth):
+            ids.extend(row['id'] for row in level_rows)
+            level_rows = [child for row in level_rows for child in children.get(row['id'], [])]
+            level += 1
+        return ids
+
+    @staticmethod
+    def _products_for(category_ids: List[int], active_only: bool) -> Dict[int, List[Dict[str, Any]]]:
+        if not category_ids:
+            return {}
+        query = with_category(Product.query).filter(Product.category_id.in_(category_ids))
+        if active_only:
+            query = query.filter(Product.is_active.is_(True))
+        grouped = defaultdict(list)
+        for item in serialize_products(query.order_by(Product.id)):
+            grouped[item['category_id']].append(item)
+        return grouped
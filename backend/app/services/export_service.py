@@ -0,0 +1,140 @@
+"""
+Export Service Module
+
+This module streams the product catalog as NDJSON or CSV. Rows are read
+through a server-side cursor (``yield_per``) and encoded chunk by chunk, so
+memory use is constant and output starts right away however large the
+table is.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy import select
+from .. import db
+from ..models.category import Category
+from ..models.product import Product
+from ..utils.exceptions import ValidationError
+
+EXPORT_COLUMNS = {
+    'id': Product.id,
+    'name': Product.name,
+    'description': Product.description,
+    'price': Product.price,
+    'stock': Product.stock,
+    'image_url': Product.image_url,
+    'category_id': Product.category_id,
+    'slug': Product.slug,
+    'is_active': Product.is_active,
+    'created_at': Product.created_at,
+    'updated_at': Product.updated_at,
+    'category_name': Category.name,
+    'category_slug': Category.slug,
+}
+
+# Product columns only; category_name/category_slug add a join when asked for
+DEFAULT_EXPORT_FIELDS = (
+    'id', 'name', 'description', 'price', 'stock', 'image_url',
+    'category_id', 'slug', 'is_active', 'created_at', 'updated_at',
+)
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+class ProductExportService:
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> List[str]:
+        """Parse a comma-separated column projection, defaulting to all product columns."""
+        if not fields:
+            return list(DEFAULT_EXPORT_FIELDS)
+        names = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in names if name not in EXPORT_COLUMNS]
+        if unknown:
+            raise ValidationError(f"Unknown export fields: {', '.join(unknown)}")
+        return list(dict.fromkeys(names))
+
+    @staticmethod
+    def parse_since(value: Optional[str]) -> Optional[datetime]:
+        """Parse an ISO 8601 ``updated_since`` value into naive UTC."""
+        if not value:
+            return None
+        try:
+            since = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            raise ValidationError("updated_since must be an ISO 8601 timestamp")
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return since
+
+    @staticmethod
+    def iter_rows(
+        fields: Sequence[str],
+        updated_since: Optional[datetime] = None,
+        chunk_size: int = 2000
+    ) -> Iterator[Sequence]:
+        """Yield row partitions of the projected columns, ordered by id."""
+        stmt = select(*(EXPORT_COLUMNS[name] for name in fields)).select_from(Product)
+        if any(name.startswith('category_') and name != 'category_id' for name in fields):
+            stmt = stmt.outerjoin(Category, Product.category_id == Category.id)
+        if updated_since is not None:
+            stmt = stmt.where(Product.updated_at >= updated_since)
+        stmt = stmt.order_by(Product.id).execution_options(yield_per=chunk_size)
+
+        result = db.session.execute(stmt)
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    @staticmethod
+    def generate(
+        fmt: str,
+        fields: Sequence[str],
+        updated_since: Optional[datetime] = None,
+        chunk_size: int = 2000
+    ) -> Iterator[str]:
+        """
+        Return an iterator over the export as text chunks, one per partition.
+
+        Raises:
+            ValidationError: If ``fmt`` is not supported (raised eagerly,
+                before any output is produced)
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(f"Unsupported format; use one of: {', '.join(EXPORT_FORMATS)}")
+        if fmt == 'csv':
+            return ProductExportService._generate_csv(fields, updated_since, chunk_size)
+        return ProductExportService._generate_ndjson(fields, updated_since, chunk_size)
+
+    @staticmethod
+    def _generate_csv(fields, updated_since, chunk_size) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        # The header goes out before the query runs
+        yield buffer.getvalue()
+        for partition in ProductExportService.iter_rows(fields, updated_since, chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in partition
+            )
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _generate_ndjson(fields, updated_since, chunk_size) -> Iterator[str]:
+        for partition in ProductExportService.iter_rows(fields, updated_since, chunk_size):
+            yield ''.join(
+                json.dumps(dict(zip(fields, row)), default=_json_default, separators=(',', ':')) + '\n'
+                for row in partition
+            )
@@ -0,0 +1,270 @@
+"""
+Import Service Module
+
+This module streams supplier catalog files (CSV or NDJSON) into the
+``products`` table. Rows are parsed one at a time, validated against the
+``Product`` columns and the set of known category ids, and upserted on
+``slug`` in batches, with one commit per batch. Only the current batch and
+a capped error list are held in memory, so memory use does not grow with
+the file.
+"""
+
+import csv
+import io
+import json
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from .. import db
+from ..models.category import Category
+from ..models.product import Product
+from ..utils.cache import invalidate_after_commit
+from ..utils.exceptions import ValidationError
+
+IMPORT_COLUMNS = ('name', 'description', 'price', 'stock', 'image_url', 'category_id', 'slug', 'is_active')
+REQUIRED_COLUMNS = ('name', 'price', 'category_id', 'slug')
+SUPPORTED_FORMATS = ('csv', 'ndjson')
+
+_TRUE = ('1', 'true', 'yes', 'y', 'on')
+_FALSE = ('0', 'false', 'no', 'n', 'off')
+
+class ImportReport:
+    """Counters and a capped list of per-row errors for one import."""
+
+    def __init__(self, max_errors: int = 1000):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.upserted = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = []
+        self.ignored_columns = set()
+
+    def add_error(self, row: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'errors': messages})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'upserted': self.upserted,
+            'failed': self.failed,
+            'batches': self.batches,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'ignored_columns': sorted(self.ignored_columns)
+        }
+
+class ProductImportService:
+    @staticmethod
+    def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+        """Guess the file format from its name or content type."""
+        name = (filename or '').lower()
+        content_type = (content_type or '').lower()
+        if name.endswith('.csv') or 'csv' in content_type:
+            return 'csv'
+        if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonlines' in content_type:
+            return 'ndjson'
+        return None
+
+    @staticmethod
+    def iter_rows(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+        """
+        Yield ``(row_number, row)`` pairs from a binary stream.
+
+        Rows that can't be decoded are yielded as exceptions so they are
+        reported without aborting the import.
+        """
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if fmt == 'csv':
+            for number, row in enumerate(csv.DictReader(text), start=2):
+                yield number, row
+            return
+
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f'Invalid JSON: {e}')
+
+    @staticmethod
+    def validate_row(raw: Dict[str, Any], category_ids: Set[int]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Validate and coerce one row.
+
+        Blank optional cells are left out, so an upsert keeps the existing
+        value (or the column default for a new product).
+
+        Returns:
+            Tuple of (clean values for the known non-blank columns, errors)
+        """
+        errors = []
+        row = {}
+        for column in IMPORT_COLUMNS:
+            value = raw.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                if column in REQUIRED_COLUMNS:
+                    errors.append(f'{column} is required')
+                continue
+            try:
+                row[column] = ProductImportService._coerce(column, value)
+            except (TypeError, ValueError) as e:
+                errors.append(f'{column}: {e}')
+
+        if 'category_id' in row and row['category_id'] not in category_ids:
+            errors.append(f"category_id {row['category_id']} does not exist")
+        return row, errors
+
+    @staticmethod
+    def _coerce(column: str, value: Any) -> Any:
+        if column == 'price':
+            value = float(value)
+            if not math.isfinite(value):
+                raise ValueError('must be a finite number')
+            if value < 0:
+                raise ValueError('must not be negative')
+            return value
+        if column in ('stock', 'category_id'):
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError('must be an integer')
+            value = int(value)
+            if column == 'stock' and value < 0:
+                raise ValueError('must not be negative')
+            return value
+        if column == 'is_active':
+            if isinstance(value, bool):
+                return value
+            if str(value).lower() in _TRUE:
+                return True
+            if str(value).lower() in _FALSE:
+                return False
+            raise ValueError('must be a boolean')
+
+        value = str(value)
+        limit = Product.__table__.c[column].type.length
+        if limit and len(value) > limit:
+            raise ValueError(f'must be at most {limit} characters')
+        return value
+
+    @staticmethod
+    def import_products(
+        stream,
+        fmt: str,
+        batch_size: int = 1000,
+        max_errors: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Stream-import products, upserting on ``slug``.
+
+        Args:
+            stream: Binary file-like object
+            fmt: 'csv' or 'ndjson'
+            batch_size: Rows per INSERT batch and commit
+            max_errors: Row errors kept in the report (all are counted)
+
+        Returns:
+            The import report
+        """
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValidationError(f"Unsupported format; use one of: {', '.join(SUPPORTED_FORMATS)}")
+
+        category_ids = set(db.session.execute(select(Category.id)).scalars())
+        report = ImportReport(max_errors)
+        batch = {}
+
+        for number, raw in ProductImportService.iter_rows(stream, fmt):
+            report.rows += 1
+            if isinstance(raw, Exception):
+                report.add_error(number, [str(raw)])
+                continue
+            if not isinstance(raw, dict):
+                report.add_error(number, ['Row must be an object'])
+                continue
+
+            report.ignored_columns.update(
+                key for key in raw if key not in IMPORT_COLUMNS and key is not None
+            )
+            row, errors = ProductImportService.validate_row(raw, category_ids)
+            if errors:
+                report.add_error(number, errors)
+                continue
+
+            # A slug repeated within a batch keeps its last row
+            batch.pop(row['slug'], None)
+            batch[row['slug']] = (number, row)
+            if len(batch) >= batch_size:
+                ProductImportService._flush_batch(batch, report)
+                batch = {}
+
+        if batch:
+            ProductImportService._flush_batch(batch, report)
+        return report.to_dict()
+
+    @staticmethod
+    def _flush_batch(batch: Dict[str, Tuple[int, Dict[str, Any]]], report: ImportReport) -> None:
+        """Upsert one batch in its own transaction."""
+        # executemany needs identical keys, so group rows by the columns they set
+        groups = {}
+        for number, row in batch.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        try:
+            product_ids = []
+            for columns, rows in groups.items():
+                product_ids.extend(ProductImportService._upsert(columns, rows))
+            invalidate_after_commit(db.session, 'products', *(f'product:{pid}' for pid in product_ids))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            message = f'Batch failed: {type(e).__name__}: {e}'[:500]
+            for number, _ in batch.values():
+                report.add_error(number, [message])
+            return
+
+        report.batches += 1
+        report.upserted += len(batch)
+
+    @staticmethod
+    def _upsert(columns: Tuple[str, ...], rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert or update ``rows`` by slug; returns the affected product ids."""
+        now = datetime.utcnow()
+        for row in rows:
+            row['updated_at'] = now
+        dialect = db.session.get_bind(mapper=Product.__mapper__).dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = dialect_insert(Product)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.slug],
+                set_={column: stmt.excluded[column] for column in (*columns, 'updated_at') if column != 'slug'}
+            ).returning(Product.id)
+            return list(db.session.execute(stmt, rows).scalars())
+
+        # Portable fallback: split the batch into existing and new slugs
+        slugs = [row['slug'] for row in rows]
+        existing = dict(db.session.execute(
+            select(Product.slug, Product.id).where(Product.slug.in_(slugs))
+        ).all())
+        updates = [dict(row, _slug=row['slug']) for row in rows if row['slug'] in existing]
+        inserts = [row for row in rows if row['slug'] not in existing]
+        if updates:
+            db.session.execute(
+                update(Product.__table__)
+                .where(Product.__table__.c.slug == bindparam('_slug'))
+                .values({column: bindparam(column) for column in (*columns, 'updated_at') if column != 'slug'}),
+                updates
+            )
+        if inserts:
+            db.session.execute(insert(Product), inserts)
+            existing.update(db.session.execute(
+                select(Product.slug, Product.id).where(Product.slug.in_([row['slug'] for row in inserts]))
+            ).all())
+        return list(existing.values())
@@ -0,0 +1,333 @@
+"""
+Inventory Service Module
+
+This module reserves stock for checkouts without read-modify-write races.
+Every decrement is a conditional atomic UPDATE
+(``stock = stock - n WHERE stock >= n``), so concurrent checkouts can never
+oversell. All lines of a checkout are reserved in one short transaction,
+touching products in ascending id order so that two checkouts sharing
+products always lock them in the same order and cannot deadlock; row
+locks are held only for that transaction, so a hot product doesn't
+serialize checkouts for longer than a few statements.
+
+Reservations expire after ``STOCK_RESERVATION_TTL`` seconds (default 900)
+unless committed; ``ReservationSweeper`` (or ``flask inventory sweep``)
+returns expired stock.
+
+So that one account can't hold the stock of a sale, reservations are
+capped per checkout and per user:
+    RESERVATION_MAX_LINES: Products in one reservation (default 50)
+    RESERVATION_MAX_QUANTITY: Units of one product in one reservation (default 20)
+    RESERVATION_MAX_OPEN: Unexpired active reservations per user (default 3)
+"""
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from flask import current_app
+from sqlalchemy import func, select, update
+from .. import db
+from ..models.product import Product
+from ..models.stock_reservation import StockReservation
+from ..models.user import User
+from ..utils.cache import invalidate_after_commit
+from ..utils.exceptions import InsufficientStockError, ReservationLimitError, ResourceNotFoundError, ValidationError
+
+def merge_lines(lines: Iterable[Dict[str, Any]], max_lines: Optional[int] = None) -> Dict[int, int]:
+    """
+    Validate ``[{"product_id", "quantity"}, ...]`` cart lines and merge
+    repeated products.
+
+    Args:
+        lines: Cart lines
+        max_lines: Most lines accepted, before merging; None for no cap
+
+    Returns:
+        Dict of product id to total quantity
+
+    Raises:
+        ValidationError: If a line is malformed, there are none or too many
+    """
+    quantities = {}
+    for count, line in enumerate(lines, 1):
+        if max_lines is not None and count > max_lines:
+            raise ValidationError(f"At most {max_lines} lines per request")
+        if not isinstance(line, dict):
+            raise ValidationError("Each line must be an object")
+        product_id, quantity = line.get('product_id'), line.get('quantity')
+        if not isinstance(product_id, int) or isinstance(product_id, bool):
+            raise ValidationError("product_id must be an integer")
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+            raise ValidationError("quantity must be a positive integer")
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    if not quantities:
+        raise ValidationError("At least one line is required")
+    return quantities
+
+class InventoryService:
+    @staticmethod
+    def reserve(
+        lines: Iterable[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        ttl_seconds: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Reserve stock for every line of a checkout, all or nothing.
+
+        Args:
+            lines: Items with ``product_id`` and ``quantity``; repeated
+                products are merged
+            user_id: Owner of the reservation
+            ttl_seconds: Lifetime before the sweeper releases it
+
+        Returns:
+            Dict with the ``reservation_id``, ``expires_at`` and lines
+
+        Raises:
+            ValidationError: If a line is malformed or over the line and
+                quantity limits
+            ReservationLimitError: If ``user_id`` already holds
+                ``RESERVATION_MAX_OPEN`` active reservations
+            InsufficientStockError: If any product lacks stock; nothing is
+                reserved and ``shortfalls`` lists what is available
+        """
+        quantities = merge_lines(lines)
+        InventoryService._check_line_limits(quantities)
+        ttl = ttl_seconds or current_app.config.get('STOCK_RESERVATION_TTL', 900)
+        reservation_id = str(uuid.uuid4())
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        products = Product.__table__
+
+        try:
+            if user_id is not None:
+                InventoryService._check_open_reservations(user_id)
+            for product_id in sorted(quantities):
+                quantity = quantities[product_id]
+                result = db.session.execute(
+                    update(products)
+                    .where(
+                        products.c.id == product_id,
+                        products.c.is_active.is_(True),
+                        products.c.stock >= quantity
+                    )
+                    .values(stock=products.c.stock - quantity)
+                )
+                if result.rowcount != 1:
+                    db.session.rollback()
+                    raise InsufficientStockError(
+                        "Insufficient stock for one or more items",
+                        shortfalls=InventoryService._shortfalls(quantities)
+                    )
+
+            db.session.execute(StockReservation.__table__.insert(), [
+                {
+                    'reservation_id': reservation_id,
+                    'product_id': product_id,
+                    'user_id': user_id,
+                    'quantity': quantity,
+                    'status': 'active',
+                    'expires_at': expires_at,
+                    'created_at': datetime.utcnow(),
+                    'updated_at': datetime.utcnow()
+                }
+                for product_id, quantity in sorted(quantities.items())
+            ])
+            InventoryService._invalidate(quantities)
+            db.session.commit()
+        except InsufficientStockError:
+            raise
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {
+            'reservation_id': reservation_id,
+            'expires_at': expires_at.isoformat(),
+            'lines': [
+                {'product_id': product_id, 'quantity': quantity}
+                for product_id, quantity in sorted(quantities.items())
+            ]
+        }
+
+    @staticmethod
+    def commit(reservation_id: str, order_id: Optional[int] = None) -> int:
+        """
+        Turn an active reservation into a sale; the stock stays taken.
+
+        Returns:
+            Number of lines committed
+
+        Raises:
+            ResourceNotFoundError: If the reservation is unknown, expired or
+                already released
+        """
+        lines = StockReservation.query.filter_by(reservation_id=reservation_id).count()
+        now = datetime.utcnow()
+        # Expired lines may already be back on sale, even before the sweeper runs
+        result = db.session.execute(
+            update(StockReservation)
+            .where(
+                StockReservation.reservation_id == reservation_id,
+                StockReservation.status == 'active',
+                StockReservation.expires_at > now
+            )
+            .values(status='committed', order_id=order_id, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if not lines or result.rowcount != lines:
+            db.session.rollback()
+            raise ResourceNotFoundError("Reservation not found or no longer active")
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def release(reservation_id: str, user_id: Optional[int] = None) -> int:
+        """
+        Give back the stock of an active reservation.
+
+        Returns:
+            Number of lines released (0 if it was already committed or released)
+        """
+        query = StockReservation.query.filter_by(reservation_id=reservation_id, status='active')
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        released = InventoryService._release_rows(
+            query.order_by(StockReservation.product_id, StockReservation.id).all()
+        )
+        db.session.commit()
+        return released
+
+    @staticmethod
+    def release_expired(batch_size: int = 500, now: Optional[datetime] = None) -> int:
+        """
+        Release one batch of expired reservations.
+
+        Returns:
+            Number of lines released
+        """
+        now = now or datetime.utcnow()
+        rows = StockReservation.query.filter(
+            StockReservation.status == 'active',
+            StockReservation.expires_at <= now
+        ).order_by(StockReservation.product_id, StockReservation.id).limit(batch_size).all()
+        released = InventoryService._release_rows(rows)
+        db.session.commit()
+        return released
+
+    @staticmethod
+    def _release_rows(rows: List[StockReservation]) -> int:
+        """
+        Release ``rows`` (ordered by product id) in the current transaction.
+
+        Each row is claimed with a conditional UPDATE first, so a row that a
+        concurrent commit, release or sweep got to first is skipped rather
+        than returned twice.
+        """
+        products = Product.__table__
+        reservations = StockReservation.__table__
+        restored = {}
+        released = 0
+        for row in rows:
+            claimed = db.session.execute(
+                update(reservations)
+                .where(reservations.c.id == row.id, reservations.c.status == 'active')
+                .values(status='released', updated_at=datetime.utcnow())
+            )
+            if claimed.rowcount != 1:
+                continue
+            db.session.execute(
+                update(products)
+                .where(products.c.id == row.product_id)
+                .values(stock=products.c.stock + row.quantity)
+            )
+            restored[row.product_id] = restored.get(row.product_id, 0) + row.quantity
+            released += 1
+        db.session.expire_all()
+        if restored:
+            InventoryService._invalidate(restored)
+        return released
+
+    @staticmethod
+    def _check_line_limits(quantities: Dict[int, int]) -> None:
+        config = current_app.config
+        max_lines = config.get('RESERVATION_MAX_LINES', 50)
+        if len(quantities) > max_lines:
+            raise ValidationError(f"A reservation may hold at most {max_lines} products")
+        max_quantity = config.get('RESERVATION_MAX_QUANTITY', 20)
+        if max(quantities.values()) > max_quantity:
+            raise ValidationError(f"At most {max_quantity} units of a product may be reserved")
+
+    @staticmethod
+    def _check_open_reservations(user_id: int) -> None:
+        """
+        Refuse a new reservation when the user holds too many already.
+
+        The user's row is locked first (on databases with row locks), so
+        concurrent reservations by the same user are counted one at a time.
+        """
+        db.session.execute(select(User.id).where(User.id == user_id).with_for_update())
+        open_reservations = db.session.execute(
+            select(func.count(func.distinct(StockReservation.reservation_id))).where(
+                StockReservation.user_id == user_id,
+                StockReservation.status == 'active',
+                StockReservation.expires_at > datetime.utcnow()
+            )
+        ).scalar()
+        if open_reservations >= current_app.config.get('RESERVATION_MAX_OPEN', 3):
+            raise ReservationLimitError()
+
+    @staticmethod
+    def _shortfalls(quantities: Dict[int, int]) -> List[Dict[str, Any]]:
+        available = dict(db.session.execute(
+            select(Product.id, Product.stock).where(
+                Product.id.in_(quantities), Product.is_active.is_(True)
+            )
+        ).all())
+        return [
+            {'product_id': product_id, 'requested': quantity, 'available': available.get(product_id, 0) or 0}
+            for product_id, quantity in sorted(quantities.items())
+            if (available.get(product_id) or 0) < quantity
+        ]
+
+    @staticmethod
+    def _invalidate(product_ids: Iterable[int]) -> None:
+        invalidate_after_commit(db.session, 'products', *(f'product:{pid}' for pid in product_ids))
+
+class ReservationSweeper:
+    """Background thread releasing expired reservations every ``interval`` seconds."""
+
+    def __init__(self, app, interval: float = 30.0, batch_size: int = 500):
+        self.app = app
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='reservation-sweeper', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the sweeper is stopped or ``timeout`` elapses."""
+        return self._stop.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    released = InventoryService.release_expired(self.batch_size)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Reservation sweeper error: {e}")
+                    released = 0
+                finally:
+                    db.session.remove()
+                # A full batch means more may be waiting
+                if released < self.batch_size:
+                    self._stop.wait(self.interval)
@@ -0,0 +1,212 @@
+"""
+Outbox Service Module
+
+This module delivers queued emails from the ``email_outbox`` table. Each
+worker claims a batch of due messages, sends them over a single SMTP
+connection (``mail.connect()``) and records the outcome. Failed messages
+are retried with exponential backoff and dead-lettered after
+``OUTBOX_MAX_ATTEMPTS`` attempts. A claim counts as an attempt, so a
+message whose worker keeps crashing mid-send is dead-lettered too.
+
+Configuration:
+    OUTBOX_BATCH_SIZE: Messages claimed per batch (default 50)
+    OUTBOX_MAX_ATTEMPTS: Attempts before a message is dead-lettered (default 8)
+    OUTBOX_BACKOFF_SECONDS: Base retry delay, doubled per attempt (default 30)
+    OUTBOX_MAX_BACKOFF_SECONDS: Retry delay cap (default 3600)
+    OUTBOX_LEASE_SECONDS: How long a claim lasts before another worker may
+        retry the message, e.g. after a crash (default 300)
+"""
+
+import random
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import select, update
+from .. import db
+from ..models.email_outbox import EmailOutbox
+from ..utils.email import mail
+
+# SMTP rejections that concern a single message; the connection stays usable
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+class OutboxService:
+    @staticmethod
+    def claim_batch(batch_size: Optional[int] = None) -> List[EmailOutbox]:
+        """
+        Atomically claim up to ``batch_size`` due messages for this worker.
+
+        The claim is a single conditional UPDATE, so concurrent workers never
+        get the same message; on PostgreSQL candidates are picked with
+        ``FOR UPDATE SKIP LOCKED`` so workers don't queue behind each other.
+        It also counts the attempt. Messages that are out of attempts when
+        claimed (their earlier claims expired without an outcome) are
+        dead-lettered instead of returned.
+        """
+        config = current_app.config
+        batch_size = batch_size or config.get('OUTBOX_BATCH_SIZE', 50)
+        now = datetime.utcnow()
+        token = str(uuid.uuid4())
+        due = (
+            EmailOutbox.status.in_(('pending', 'sending')),
+            EmailOutbox.next_attempt_at <= now
+        )
+
+        candidates = select(EmailOutbox.id).where(*due).order_by(
+            EmailOutbox.next_attempt_at, EmailOutbox.id
+        ).limit(batch_size).with_for_update(skip_locked=True)
+
+        db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(candidates), *due)
+            .values(
+                status='sending',
+                claimed_by=token,
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=now + timedelta(seconds=config.get('OUTBOX_LEASE_SECONDS', 300))
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        claimed = EmailOutbox.query.filter_by(claimed_by=token, status='sending').order_by(EmailOutbox.id).all()
+
+        max_attempts = config.get('OUTBOX_MAX_ATTEMPTS', 8)
+        expired = [message for message in claimed if message.attempts > max_attempts]
+        for message in expired:
+            message.status = 'dead'
+            message.claimed_by = None
+            message.last_error = message.last_error or 'Claim expired without a result'
+            current_app.logger.error(f"Outbox message {message.id} dead-lettered: {message.last_error}")
+        if expired:
+            db.session.commit()
+            claimed = [message for message in claimed if message.status == 'sending']
+        return claimed
+
+    @staticmethod
+    def deliver(messages: List[EmailOutbox]) -> int:
+        """
+        Send ``messages`` over one SMTP connection and record the outcome.
+
+        Returns:
+            Number of messages sent
+        """
+        sent = 0
+        pending = list(messages)
+        try:
+            with mail.connect() as connection:
+                while pending:
+                    message = pending[0]
+                    try:
+                        connection.send(OutboxService._to_mail_message(message))
+                    except MESSAGE_ERRORS as e:
+                        OutboxService._record_failure(message, e)
+                    except OSError:
+                        # Connection-level failure (SMTPException is an OSError)
+                        raise
+                    except Exception as e:
+                        OutboxService._record_failure(message, e)
+                    else:
+                        message.status = 'sent'
+                        message.sent_at = datetime.utcnow()
+                        message.claimed_by = None
+                        message.last_error = None
+                        sent += 1
+                    pending.pop(0)
+        except Exception as e:
+            # The connection failed: everything not yet handled is retried
+            current_app.logger.warning(f"Outbox SMTP connection failed: {e}")
+            for message in pending:
+                OutboxService._record_failure(message, e)
+        db.session.commit()
+        return sent
+
+    @staticmethod
+    def run_once(batch_size: Optional[int] = None) -> int:
+        """Claim and deliver one batch. Returns the number of messages claimed."""
+        messages = OutboxService.claim_batch(batch_size)
+        if messages:
+            OutboxService.deliver(messages)
+        return len(messages)
+
+    @staticmethod
+    def requeue_dead() -> int:
+        """Move dead-lettered messages back to the queue with a fresh retry budget."""
+        result = db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.status == 'dead')
+            .values(status='pending', attempts=0, next_attempt_at=datetime.utcnow(), claimed_by=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _to_mail_message(message: EmailOutbox) -> Message:
+        mail_message = Message(
+            message.subject,
+            sender=message.sender or None,
+            recipients=message.recipients.split(',')
+        )
+        mail_message.body = message.body
+        mail_message.html = message.html
+        return mail_message
+
+    @staticmethod
+    def _record_failure(message: EmailOutbox, error: Exception) -> None:
+        # The attempt was counted when the message was claimed
+        config = current_app.config
+        message.last_error = f'{type(error).__name__}: {error}'[:2000]
+        message.claimed_by = None
+        if message.attempts >= config.get('OUTBOX_MAX_ATTEMPTS', 8):
+            message.status = 'dead'
+            current_app.logger.error(f"Outbox message {message.id} dead-lettered: {message.last_error}")
+            return
+        delay = min(
+            config.get('OUTBOX_MAX_BACKOFF_SECONDS', 3600),
+            config.get('OUTBOX_BACKOFF_SECONDS', 30) * 2 ** (message.attempts - 1)
+        )
+        message.status = 'pending'
+        message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.9, 1.1))
+
+class OutboxWorkerPool:
+    """A fixed pool of threads draining the outbox until stopped."""
+
+    def __init__(self, app, workers: int = 2, poll_interval: float = 2.0):
+        self.app = app
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self) -> None:
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'outbox-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the pool is stopped or ``timeout`` elapses."""
+        return self._stop.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    claimed = OutboxService.run_once()
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Outbox worker error: {e}")
+                    claimed = 0
+                finally:
+                    db.session.remove()
+                # Keep draining while there is a backlog; otherwise poll
+                if not claimed:
+                    self._stop.wait(self.poll_interval)
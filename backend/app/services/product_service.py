@@ -6,54 +6,307 @@ It serves as an intermediary layer between the routes and models,
 ensuring separation of concerns and maintainable code.
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy import or_
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy import Float, Integer, String, bindparam, case, cast, func, literal, null, select, true, tuple_, union_all, update
 from .. import db
 from ..models.product import Product
 from ..models.category import Category
+from .category_service import CategoryService
+from .search_service import SearchService
+from ..utils.cache import get_cache, invalidate_after_commit, versioned_key
+from ..utils.db_routing import cache_fill_allowed, replica_reads
 from ..utils.exceptions import ResourceNotFoundError, ValidationError
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.serializers import product_load_options, with_category
+
+# Columns clients may sort product listings by.
+SORT_COLUMNS = {
+    'created_at': Product.created_at,
+    'updated_at': Product.updated_at,
+    'name': Product.name,
+    'price': Product.price,
+    'stock': Product.stock,
+    'id': Product.id,
+}
+
+# Values nullable sort columns sort as in cursor pages, so rows with NULL
+# keys aren't lost from the range comparison
+CURSOR_NULL_KEYS = {
+    'stock': 0,
+}
+
+# Fields the bulk update endpoint may set, and its limits
+BULK_UPDATE_FIELDS = ('price', 'stock', 'is_active')
+MAX_BULK_ITEMS = 20000
+LOOKUP_CHUNK_SIZE = 500
+
+# Most ids one batch lookup may ask for
+MAX_BATCH_IDS = 100
+
+# Price histogram bucket count bounds
+DEFAULT_PRICE_BUCKETS = 10
+MAX_PRICE_BUCKETS = 50
 
 class ProductService:
     @staticmethod
+    @replica_reads()
     def get_products(
         category_id: Optional[int] = None,
         search: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
-        sort_by: str = 'created_at',
+        sort_by: Optional[str] = None,
         sort_order: str = 'desc',
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        include_facets: bool = False,
+        fields: Optional[Tuple[str, ...]] = None
     ) -> Dict[str, Any]:
         """
         Get products with filtering, sorting, and pagination.
         
         Args:
-            category_id: Optional category filter
+            category_id: Optional category filter; matches its whole subtree
             search: Optional search term
             min_price: Optional minimum price filter
             max_price: Optional maximum price filter
-            sort_by: Field to sort by (default: created_at)
+            sort_by: Field to sort by, or 'relevance' (default: relevance
+                when searching, created_at otherwise)
             sort_order: Sort direction (asc/desc)
             page: Page number
             per_page: Items per page
+            cursor: Switches to keyset pagination when not None; pass an
+                empty string for the first page and ``next_cursor`` after
+            include_total: Also count matching rows in keyset mode
+            include_facets: Also return facets for the filter set (see
+                ``get_facets``)
+            fields: Load only the columns these serialized keys need, and
+                the category only if ``category`` is among them (see
+                ``utils.serializers.parse_product_fields``)
             
         Returns:
             Dict containing products and metadata
         """
-        query = Product.query
+        result = ProductService._get_product_page(
+            category_id, search, min_price, max_price, sort_by, sort_order,
+            page, per_page, cursor, include_total, fields
+        )
+        if include_facets:
+            result['facets'] = ProductService.get_facets(category_id, search, min_price, max_price)
+        return result
+
+    @staticmethod
+    def _get_product_page(
+        category_id, search, min_price, max_price, sort_by, sort_order,
+        page, per_page, cursor, include_total, fields=None
+    ) -> Dict[str, Any]:
+        query, relevance = ProductService._filtered_query(
+            category_id, search, min_price, max_price, eager=False
+        )
+        sort_column = SORT_COLUMNS.get(sort_by, Product.created_at)
+        query = query.options(*product_load_options(fields, extra_columns=(sort_column,)))
+
+        sort_order = 'desc' if sort_order == 'desc' else 'asc'
+
+        if cursor is not None:
+            if sort_by == 'relevance':
+                raise ValidationError("Cursor pagination does not support relevance ordering")
+            return ProductService._get_products_after(
+                query, cursor, sort_by if sort_by in SORT_COLUMNS else 'created_at',
+                sort_order, per_page, include_total
+            )
+
+        query = ProductService._ordered(query, relevance, sort_by, sort_order)
+
+        # Apply pagination
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+        return {
+            'items': pagination.items,
+            'total': pagination.total,
+            'pages': pagination.pages,
+            'current_page': page
+        }
+
+    @staticmethod
+    def _ordered(query, relevance, sort_by: Optional[str], sort_order: str):
+        """Apply the listing order; id breaks ties so pages don't overlap."""
+        if sort_by in (None, 'relevance') and relevance is not None:
+            return query.order_by(relevance, Product.id.desc())
+        sort_column = SORT_COLUMNS.get(sort_by, Product.created_at)
+        if sort_order == 'desc':
+            return query.order_by(sort_column.desc(), Product.id.desc())
+        return query.order_by(sort_column.asc(), Product.id.asc())
+
+    @staticmethod
+    @replica_reads()
+    def get_facets(
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        buckets: int = DEFAULT_PRICE_BUCKETS
+    ) -> Dict[str, Any]:
+        """
+        Get filter facets with grouped aggregates in one round trip; no
+        product rows are loaded.
+
+        Each facet ignores its own filter, so the UI can show the other
+        choices: category counts apply the search and price filters, and
+        the price range and histogram apply the category and search
+        filters. Without any filter the cached snapshot is returned.
+
+        Args:
+            buckets: Number of equal-width price histogram buckets
+
+        Returns:
+            Dict with ``categories`` (id, name, slug, count), ``price``
+            (min, max, count) and ``price_histogram`` (min, max, count)
+        """
+        buckets = min(max(buckets, 1), MAX_PRICE_BUCKETS)
+        if not (category_id or search or min_price is not None or max_price is not None):
+            return ProductService.get_facet_snapshot(buckets)
+        return ProductService._compute_facets(category_id, search, min_price, max_price, buckets)
+
+    @staticmethod
+    def get_facet_snapshot(buckets: int = DEFAULT_PRICE_BUCKETS) -> Dict[str, Any]:
+        """Get the unfiltered facets, cached until products or categories change."""
+        backend = get_cache()
+        key = versioned_key(backend, f'facets:{buckets}', ('products', 'categories'))
+        facets = backend.get(key)
+        if facets is None:
+            facets = ProductService._compute_facets(None, None, None, None, buckets)
+            if cache_fill_allowed():
+                backend.set(key, facets)
+        return facets
+
+    @staticmethod
+    def _compute_facets(category_id, search, min_price, max_price, buckets) -> Dict[str, Any]:
+        statement = ProductService._facet_statement(category_id, search, min_price, max_price, buckets)
+        return ProductService._facets_payload(db.session.execute(statement).all(), buckets)
+
+    @staticmethod
+    def _facet_statement(category_id, search, min_price, max_price, buckets: int):
+        """
+        Build one statement returning every facet, so facets cost a single
+        round trip.
+
+        It is a ``UNION ALL`` of ``(kind, key, name, slug, count, low, high)``
+        rows: ``'c'`` rows are category counts, the ``'p'`` row is the price
+        range, and ``'h'`` rows count the products in each histogram bucket.
+        Bucket edges come from the price range in the same statement.
+        """
+        by_category, _ = ProductService._filtered_query(
+            None, search, min_price, max_price, eager=False
+        )
+        counts = by_category.with_entities(
+            Product.category_id.label('category_id'), func.count(Product.id).label('count')
+        ).group_by(Product.category_id).subquery()
+        category_counts = select(
+            literal('c').label('kind'), Category.id.label('key'), Category.name, Category.slug,
+            counts.c.count, cast(null(), Float).label('low'), cast(null(), Float).label('high')
+        ).join(counts, counts.c.category_id == Category.id)
 
-        # Apply category filter
+        by_price, _ = ProductService._filtered_query(category_id, search, None, None, eager=False)
+        prices = by_price.with_entities(Product.price.label('price')).subquery()
+        stats = select(
+            func.min(prices.c.price).label('low'),
+            func.max(prices.c.price).label('high'),
+            func.count().label('count')
+        ).cte('price_stats')
+        price_range = select(
+            literal('p'), cast(null(), Integer), cast(null(), String), cast(null(), String),
+            stats.c.count, stats.c.low, stats.c.high
+        )
+
+        if buckets == 1:
+            # A single bucket is the price range itself
+            return union_all(category_counts, price_range)
+
+        # Same arithmetic as the edges in _price_histogram, so rows land in
+        # the bucket whose bounds are reported. CASE on the edges instead of
+        # floor(): portable and exact.
+        width = (stats.c.high - stats.c.low) / buckets
+        bucket = case(
+            *((prices.c.price < stats.c.low + width * (i + 1), i) for i in range(buckets - 1)),
+            else_=buckets - 1
+        )
+        histogram = select(
+            literal('h'), bucket, cast(null(), String), cast(null(), String),
+            func.count(), cast(null(), Float), cast(null(), Float)
+        ).select_from(prices).join(stats, true()).group_by(bucket)
+        return union_all(category_counts, price_range, histogram)
+
+    @staticmethod
+    def _facets_payload(rows, buckets: int) -> Dict[str, Any]:
+        """Shape the rows of ``_facet_statement`` into the facets response."""
+        categories, bucket_counts = [], {}
+        low = high = None
+        count = 0
+        for kind, key, name, slug, n, row_low, row_high in rows:
+            if kind == 'c':
+                categories.append({'id': key, 'name': name, 'slug': slug, 'count': n})
+            elif kind == 'p':
+                low, high, count = row_low, row_high, n
+            else:
+                bucket_counts[key] = n
+        categories.sort(key=lambda category: (-category['count'], category['name']))
+        return {
+            'categories': categories,
+            'price': {'min': low, 'max': high, 'count': count},
+            'price_histogram': ProductService._price_histogram(low, high, count, buckets, bucket_counts)
+        }
+
+    @staticmethod
+    def _price_histogram(low: Optional[float], high: Optional[float], count: int, buckets: int,
+                         bucket_counts: Dict[int, int]) -> List[Dict[str, Any]]:
+        """Lay out equal-width buckets over ``[low, high]`` with their counts."""
+        if low is None:
+            return []
+        if buckets == 1 or high <= low:
+            return [{'min': low, 'max': high, 'count': count}]
+        width = (high - low) / buckets
+        edges = [low + width * i for i in range(buckets)] + [high]
+        return [
+            {'min': round(edges[i], 2), 'max': round(edges[i + 1], 2), 'count': bucket_counts.get(i, 0)}
+            for i in range(buckets)
+        ]
+
+    @staticmethod
+    def _filtered_query(
+        category_id: Optional[int] = None,
+        search: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        eager: bool = True
+    ):
+        """
+        Build the product query shared by the listing endpoints.
+
+        Args:
+            eager: Eager-load categories; disable for aggregate queries
+
+        Returns:
+            Tuple of (query, relevance ORDER BY clause or None)
+        """
+        query = with_category(Product.query) if eager else Product.query
+        relevance = None
+
+        # Apply category filter to the whole subtree through the path index
         if category_id:
-            query = query.filter_by(category_id=category_id)
+            path = CategoryService.get_path(category_id)
+            if path:
+                subtree = select(Category.id).where(Category.path.like(f'{path}%'))
+                query = query.filter(Product.category_id.in_(subtree))
+            else:
+                query = query.filter_by(category_id=category_id)
 
         # Apply search filter
         if search:
-            search_filter = or_(
-                Product.name.ilike(f'%{search}%'),
-                Product.description.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
+            query, relevance = SearchService.apply(query, search)
 
         # Apply price filters
         if min_price is not None:
@@ -61,30 +314,136 @@ class ProductService:
         if max_price is not None:
             query = query.filter(Product.price <= max_price)
 
-        # Apply sorting
-        sort_column = getattr(Product, sort_by, Product.created_at)
+        return query, relevance
+
+    @staticmethod
+    def _get_products_after(
+        query,
+        cursor: str,
+        sort_by: str,
+        sort_order: str,
+        per_page: int,
+        include_total: bool
+    ) -> Dict[str, Any]:
+        """
+        Fetch the page after ``cursor`` with a range query on ``(sort_key, id)``.
+
+        Unlike ``paginate()`` this never issues an OFFSET scan and only counts
+        rows when ``include_total`` is set, so deep pages cost the same as
+        the first one. Nullable sort keys (``CURSOR_NULL_KEYS``) are
+        compared through ``coalesce``; the other sortable columns are always
+        set.
+        """
+        sort_column = SORT_COLUMNS[sort_by]
+        null_key = CURSOR_NULL_KEYS.get(sort_by)
+        sort_key = sort_column if null_key is None else func.coalesce(sort_column, null_key)
+        per_page = max(per_page, 1)
+        total = query.order_by(None).count() if include_total else None
+
+        if cursor:
+            value, last_id = decode_cursor(
+                cursor, sort_by, sort_order, sort_column.type.python_type
+            )
+            key = tuple_(sort_key, Product.id)
+            bound = tuple_(literal(value, sort_column.type), literal(last_id, Product.id.type))
+            query = query.filter(key < bound if sort_order == 'desc' else key > bound)
+
         if sort_order == 'desc':
-            sort_column = sort_column.desc()
-        query = query.order_by(sort_column)
+            query = query.order_by(sort_key.desc(), Product.id.desc())
+        else:
+            query = query.order_by(sort_key.asc(), Product.id.asc())
 
-        # Apply pagination
-        pagination = query.paginate(page=page, per_page=per_page)
+        rows = query.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = rows[:per_page]
 
-        return {
-            'items': pagination.items,
-            'total': pagination.total,
-            'pages': pagination.pages,
-            'current_page': page
+        next_cursor = None
+        if has_more:
+            last = items[-1]
+            value = getattr(last, sort_by)
+            if value is None:
+                value = null_key
+            next_cursor = encode_cursor(sort_by, sort_order, value, last.id)
+
+        result = {
+            'items': items,
+            'next_cursor': next_cursor,
+            'has_more': has_more
         }
+        if include_total:
+            result['total'] = total
+        return result
 
     @staticmethod
-    def get_product(product_id: int) -> Product:
-        """Get a single product by ID."""
-        product = Product.query.get(product_id)
+    @replica_reads()
+    def get_product_validator(product_id: int) -> Optional[Tuple[Tuple[Any, ...], Optional[datetime]]]:
+        """
+        Get the cache validator for a single product without loading it.
+
+        Returns:
+            Tuple of (validator state, last modified time), or None if the
+            product does not exist
+        """
+        row = db.session.query(Product.updated_at, Category.updated_at).outerjoin(
+            Category, Product.category_id == Category.id
+        ).filter(Product.id == product_id).first()
+        if row is None:
+            return None
+        last_modified = max(filter(None, row), default=None)
+        return (product_id, *row), last_modified
+
+    @staticmethod
+    @replica_reads()
+    def get_product(product_id: int, fields: Optional[Tuple[str, ...]] = None) -> Product:
+        """Get a single product by ID, loading only what ``fields`` needs when given."""
+        if fields is None:
+            product = Product.query.get(product_id)
+        else:
+            product = Product.query.options(*product_load_options(fields)).filter_by(id=product_id).first()
         if not product:
             raise ResourceNotFoundError(f"Product with ID {product_id} not found")
         return product
 
+    @staticmethod
+    @replica_reads()
+    def get_products_by_ids(ids: Any, fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Product], List[int]]:
+        """
+        Get many products by ID with one ``IN`` query, categories included.
+
+        Args:
+            ids: List of IDs, or a comma-separated string of them
+            fields: Load only the columns these serialized keys need
+
+        Returns:
+            Tuple of (products in the order first requested, requested IDs
+            that don't exist)
+        """
+        ids = ProductService._parse_ids(ids)
+        found = {}
+        if ids:
+            query = Product.query.options(*product_load_options(fields)).filter(Product.id.in_(ids))
+            found = {product.id: product for product in query}
+        return [found[pid] for pid in ids if pid in found], [pid for pid in ids if pid not in found]
+
+    @staticmethod
+    def _parse_ids(ids: Any) -> List[int]:
+        """Validate a batch of IDs, dropping repeats but keeping their order."""
+        if isinstance(ids, str):
+            ids = [part.strip() for part in ids.split(',') if part.strip()]
+        if not isinstance(ids, list):
+            raise ValidationError("ids must be a list or a comma-separated string")
+        parsed = []
+        for value in ids:
+            if isinstance(value, str) and value.isdigit():
+                value = int(value)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValidationError(f"Invalid product id: {value}")
+            parsed.append(value)
+        parsed = list(dict.fromkeys(parsed))
+        if len(parsed) > MAX_BATCH_IDS:
+            raise ValidationError(f"At most {MAX_BATCH_IDS} ids per request")
+        return parsed
+
     @staticmethod
     def create_product(data: Dict[str, Any]) -> Product:
         """Create a new product."""
@@ -115,6 +474,128 @@ class ProductService:
         db.session.commit()
         return product
 
+    @staticmethod
+    def bulk_update(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply price, stock and active-flag changes to many products at once.
+
+        Each item identifies a product by ``id`` or ``slug`` and sets any of
+        ``price``, ``stock`` and ``is_active``. Products are resolved with
+        chunked ``IN`` queries and updated with executemany UPDATEs grouped by
+        the fields they set, all in one transaction.
+
+        Returns:
+            Dict with the number of products updated and a result per item
+            (``updated`` with its ``updated_at``, ``not_found`` or ``invalid``)
+        """
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValidationError(f"At most {MAX_BULK_ITEMS} items per request")
+
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            values, errors = ProductService._validate_bulk_item(item)
+            if errors:
+                results[index] = {'index': index, 'status': 'invalid', 'errors': errors}
+            else:
+                valid.append((index, item, values))
+
+        ids = {item['id'] for _, item, _ in valid if 'id' in item}
+        slugs = {item['slug'] for _, item, _ in valid if 'id' not in item}
+        id_by_slug = ProductService._resolve_slugs(slugs)
+        known_ids = ProductService._existing_ids(ids)
+
+        now = datetime.utcnow()
+        groups = {}
+        for index, item, values in valid:
+            product_id = item['id'] if 'id' in item else id_by_slug.get(item['slug'])
+            if product_id is None or ('id' in item and product_id not in known_ids):
+                results[index] = {'index': index, **ProductService._bulk_key(item), 'status': 'not_found'}
+                continue
+            groups.setdefault(tuple(sorted(values)), []).append({'_id': product_id, 'updated_at': now, **values})
+            results[index] = {'index': index, 'id': product_id, 'status': 'updated', 'updated_at': now.isoformat()}
+
+        table = Product.__table__
+        updated_ids = set()
+        try:
+            for fields, rows in groups.items():
+                db.session.execute(
+                    update(table)
+                    .where(table.c.id == bindparam('_id'))
+                    .values({field: bindparam(field) for field in (*fields, 'updated_at')}),
+                    rows
+                )
+                updated_ids.update(row['_id'] for row in rows)
+            invalidate_after_commit(db.session, 'products', *(f'product:{pid}' for pid in updated_ids))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {'updated': len(updated_ids), 'results': results}
+
+    @staticmethod
+    def _validate_bulk_item(item: Any) -> Tuple[Dict[str, Any], List[str]]:
+        if not isinstance(item, dict):
+            return {}, ['Item must be an object']
+        errors = []
+        if ('id' in item) == ('slug' in item):
+            errors.append('Exactly one of id or slug is required')
+        elif 'id' in item and (not isinstance(item['id'], int) or isinstance(item['id'], bool)):
+            errors.append('id must be an integer')
+        elif 'slug' in item and not isinstance(item['slug'], str):
+            errors.append('slug must be a string')
+
+        values = {}
+        if 'price' in item:
+            if not isinstance(item['price'], (int, float)) or isinstance(item['price'], bool) or item['price'] < 0:
+                errors.append('price must be a non-negative number')
+            else:
+                values['price'] = float(item['price'])
+        if 'stock' in item:
+            if not isinstance(item['stock'], int) or isinstance(item['stock'], bool) or item['stock'] < 0:
+                errors.append('stock must be a non-negative integer')
+            else:
+                values['stock'] = item['stock']
+        if 'is_active' in item:
+            if not isinstance(item['is_active'], bool):
+                errors.append('is_active must be a boolean')
+            else:
+                values['is_active'] = item['is_active']
+
+        unknown = set(item) - {'id', 'slug', *BULK_UPDATE_FIELDS}
+        if unknown:
+            errors.append(f"Unknown fields: {', '.join(sorted(unknown))}")
+        if not values and not errors:
+            errors.append(f"Nothing to update; set any of {', '.join(BULK_UPDATE_FIELDS)}")
+        return values, errors
+
+    @staticmethod
+    def _bulk_key(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {'id': item['id']} if 'id' in item else {'slug': item['slug']}
+
+    @staticmethod
+    def _resolve_slugs(slugs: set) -> Dict[str, int]:
+        id_by_slug = {}
+        slugs = list(slugs)
+        for start in range(0, len(slugs), LOOKUP_CHUNK_SIZE):
+            chunk = slugs[start:start + LOOKUP_CHUNK_SIZE]
+            id_by_slug.update(db.session.execute(
+                select(Product.slug, Product.id).where(Product.slug.in_(chunk))
+            ).all())
+        return id_by_slug
+
+    @staticmethod
+    def _existing_ids(ids: set) -> set:
+        existing = set()
+        ids = list(ids)
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+            existing.update(db.session.execute(
+                select(Product.id).where(Product.id.in_(chunk))
+            ).scalars())
+        return existing
+
     @staticmethod
     def delete_product(product_id: int) -> None:
         """Delete a product."""
@@ -0,0 +1,82 @@
+"""
+Search Service Module
+
+This module applies product search terms to a query. It uses the
+full-text index from ``models.product_search`` when the database supports
+it and falls back to the original ``ilike`` scan otherwise.
+"""
+
+import re
+from typing import List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import column, func, literal_column, or_, table
+from .. import db
+from ..models.product import Product
+from ..models.product_search import FTS_TABLE
+
+MAX_SEARCH_TOKENS = 8
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_fts = table(FTS_TABLE, column('rowid'), column('rank'))
+
+def tokenize(term: str) -> List[str]:
+    """Split a search term into plain word tokens safe for either query syntax."""
+    return _TOKEN_RE.findall(term.lower())[:MAX_SEARCH_TOKENS]
+
+class SearchService:
+    @staticmethod
+    def backend() -> str:
+        """
+        Return the search backend for the current database.
+
+        ``PRODUCT_SEARCH_BACKEND`` may be set to ``'ilike'`` to force the
+        scan-based search, e.g. on a database without the full-text index.
+        """
+        if current_app.config.get('PRODUCT_SEARCH_BACKEND', 'fulltext') == 'ilike':
+            return 'ilike'
+        dialect = db.session.get_bind(mapper=Product.__mapper__).dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            return dialect
+        return 'ilike'
+
+    @staticmethod
+    def apply(query, term: str, backend: Optional[str] = None) -> Tuple[object, Optional[object]]:
+        """
+        Filter ``query`` to products matching ``term``.
+
+        Every token must match; the last one also matches as a prefix so
+        results stay useful while the user is typing.
+
+        Returns:
+            Tuple of (filtered query, ORDER BY clause for best-match-first
+            ordering, or None when the backend cannot rank)
+        """
+        backend = backend or SearchService.backend()
+        tokens = tokenize(term)
+        if backend == 'ilike' or not tokens:
+            return SearchService.apply_ilike(query, term), None
+
+        if backend == 'postgresql':
+            tsquery = func.to_tsquery(
+                'english', ' & '.join(tokens[:-1] + [f'{tokens[-1]}:*'])
+            )
+            vector = literal_column('products.search_vector')
+            query = query.filter(vector.op('@@')(tsquery))
+            return query, func.ts_rank_cd(vector, tsquery).desc()
+
+        # SQLite FTS5: quoted tokens never hit the MATCH syntax parser
+        match = ' '.join([f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+        query = query.join(_fts, _fts.c.rowid == Product.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        )
+        # FTS5's rank is bm25(), where lower means more relevant
+        return query, _fts.c.rank.asc()
+
+    @staticmethod
+    def apply_ilike(query, term: str):
+        """Filter with the substring scan used before the full-text index."""
+        return query.filter(or_(
+            Product.name.ilike(f'%{term}%'),
+            Product.description.ilike(f'%{term}%')
+        ))
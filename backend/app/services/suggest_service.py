@@ -0,0 +1,537 @@
+"""
+Suggest Service Module
+
+This module serves search-box suggestions from an in-process index over
+active product and category names, so keystrokes never scan the
+products table.
+
+- ``SuggestIndex`` is a prefix trie over the words of the indexed names.
+  Every trie node keeps its best-ranked entries, so a prefix lookup reads
+  a short list instead of walking the subtree. Entries rank categories
+  first, then shorter names. A trigram index over the vocabulary corrects
+  misspelt words when a query matches nothing.
+- The index is built from one query, on a background thread once the app
+  serves its first request (so CLI commands never build it), or on first
+  use. Only one thread builds; lookups arriving meanwhile wait up to
+  ``SUGGEST_BUILD_WAIT`` seconds for it and get no suggestions after
+  that. Committed writes to this process's products and
+  categories are applied before the next lookup. Changes made by other
+  processes arrive through a periodic sync on ``updated_at``. Products
+  deleted by other processes drop out at the next rebuild.
+
+Configuration:
+    SUGGEST_WARM_ON_STARTUP: Build the index in the background when the app
+        serves its first request (default True)
+    SUGGEST_BUILD_WAIT: Seconds a lookup waits for the first build (default 5)
+    SUGGEST_SYNC_INTERVAL: Seconds between ``updated_at`` syncs (default 30)
+    SUGGEST_MIN_SIMILARITY: Trigram score a correction needs (default 0.5)
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import literal, select, union_all
+from .. import db
+from ..models.category import Category
+from ..models.product import Product
+from ..utils.cache import on_invalidate
+
+DEFAULT_SUGGESTIONS = 8
+MAX_SUGGESTIONS = 20
+# Entries checked when a multi-word query filters past a node's best list
+MAX_SCAN = 5000
+# Words shorter than this are not spell-corrected
+MIN_CORRECTABLE_LENGTH = 3
+# Re-read rows changed shortly before the last sync (clock skew, slow commits)
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# Rank tuples start with the kind's order; categories come first
+KINDS = ('category', 'product')
+KIND_ORDER = {kind: order for order, kind in enumerate(KINDS)}
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+def words(text: str) -> List[str]:
+    """Split text into lowercase words."""
+    return _WORD_RE.findall((text or '').lower())
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of ``word`` padded at the front only, so prefixes share them."""
+    padded = f'  {word}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class _Node:
+    __slots__ = ('children', 'top', 'size', 'word', 'stale')
+
+    def __init__(self):
+        self.children = None
+        self.top = []       # best ranks in this subtree, best first
+        self.size = 0       # postings in this subtree
+        self.word = None    # the word ending here, if any
+        self.stale = False  # ``top`` lost entries and needs a refill
+
+class SuggestIndex:
+    """
+    Prefix trie with per-node top-k lists and a trigram vocabulary index.
+
+    Entries are ranked by ``(kind order, name length, words, id)`` tuples.
+    ``words`` is the entry's lowercase words, each preceded by a space, so
+    ``' ' + prefix in words`` tests a word prefix. The same tuple is
+    shared by the entry, its postings, which stay sorted by rank, and the
+    trie nodes' best lists. The index is not thread-safe by itself;
+    ``SuggestService`` serializes access.
+    """
+
+    def __init__(self, capacity: int = MAX_SUGGESTIONS):
+        self.capacity = capacity
+        self.root = _Node()
+        self.entries: Dict[Tuple[str, int], Tuple[tuple, str, str]] = {}
+        self.postings: Dict[str, List[tuple]] = {}
+        self.grams: Dict[str, Set[str]] = {}
+        self.paths: Dict[str, List[_Node]] = {}
+        self.nodes = 1
+
+    # -- Updates --------------------------------------------------------------
+
+    def add(self, kind: str, entry_id: int, name: str, slug: str) -> None:
+        """Index an entry, replacing any previous version of it."""
+        if (kind, entry_id) in self.entries:
+            self.remove(kind, entry_id)
+        rank = self._rank(kind, entry_id, name)
+        if rank is not None:
+            self._insert(rank, name, slug, in_order=False)
+
+    def add_all(self, rows: Iterable[Tuple[str, int, str, str]]) -> None:
+        """Bulk-index ``(kind, id, name, slug)`` rows into an empty index."""
+        if self.entries:
+            for row in rows:
+                self.add(*row)
+            return
+        ranked = [(self._rank(kind, entry_id, name), name, slug) for kind, entry_id, name, slug in rows]
+        # Best first, so every posting and best list is only appended to
+        ranked.sort(key=lambda item: item[0] or ())
+        for rank, name, slug in ranked:
+            if rank is not None:
+                self._insert(rank, name, slug, in_order=True)
+
+    @staticmethod
+    def _rank(kind: str, entry_id: int, name: str) -> Optional[tuple]:
+        tokens = dict.fromkeys(words(name))
+        if not tokens:
+            return None
+        return (KIND_ORDER[kind], len(name), ' ' + ' '.join(tokens), entry_id)
+
+    def _insert(self, rank: tuple, name: str, slug: str, in_order: bool) -> None:
+        self.entries[(KINDS[rank[0]], rank[3])] = (rank, name, slug)
+        capacity = self.capacity
+        for token in rank[2].split():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = []
+                self.paths[token] = self._path(token)
+                for gram in trigrams(token):
+                    self.grams.setdefault(gram, set()).add(token)
+            if in_order:
+                posting.append(rank)
+            else:
+                bisect.insort(posting, rank)
+            for node in self.paths[token]:
+                node.size += 1
+                top = node.top
+                if not in_order:
+                    self._offer(node, rank)
+                elif len(top) < capacity and (not top or top[-1] is not rank):
+                    top.append(rank)
+
+    def remove(self, kind: str, entry_id: int) -> None:
+        """Drop an entry if it is indexed."""
+        entry = self.entries.pop((kind, entry_id), None)
+        if entry is None:
+            return
+        rank = entry[0]
+        for token in rank[2].split():
+            for node in self.paths[token]:
+                node.size -= 1
+                if rank in node.top:
+                    node.top.remove(rank)
+                    node.stale = node.size > len(node.top)
+            posting = self.postings[token]
+            del posting[bisect.bisect_left(posting, rank)]
+            if not posting:
+                del self.postings[token]
+                del self.paths[token]
+                for gram in trigrams(token):
+                    vocabulary = self.grams[gram]
+                    vocabulary.discard(token)
+                    if not vocabulary:
+                        del self.grams[gram]
+
+    def _path(self, token: str) -> List[_Node]:
+        """Create the nodes for ``token``; return them from its first letter to its last."""
+        node, path = self.root, []
+        for char in token:
+            child = node.children.get(char) if node.children else None
+            if child is None:
+                if node.children is None:
+                    node.children = {}
+                child = node.children[char] = _Node()
+                self.nodes += 1
+            node = child
+            path.append(node)
+        node.word = token
+        return path
+
+    def _offer(self, node: _Node, rank: tuple) -> None:
+        top = node.top
+        if rank in top or (len(top) >= self.capacity and rank > top[-1]):
+            return
+        bisect.insort(top, rank)
+        if len(top) > self.capacity:
+            top.pop()
+
+    # -- Lookups --------------------------------------------------------------
+
+    def _find(self, prefix: str) -> Optional[_Node]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char) if node.children else None
+            if node is None:
+                return None
+        return node
+
+    def has_prefix(self, prefix: str) -> bool:
+        """Whether any indexed word starts with ``prefix``."""
+        node = self._find(prefix)
+        return node is not None and node.size > 0
+
+    def _ranked(self, node: _Node):
+        """Iterate over the entries under ``node`` best first, each once."""
+        postings, stack = [], [node]
+        while stack:
+            current = stack.pop()
+            if current.word is not None and current.word in self.postings:
+                postings.append(self.postings[current.word])
+            if current.children:
+                stack.extend(current.children.values())
+        if len(postings) == 1:
+            return iter(postings[0])
+        return self._merged(postings)
+
+    @staticmethod
+    def _merged(postings: List[List[tuple]]):
+        # An entry with two words under the node is posted twice
+        previous = None
+        for rank in heapq.merge(*postings):
+            if rank is not previous:
+                yield rank
+            previous = rank
+
+    def _best(self, node: _Node) -> List[tuple]:
+        """Return the node's best list, refilling it from the subtree if stale."""
+        if node.stale:
+            node.top = list(itertools.islice(self._ranked(node), self.capacity))
+            node.stale = False
+        return node.top
+
+    def lookup(self, query_words: List[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Return the best entries having a word that starts with each query word.
+
+        The query word with the smallest subtree drives the lookup. Its
+        node's best list answers most queries. Otherwise its postings are
+        merged in rank order and filtered until ``limit`` entries match or
+        ``MAX_SCAN`` entries have been checked.
+        """
+        prefixes = list(dict.fromkeys(query_words))
+        if not all(self.has_prefix(prefix) for prefix in prefixes):
+            return []
+        pivot = min(prefixes, key=lambda prefix: self._find(prefix).size)
+        node = self._find(pivot)
+        needles = [f' {prefix}' for prefix in prefixes if prefix != pivot]
+
+        best = self._best(node)
+        ranks = [rank for rank in best if all(needle in rank[2] for needle in needles)]
+        if len(ranks) < limit and node.size > len(best):
+            ranks = []
+            for rank in itertools.islice(self._ranked(node), MAX_SCAN):
+                text = rank[2]
+                for needle in needles:
+                    if needle not in text:
+                        break
+                else:
+                    ranks.append(rank)
+                    if len(ranks) == limit:
+                        break
+        return [self._payload(rank) for rank in ranks[:limit]]
+
+    def correct(self, word: str, min_similarity: float) -> Optional[str]:
+        """
+        Return the indexed word closest to ``word`` by trigram overlap.
+
+        The score is the share of ``word``'s trigrams that the candidate
+        has. Trigrams are padded only at the front, so a correctly typed
+        prefix of a long word still scores high. Ties go to the candidate
+        closest in length.
+        """
+        if len(word) < MIN_CORRECTABLE_LENGTH:
+            return None
+        grams = trigrams(word)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.grams.get(gram, ()))
+        if not shared:
+            return None
+        score, _, best = min(
+            (-count / len(grams), abs(len(token) - len(word)), token)
+            for token, count in shared.items()
+        )
+        return best if -score >= min_similarity else None
+
+    def _payload(self, rank: tuple) -> Dict[str, Any]:
+        kind = KINDS[rank[0]]
+        _, name, slug = self.entries[(kind, rank[3])]
+        return {'type': kind, 'id': rank[3], 'name': name, 'slug': slug}
+
+    # -- Reporting ------------------------------------------------------------
+
+    def memory_bytes(self) -> int:
+        """Approximate deep size of the index's structures, shared objects counted once."""
+        seen = set()
+        total = 0
+        stack = [self.entries, self.postings, self.grams, self.paths, self.root]
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set)):
+                stack.extend(obj)
+            elif isinstance(obj, _Node):
+                stack.extend((obj.children, obj.top, obj.word))
+        return total
+
+class SuggestService:
+    """Owns the app's suggest index and keeps it in sync with the database."""
+
+    def __init__(self, app):
+        self.app = app
+        self.index: Optional[SuggestIndex] = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._warming = False
+        self._pending_products: Set[int] = set()
+        self._categories_changed = False
+        self._synced_at: Optional[datetime] = None
+        self._next_sync = 0.0
+        self.build_ms = None
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGESTIONS) -> Dict[str, Any]:
+        """
+        Get up to ``limit`` suggestions for a partially typed query.
+
+        Every word must match the start of a word in the name. When nothing
+        matches, misspelt words are replaced by their closest indexed word
+        and the corrected query is returned too.
+
+        Returns:
+            Dict with ``suggestions`` (type, id, name, slug) and
+            ``corrected`` (the corrected query, or None)
+        """
+        limit = min(max(limit, 1), MAX_SUGGESTIONS)
+        query_words = words(query)
+        if not query_words:
+            return {'suggestions': [], 'corrected': None}
+
+        if not self._ensure_index():
+            return {'suggestions': [], 'corrected': None}
+        self._refresh()
+        with self._lock:
+            suggestions = self.index.lookup(query_words, limit)
+            corrected = None
+            if not suggestions:
+                min_similarity = self.app.config.get('SUGGEST_MIN_SIMILARITY', 0.5)
+                fixed = [
+                    word if self.index.has_prefix(word) else (self.index.correct(word, min_similarity) or word)
+                    for word in query_words
+                ]
+                if fixed != query_words:
+                    suggestions = self.index.lookup(fixed, limit)
+                    corrected = ' '.join(fixed) if suggestions else None
+        return {'suggestions': suggestions, 'corrected': corrected}
+
+    def build(self) -> None:
+        """Build a fresh index from one query and swap it in."""
+        with self._build_lock:
+            self._build()
+
+    def _build(self) -> None:
+        start = time.perf_counter()
+        synced_at = datetime.utcnow()
+        products = select(
+            literal('product').label('kind'), Product.id, Product.name, Product.slug
+        ).where(Product.is_active.is_(True))
+        categories = select(
+            literal('category').label('kind'), Category.id, Category.name, Category.slug
+        ).where(Category.is_active.is_(True))
+        rows = db.session.execute(union_all(products, categories)).all()
+
+        index = SuggestIndex()
+        index.add_all(rows)
+        with self._lock:
+            self.index = index
+            self._synced_at = synced_at
+            self._next_sync = time.monotonic() + self.app.config.get('SUGGEST_SYNC_INTERVAL', 30)
+        self.build_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    def queue(self, product_ids: Iterable[int] = (), categories: bool = False) -> None:
+        """Note committed writes to apply before the next lookup."""
+        with self._lock:
+            self._pending_products.update(product_ids)
+            self._categories_changed = self._categories_changed or categories
+
+    def warm(self) -> None:
+        """Start building the index on a background thread, once."""
+        with self._lock:
+            if self._warming:
+                return
+            self._warming = True
+        threading.Thread(target=_warm, args=(self.app,), name='suggest-warm', daemon=True).start()
+
+    def _ensure_index(self) -> bool:
+        """
+        Build the index if there is none. Concurrent callers wait for that
+        one build, up to ``SUGGEST_BUILD_WAIT`` seconds.
+
+        Returns:
+            Whether the index is ready
+        """
+        if self.index is not None:
+            return True
+        if not self._build_lock.acquire(timeout=self.app.config.get('SUGGEST_BUILD_WAIT', 5)):
+            return False
+        try:
+            if self.index is None:
+                self._build()
+        finally:
+            self._build_lock.release()
+        return True
+
+    def _refresh(self) -> None:
+        with self._lock:
+            product_ids, self._pending_products = self._pending_products, set()
+            categories, self._categories_changed = self._categories_changed, False
+            periodic = time.monotonic() >= self._next_sync
+            if periodic:
+                self._next_sync = time.monotonic() + self.app.config.get('SUGGEST_SYNC_INTERVAL', 30)
+            since = self._synced_at - SYNC_OVERLAP
+        if not (product_ids or categories or periodic):
+            return
+
+        synced_at = datetime.utcnow()
+        product_filter = Product.id.in_(product_ids) if product_ids else None
+        if periodic:
+            changed = Product.updated_at >= since
+            product_filter = changed if product_filter is None else (changed | product_filter)
+        statements = []
+        if product_filter is not None:
+            statements.append(select(
+                literal('product').label('kind'), Product.id, Product.name, Product.slug, Product.is_active
+            ).where(product_filter))
+        if categories or periodic:
+            statements.append(select(
+                literal('category').label('kind'), Category.id, Category.name, Category.slug, Category.is_active
+            ))
+        rows = db.session.execute(union_all(*statements) if len(statements) > 1 else statements[0]).all()
+
+        with self._lock:
+            found = set()
+            for kind, entry_id, name, slug, is_active in rows:
+                found.add((kind, entry_id))
+                if is_active:
+                    self.index.add(kind, entry_id, name, slug)
+                else:
+                    self.index.remove(kind, entry_id)
+            # Queued products that no longer exist were deleted
+            for product_id in product_ids:
+                if ('product', product_id) not in found:
+                    self.index.remove('product', product_id)
+            if categories or periodic:
+                for kind, entry_id in [key for key in self.index.entries if key[0] == 'category']:
+                    if (kind, entry_id) not in found:
+                        self.index.remove(kind, entry_id)
+            if periodic:
+                self._synced_at = synced_at
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the index's size and approximate memory footprint."""
+        if not self._ensure_index():
+            return {'ready': False}
+        self._refresh()
+        with self._lock:
+            index = self.index
+            kinds = Counter(kind for kind, _ in index.entries)
+            return {
+                'ready': True,
+                'products': kinds.get('product', 0),
+                'categories': kinds.get('category', 0),
+                'words': len(index.postings),
+                'trie_nodes': index.nodes,
+                'trigrams': len(index.grams),
+                'memory_bytes': index.memory_bytes(),
+                'build_ms': self.build_ms,
+                'synced_at': self._synced_at.isoformat() if self._synced_at else None
+            }
+
+def get_suggest_service(app=None) -> SuggestService:
+    """Return the app's suggest service."""
+    app = app or current_app._get_current_object()
+    service = app.extensions.get('edhaus_suggest')
+    if service is None:
+        service = app.extensions.setdefault('edhaus_suggest', SuggestService(app))
+    return service
+
+@on_invalidate
+def _queue_suggest_updates(tags):
+    if not has_app_context():
+        return
+    service = current_app.extensions.get('edhaus_suggest')
+    if service is None or service.index is None:
+        return
+    product_ids = [int(tag.split(':', 1)[1]) for tag in tags if tag.startswith('product:')]
+    if product_ids or 'categories' in tags:
+        service.queue(product_ids, categories='categories' in tags)
+
+def _warm(app) -> None:
+    with app.app_context():
+        try:
+            get_suggest_service(app)._ensure_index()
+        except Exception as e:
+            app.logger.warning(f"Suggest index not built in the background, building on first use: {e}")
+        finally:
+            db.session.remove()
+
+def _warm_on_first_request() -> None:
+    service = get_suggest_service()
+    if not service._warming:
+        service.warm()
+
+def init_app(app) -> None:
+    """
+    Build the suggest index on a background thread once the app serves
+    its first request; processes that never serve one, like CLI commands,
+    don't query the catalog for it.
+    """
+    if app.config.get('SUGGEST_WARM_ON_STARTUP', True):
+        app.before_request(_warm_on_first_request)
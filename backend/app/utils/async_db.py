@@ -0,0 +1,158 @@
+"""
+Async Database Module
+
+This module runs the async catalog read path. Async views and services
+share one event loop that runs on a background thread, so the async
+engine's pooled connections stay bound to a single loop. The loop also
+replaces Flask's per-request ``asgiref`` loop (``app.async_to_sync``). A
+request thread only waits for its result, and independent queries run
+concurrently on their own connections.
+
+Coroutines are scheduled with a copy of the caller's context, so they see
+the caller's app and request context. Work that touches the sync session
+(building filters from cached categories, choosing the search backend or
+the replica) must not block the shared loop; ``run_in_thread`` runs it on
+the loop's executor in the same context.
+
+Reads follow the replica rules of ``utils.db_routing``: when
+``replica_allowed()`` holds, sessions come from an async engine on the
+replica bind (``ASYNC_REPLICA_URL``, derived from the bind's URL by
+default).
+
+Configuration:
+    ASYNC_READS_ENABLED: Serve the async endpoints (default False)
+    ASYNC_DATABASE_URL: Async URL; derived from ``SQLALCHEMY_DATABASE_URI``
+        by default (asyncpg for PostgreSQL, aiosqlite for SQLite)
+    ASYNC_REPLICA_URL: Async URL of the replica, if one is configured
+    ASYNC_POOL_SIZE / ASYNC_MAX_OVERFLOW: Async pool sizing (default 20/20)
+    ASYNC_TIMEOUT: Seconds a request waits for its coroutine (default 30)
+"""
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Optional
+from flask import current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from .db_routing import REPLICA_BIND, replica_allowed
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+def async_url(url: str) -> str:
+    """Map a sync database URL to its async driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+class EventLoopThread:
+    """An event loop on a daemon thread that runs coroutines for sync callers."""
+
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+        self.loop = asyncio.new_event_loop()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='async-db-loop', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run ``coroutine`` on the loop and wait for its result."""
+        # run_coroutine_threadsafe schedules with a copy of this context
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def async_to_sync(self, func):
+        """Replacement for ``Flask.async_to_sync`` that uses this loop."""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+        return wrapper
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self._thread = None
+
+def _bind_url(app, bind: Optional[str]) -> str:
+    if bind is None:
+        return app.config.get('ASYNC_DATABASE_URL') or async_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    replica = app.config['SQLALCHEMY_BINDS'][bind]
+    return app.config.get('ASYNC_REPLICA_URL') or async_url(replica['url'] if isinstance(replica, dict) else replica)
+
+def get_async_engine(bind: Optional[str] = None) -> AsyncEngine:
+    """Return the app's async engine for ``bind`` (None: the primary), creating it on first use."""
+    app = current_app._get_current_object()
+    key = f'edhaus_async_engine:{bind or "primary"}'
+    engine = app.extensions.get(key)
+    if engine is None:
+        url = _bind_url(app, bind)
+        options = {}
+        if not url.startswith('sqlite'):
+            options = {
+                'pool_size': app.config.get('ASYNC_POOL_SIZE', 20),
+                'max_overflow': app.config.get('ASYNC_MAX_OVERFLOW', 20),
+                'pool_pre_ping': True,
+            }
+        engine = app.extensions.setdefault(key, create_async_engine(url, **options))
+    return engine
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Return the async session factory for the current read; use one session
+    per concurrent query.
+
+    Picks the replica when ``replica_allowed()``, which may query the
+    replica's lag: call it through ``run_in_thread`` from a coroutine.
+    """
+    app = current_app._get_current_object()
+    bind = REPLICA_BIND if replica_allowed() else None
+    key = f'edhaus_async_sessions:{bind or "primary"}'
+    factory = app.extensions.get(key)
+    if factory is None:
+        factory = app.extensions.setdefault(
+            key, async_sessionmaker(get_async_engine(bind), expire_on_commit=False)
+        )
+    return factory
+
+async def run_in_thread(fn: Callable, *args, **kwargs) -> Any:
+    """Run blocking ``fn`` on the loop's executor with the caller's context."""
+    call = partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+def get_event_loop_thread(app=None) -> EventLoopThread:
+    """Return the app's shared event loop thread, starting it on first use."""
+    app = app or current_app._get_current_object()
+    runner = app.extensions.get('edhaus_async_loop')
+    if runner is None:
+        runner = app.extensions.setdefault(
+            'edhaus_async_loop', EventLoopThread(app.config.get('ASYNC_TIMEOUT', 30))
+        )
+        runner.start()
+    return runner
+
+def init_app(app) -> None:
+    """Run the app's async views on the shared loop, if async reads are enabled."""
+    if not app.config.get('ASYNC_READS_ENABLED', False):
+        return
+    app.async_to_sync = get_event_loop_thread(app).async_to_sync
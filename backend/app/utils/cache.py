@@ -0,0 +1,229 @@
+"""
+Cache Module
+
+This module provides the caching layer used by the public read endpoints:
+
+- ``CacheBackend``: the interface a cache store implements. Besides plain
+  key/value access it keeps per-tag version counters; cache keys embed the
+  versions of their tags, so bumping a tag invalidates every entry that
+  depends on it without enumerating keys. A shared store (e.g. Redis with
+  ``INCR``) can implement the same interface.
+- ``LRUCache``: an in-process LRU store with a TTL and hit/miss/eviction
+  counters.
+- Write-driven invalidation: ORM writes to tracked models queue tags on the
+  session, and the tags are bumped once the transaction commits.
+
+Tags are bumped in the process that committed the write. With several
+worker processes and the default ``LRUCache``, other workers keep serving
+their entries until the entries' TTL (``CACHE_TTL``) runs out, so the TTL
+bounds how stale a response can be. A shared ``CACHE_BACKEND`` removes
+that window.
+"""
+
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+class CacheBackend(ABC):
+    """Interface for cache stores."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under ``key``, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` for ``ttl`` seconds (the store's default when None)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def get_version(self, tag: str) -> int:
+        """Return the current version of ``tag``."""
+
+    @abstractmethod
+    def bump_version(self, tag: str) -> None:
+        """Invalidate every entry keyed on the current version of ``tag``."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return counters for the cache stats endpoint."""
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL.
+
+    Tag versions are kept in their own LRU of ``max_versions`` tags, since
+    writes bump a tag per row (``product:<id>``, ``user:<id>``). Versions
+    come from one counter, so a bump always yields a version no entry was
+    keyed on. A tag whose version is evicted reports the highest version
+    evicted so far: at least its last version, so entries keyed on older
+    versions stay unreachable.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 60, max_versions: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_versions = max_versions or maxsize * 4
+        self._entries = OrderedDict()
+        self._versions = OrderedDict()
+        self._version_counter = itertools.count(1)
+        self._version_floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_version(self, tag: str) -> int:
+        with self._lock:
+            version = self._versions.get(tag)
+            if version is None:
+                return self._version_floor
+            self._versions.move_to_end(tag)
+            return version
+
+    def bump_version(self, tag: str) -> None:
+        with self._lock:
+            self._versions[tag] = next(self._version_counter)
+            self._versions.move_to_end(tag)
+            while len(self._versions) > self.max_versions:
+                _, version = self._versions.popitem(last=False)
+                self._version_floor = max(self._version_floor, version)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self).__name__,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'tag_versions': len(self._versions),
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+def get_cache(app=None) -> CacheBackend:
+    """
+    Return the app's cache backend, creating it on first use.
+
+    ``CACHE_BACKEND`` may hold a ready ``CacheBackend`` instance (e.g. a
+    shared store); otherwise an ``LRUCache`` is built from ``CACHE_MAXSIZE``,
+    ``CACHE_TTL`` and ``CACHE_MAX_TAG_VERSIONS``.
+    """
+    app = app or current_app._get_current_object()
+    backend = app.extensions.get('edhaus_cache')
+    if backend is None:
+        backend = app.config.get('CACHE_BACKEND') or LRUCache(
+            maxsize=app.config.get('CACHE_MAXSIZE', 1024),
+            ttl=app.config.get('CACHE_TTL', 60),
+            max_versions=app.config.get('CACHE_MAX_TAG_VERSIONS')
+        )
+        backend = app.extensions.setdefault('edhaus_cache', backend)
+    return backend
+
+def versioned_key(backend: CacheBackend, key: str, tags: Iterable[str]) -> str:
+    """Embed the current version of each tag in ``key``."""
+    versions = ','.join(f'{tag}@{backend.get_version(tag)}' for tag in sorted(tags))
+    return f'{key}|{versions}'
+
+# -- Write-driven invalidation ---------------------------------------------
+
+_PENDING_KEY = 'cache_pending_tags'
+_invalidation_listeners: List[Callable[[set], None]] = []
+
+def on_invalidate(listener: Callable[[set], None]) -> Callable[[set], None]:
+    """Register ``listener(tags)`` to run after committed writes bump tags."""
+    _invalidation_listeners.append(listener)
+    return listener
+
+def invalidate_tags(*tags: str) -> None:
+    """Bump ``tags`` immediately and notify listeners."""
+    tags = set(tags)
+    if has_app_context():
+        backend = get_cache()
+        for tag in tags:
+            backend.bump_version(tag)
+    for listener in _invalidation_listeners:
+        listener(tags)
+
+def invalidate_after_commit(session: Session, *tags: str) -> None:
+    """
+    Queue ``tags`` to be invalidated when ``session`` commits.
+
+    Bulk statements bypass the ORM events below, so code issuing them must
+    call this itself.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+def track_changes(model, tags_for: Callable[[Any], Iterable[str]]) -> None:
+    """Invalidate ``tags_for(instance)`` whenever an instance of ``model`` is written."""
+    def queue_tags(mapper, connection, target):
+        session = Session.object_session(target)
+        if session is not None:
+            invalidate_after_commit(session, *tags_for(target))
+
+    for name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, name, queue_tags)
+
+@event.listens_for(Session, 'after_commit')
+def _flush_pending_tags(session):
+    # Bump only once the write is visible to other sessions, otherwise a
+    # concurrent request could cache the pre-commit state again.
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        invalidate_tags(*tags)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_tags(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,236 @@
+"""
+Catalog Generator Module
+
+This module fills the database with a large synthetic catalog for
+performance work: a category tree of configurable size and fan-out, and
+products with hardware-store names, multi-sentence descriptions,
+per-category log-normal prices and skewed category popularity.
+
+Output is fully determined by the seed and the sizes (timestamps are
+anchored to a fixed date rather than the current time), so a slow query
+found on one machine can be reproduced on another.
+"""
+
+import itertools
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from sqlalchemy import insert
+from .. import db
+from ..models.product import Product
+from .db_init import init_categories
+
+# Timestamps are spread over the two years before this date
+ANCHOR_DATE = datetime(2024, 1, 1)
+
+DEPARTMENTS = (
+    'Building', 'Finishing', 'Plumbing', 'Electrical', 'Roofing', 'Hardware',
+    'Garden', 'Adhesives', 'Timber', 'Paint', 'Safety', 'Storage',
+)
+GROUPS = (
+    'Materials', 'Supplies', 'Fittings', 'Accessories', 'Tools', 'Fixtures',
+    'Essentials', 'Systems', 'Components', 'Products',
+)
+ADJECTIVES = (
+    'Galvanized', 'Heavy Duty', 'Stainless', 'Reinforced', 'Treated',
+    'Waterproof', 'Industrial', 'Premium', 'Standard', 'Lightweight',
+    'Pre-painted', 'Fire Rated', 'Anti-rust', 'Flexible', 'High Tensile',
+)
+MATERIALS = (
+    'steel', 'iron', 'timber', 'cement', 'ceramic', 'porcelain', 'pvc',
+    'copper', 'aluminium', 'brass', 'concrete', 'gypsum', 'granite',
+    'silicone', 'rubber', 'glass', 'mahogany', 'cypress', 'terrazzo', 'zinc',
+)
+PRODUCT_TYPES = (
+    'pipe', 'sheet', 'bar', 'plank', 'tile', 'valve', 'elbow', 'hinge',
+    'lock', 'bolt', 'nut', 'washer', 'screw', 'nail', 'mesh', 'wire', 'tank',
+    'primer', 'emulsion', 'gloss', 'sealant', 'membrane', 'grout', 'mortar',
+    'brush', 'roller', 'hammer', 'saw', 'chisel', 'drill', 'tap', 'sink',
+)
+SIZES = (
+    '6mm', '8mm', '10mm', '12mm', '16mm', '20mm', '25mm', '32mm', '50mm',
+    '1/2in', '3/4in', '1in', '2in', '1m', '2.4m', '3m', '6m', '12m',
+    '1L', '4L', '20L', '5kg', '25kg', '50kg',
+)
+USES = (
+    'foundations', 'roofing', 'wet areas', 'outdoor use', 'interior walls',
+    'structural framing', 'water supply lines', 'kitchen fit-outs',
+    'floor finishing', 'fencing', 'drainage', 'general repairs',
+)
+DESCRIPTION_TEMPLATES = (
+    '{adjective} {material} {type} suitable for {use}.',
+    'Manufactured to KEBS standards for reliable performance in {use}.',
+    'Supplied in {size} lengths and packs; cut to size on request.',
+    'Resists corrosion and wear, making it ideal for {use} and {use2}.',
+    'A contractor favourite for {use}, compatible with standard {material} fittings.',
+    'Easy to install with common tools; pairs well with our {type2} range.',
+    'Delivered within Nairobi in 24 hours; bulk discounts apply on site orders.',
+)
+
+def slugify(value: str) -> str:
+    """Lower-case ``value`` and join its words with hyphens."""
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+
+def build_category_tree(rng: random.Random, n_categories: int, branching: int, depth: int) -> List[Dict[str, Any]]:
+    """
+    Build a nested category tree in ``init_categories`` format.
+
+    Nodes are expanded breadth-first, each getting 1 to ``2 * branching - 1``
+    children (``branching`` on average) until ``n_categories`` exist; nodes
+    at ``depth`` are never expanded, so extra roots are added when the
+    deeper levels fill up.
+    """
+    count = 0
+
+    def new_node(level):
+        nonlocal count
+        count += 1
+        name = f'{rng.choice(DEPARTMENTS)} {rng.choice(GROUPS)}' if level == 1 else \
+            f'{rng.choice(MATERIALS).title()} {rng.choice(PRODUCT_TYPES).title()}s'
+        return {
+            'name': name,
+            'description': f'{name} for {rng.choice(USES)}',
+            'slug': f'{slugify(name)}-{count}',
+            'children': [],
+            '_level': level,
+        }
+
+    roots = [new_node(1) for _ in range(min(branching, n_categories))]
+    queue = list(roots)
+    while count < n_categories:
+        if not queue:
+            root = new_node(1)
+            roots.append(root)
+            queue.append(root)
+            continue
+        parent = queue.pop(0)
+        if parent['_level'] >= depth:
+            continue
+        for _ in range(min(rng.randint(1, 2 * branching - 1), n_categories - count)):
+            child = new_node(parent['_level'] + 1)
+            parent['children'].append(child)
+            queue.append(child)
+    return roots
+
+def _leaves(nodes: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for node in nodes:
+        if node['children']:
+            yield from _leaves(node['children'])
+        else:
+            yield node
+
+def _price(rng: random.Random, mu: float, sigma: float) -> float:
+    """A log-normal price with shop-style rounding (KES)."""
+    price = rng.lognormvariate(mu, sigma)
+    if price < 100:
+        return round(price, 2)
+    step = 5 if price < 1000 else 50
+    price = max(step, round(price / step) * step)
+    # Some prices end in 99, e.g. 1499 rather than 1500
+    return float(price - 1) if rng.random() < 0.3 else float(price)
+
+def product_rows(
+    rng: random.Random,
+    n_products: int,
+    categories: List[Dict[str, Any]],
+    batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield product rows in batches.
+
+    Args:
+        categories: Leaf categories with ``id``; each gets a price profile
+            and a Pareto-distributed popularity weight
+    """
+    profiles = [(rng.uniform(5.0, 9.5), rng.uniform(0.3, 0.9)) for _ in categories]
+    cum_weights = list(itertools.accumulate(rng.paretovariate(1.2) for _ in categories))
+    population = range(len(categories))
+    span = 730 * 86400
+
+    batch = []
+    for i in range(n_products):
+        index = rng.choices(population, cum_weights=cum_weights)[0]
+        mu, sigma = profiles[index]
+        words = {
+            'adjective': rng.choice(ADJECTIVES),
+            'material': rng.choice(MATERIALS),
+            'type': rng.choice(PRODUCT_TYPES),
+            'type2': rng.choice(PRODUCT_TYPES),
+            'size': rng.choice(SIZES),
+            'use': rng.choice(USES),
+            'use2': rng.choice(USES),
+        }
+        name = f"{words['adjective']} {words['material'].title()} {words['type'].title()} {words['size']}"
+        sentences = rng.sample(DESCRIPTION_TEMPLATES, rng.randint(2, 4))
+        created_at = ANCHOR_DATE - timedelta(seconds=rng.uniform(0, span))
+        batch.append({
+            'name': name,
+            'description': ' '.join(sentence.format(**words) for sentence in sentences),
+            'price': _price(rng, mu, sigma),
+            # Some products are out of stock; the rest follow a long tail
+            'stock': 0 if rng.random() < 0.08 else int(rng.expovariate(1 / 60)) + 1,
+            'category_id': categories[index]['id'],
+            'slug': f'{slugify(name)}-{i + 1}',
+            'is_active': rng.random() >= 0.03,
+            'created_at': created_at,
+            'updated_at': created_at + (ANCHOR_DATE - created_at) * rng.random(),
+        })
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def generate_catalog(
+    n_products: int,
+    n_categories: int = 200,
+    branching: int = 8,
+    depth: int = 3,
+    seed: int = 42,
+    batch_size: int = 5000,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """
+    Insert a synthetic catalog into empty tables with bulk INSERTs.
+
+    Products are committed one batch at a time, so memory use stays flat
+    for catalogs of a million rows. Must run in an app context.
+
+    Args:
+        n_products: Number of products
+        n_categories: Number of categories in the tree
+        branching: Average children per expanded category
+        depth: Maximum tree depth
+        seed: Random seed; the same arguments always give the same catalog
+        batch_size: Products per INSERT and commit
+        progress: Called with (products inserted, total) after each batch
+
+    Returns:
+        Summary of what was generated
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    tree = build_category_tree(rng, max(n_categories, 1), max(branching, 1), max(depth, 1))
+    category_ids = init_categories(tree)
+
+    leaves = list(_leaves(tree))
+    for leaf in leaves:
+        leaf['id'] = category_ids[leaf['slug']]
+
+    inserted = 0
+    for batch in product_rows(rng, n_products, leaves, batch_size):
+        db.session.execute(insert(Product), batch)
+        db.session.commit()
+        inserted += len(batch)
+        if progress:
+            progress(inserted, n_products)
+
+    return {
+        'seed': seed,
+        'categories': len(category_ids),
+        'leaf_categories': len(leaves),
+        'products': inserted,
+        'seconds': round(time.perf_counter() - started, 2),
+    }
@@ -0,0 +1,261 @@
+"""
+Database Routing Module
+
+This module sends catalog reads to a read replica configured as the
+``replica`` bind (``SQLALCHEMY_BINDS``) and keeps everything else on the
+primary. A ``do_orm_execute`` listener picks the engine per statement. A
+SELECT goes to the replica only when all of these hold:
+
+- it runs inside a replica scope: a GET/HEAD request to a blueprint listed
+  in ``REPLICA_READ_BLUEPRINTS``, or code wrapped in ``replica_reads()``;
+- it is not ``SELECT ... FOR UPDATE``;
+- the session has not written anything yet (reads after a write see it);
+- the client is not inside its read-your-writes window: after a request
+  that writes, the response carries a ``X-Primary-Until`` header and a
+  cookie of the same name, and requests presenting an unexpired value
+  stay on the primary for ``REPLICA_STICKY_SECONDS``;
+- the replica's lag, checked at most every ``REPLICA_LAG_CHECK_INTERVAL``
+  seconds, is below ``REPLICA_MAX_LAG_SECONDS`` (and it is reachable).
+
+Data read from the replica must not fill a cache right after a write:
+the write's tags are already bumped, so a pre-write replica read would be
+cached under the new versions and served until the next write.
+``cache_fill_allowed()`` refuses such fills for the lag window after this
+process last invalidated cache tags.
+
+Configuration:
+    REPLICA_READ_BLUEPRINTS: Blueprints whose GETs read from the replica
+        (default ('product', 'product_async'))
+    REPLICA_STICKY_SECONDS: Read-your-writes window (default 5)
+    REPLICA_MAX_LAG_SECONDS: Lag above which reads fall back (default 5)
+    REPLICA_LAG_CHECK_INTERVAL: Seconds between lag checks (default 2)
+    REPLICA_LAG_QUERY: SQL returning the lag in seconds; defaults to a
+        PostgreSQL streaming-replication query, and to 0 elsewhere
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from .. import db
+from .cache import on_invalidate
+
+REPLICA_BIND = 'replica'
+PRIMARY_UNTIL = 'X-Primary-Until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_WROTE_KEY = 'db_routing_wrote'
+_LAST_INVALIDATION = 'edhaus_last_invalidation'
+
+POSTGRES_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_replica_scope: ContextVar[bool] = ContextVar('edhaus_replica_scope', default=False)
+
+def database_config(
+    primary_url: str,
+    replica_url: Optional[str] = None,
+    primary_pool_size: int = 10,
+    primary_max_overflow: int = 20,
+    replica_pool_size: int = 20,
+    replica_max_overflow: int = 40,
+    pool_recycle: int = 1800
+) -> Dict[str, Any]:
+    """
+    Build the SQLAlchemy settings for a primary and an optional replica,
+    each with its own pool size and overflow.
+
+    Returns:
+        Config keys to ``app.config.update()`` before ``db.init_app``
+    """
+    def engine_options(url, pool_size, max_overflow):
+        if url.startswith('sqlite'):
+            return {}
+        return {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_recycle': pool_recycle,
+            'pool_pre_ping': True,
+        }
+
+    config = {
+        'SQLALCHEMY_DATABASE_URI': primary_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(primary_url, primary_pool_size, primary_max_overflow),
+    }
+    if replica_url:
+        config['SQLALCHEMY_BINDS'] = {
+            REPLICA_BIND: {'url': replica_url, **engine_options(replica_url, replica_pool_size, replica_max_overflow)}
+        }
+    return config
+
+class ReplicaMonitor:
+    """Tracks whether the replica is reachable and caught up."""
+
+    def __init__(self, engine, max_lag: float, interval: float, lag_query: Optional[str] = None):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.interval = interval
+        if lag_query is None and engine.dialect.name == 'postgresql':
+            lag_query = POSTGRES_LAG_QUERY
+        self.lag_query = lag_query
+        self.lag = 0.0
+        self._healthy = True
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def healthy(self) -> bool:
+        """Return the cached health, refreshing it when the interval is up."""
+        if time.monotonic() - self._checked_at >= self.interval and self._lock.acquire(blocking=False):
+            # One thread refreshes; the others keep using the last result
+            try:
+                self.check()
+            finally:
+                self._lock.release()
+        return self._healthy
+
+    def check(self) -> bool:
+        try:
+            if self.lag_query:
+                with self.engine.connect() as connection:
+                    self.lag = float(connection.execute(text(self.lag_query)).scalar() or 0)
+            else:
+                self.lag = 0.0
+            self._healthy = self.lag <= self.max_lag
+        except Exception as e:
+            self._healthy = False
+            current_app.logger.warning(f"Replica unavailable, reading from primary: {e}")
+        self._checked_at = time.monotonic()
+        return self._healthy
+
+def get_replica_monitor() -> Optional[ReplicaMonitor]:
+    """Return the app's replica monitor, or None if no replica is configured."""
+    app = current_app._get_current_object()
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return None
+    monitor = app.extensions.get('edhaus_replica')
+    if monitor is None:
+        monitor = app.extensions.setdefault('edhaus_replica', ReplicaMonitor(
+            db.engines[REPLICA_BIND],
+            max_lag=app.config.get('REPLICA_MAX_LAG_SECONDS', 5),
+            interval=app.config.get('REPLICA_LAG_CHECK_INTERVAL', 2),
+            lag_query=app.config.get('REPLICA_LAG_QUERY')
+        ))
+    return monitor
+
+@contextmanager
+def replica_reads():
+    """Let SELECTs in this block go to the replica (also usable as a decorator)."""
+    token = _replica_scope.set(True)
+    try:
+        yield
+    finally:
+        _replica_scope.reset(token)
+
+def _in_replica_scope() -> bool:
+    if _replica_scope.get():
+        return True
+    return has_request_context() and g.get('db_replica_reads', False)
+
+def _request_needs_primary() -> bool:
+    if not has_request_context():
+        return False
+    if request.method not in SAFE_METHODS:
+        return True
+    until = request.headers.get(PRIMARY_UNTIL) or request.cookies.get(PRIMARY_UNTIL)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+def _mark_write(session: Session) -> None:
+    session.info[_WROTE_KEY] = True
+    if has_request_context():
+        g.db_wrote = True
+
+@event.listens_for(Session, 'do_orm_execute')
+def _route_statement(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        _mark_write(state.session)
+        return
+    if not state.is_select or 'bind' in state.bind_arguments or not has_app_context():
+        return
+    session = state.session
+    if session.info.get(_WROTE_KEY) or session.new or session.dirty or session.deleted:
+        return
+    if getattr(state.statement, '_for_update_arg', None) is not None:
+        return
+    if replica_allowed():
+        state.bind_arguments['bind'] = get_replica_monitor().engine
+
+def replica_allowed() -> bool:
+    """
+    Whether a read in the current context may go to the replica: it is in a
+    replica scope, the client is not in its read-your-writes window and the
+    replica is healthy. Session-level checks are up to the caller.
+
+    May run the lag query, so don't call it on an event loop.
+    """
+    if not _in_replica_scope() or _request_needs_primary():
+        return False
+    monitor = get_replica_monitor()
+    if monitor is None or not monitor.healthy():
+        return False
+    if has_request_context():
+        g.db_read_replica = True
+    return True
+
+@on_invalidate
+def _note_invalidation(tags):
+    if has_app_context():
+        current_app.extensions[_LAST_INVALIDATION] = time.monotonic()
+
+def cache_fill_allowed() -> bool:
+    """
+    Whether what the current request read may fill a cache.
+
+    False when the request read from the replica within the replica's lag
+    window (max lag plus one lag check interval) of this process's last
+    cache invalidation, since the replica may not have the write yet.
+    """
+    if not (has_request_context() and g.get('db_read_replica')):
+        return True
+    last = current_app.extensions.get(_LAST_INVALIDATION)
+    if last is None:
+        return True
+    config = current_app.config
+    window = config.get('REPLICA_MAX_LAG_SECONDS', 5) + config.get('REPLICA_LAG_CHECK_INTERVAL', 2)
+    return time.monotonic() - last > window
+
+@event.listens_for(Session, 'after_flush')
+def _flag_flush(session, flush_context):
+    _mark_write(session)
+
+def _open_replica_scope():
+    blueprints = current_app.config.get('REPLICA_READ_BLUEPRINTS', ('product', 'product_async'))
+    g.db_replica_reads = request.method in ('GET', 'HEAD') and request.blueprint in blueprints
+
+def _stick_to_primary(response):
+    if g.get('db_wrote'):
+        until = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+        response.headers[PRIMARY_UNTIL] = f'{until:.3f}'
+        response.set_cookie(
+            PRIMARY_UNTIL, f'{until:.3f}',
+            max_age=current_app.config.get('REPLICA_STICKY_SECONDS', 5),
+            httponly=True, samesite='Lax'
+        )
+    return response
+
+def init_app(app) -> None:
+    """Route reads to the replica bind, if one is configured."""
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return
+    app.before_request(_open_replica_scope)
+    app.after_request(_stick_to_primary)
@@ -5,25 +5,28 @@ This module contains custom decorators used throughout the application
 for authentication, authorization, and other cross-cutting concerns.
 """
 
+import hashlib
+import time
+from datetime import timezone
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity
-from ..models import User
-from .exceptions import AuthorizationError
+from urllib.parse import urlencode
+from flask import current_app, jsonify, request
+from .cache import get_cache, versioned_key
+from .db_routing import cache_fill_allowed
+from .identity import require_role
 
 def admin_required(f):
     """
     Decorator to check if the current user is an admin.
     Must be used after jwt_required decorator.
+
+    The role comes from the token's claims; only the token version is
+    checked against the (cached) user, so admin requests don't load the
+    ``User`` row.
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != 'admin':
-            raise AuthorizationError("Admin access required")
-            
+        require_role('admin')
         return f(*args, **kwargs)
     return decorated_function
 
@@ -49,3 +52,120 @@ def validate_json(*required_fields):
             return f(*args, **kwargs)
         return decorated_function
     return decorator
+
+def cache_key_for_request() -> str:
+    """Build a cache key from the endpoint, path and normalized query args."""
+    args = sorted(
+        (key, value.strip())
+        for key, values in request.args.lists()
+        for value in values
+    )
+    raw = f'{request.endpoint}|{request.path}|{urlencode(args)}'
+    return 'response:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def cached_response(*tags):
+    """
+    Decorator to cache successful JSON responses of public GET endpoints.
+
+    ``tags`` name the data a response depends on; each is a string or a
+    callable receiving the view's keyword arguments. Writes to that data
+    bump the tags (see ``utils.cache``), which invalidates the entry.
+    Caching is skipped when ``RESPONSE_CACHE_ENABLED`` is false, and
+    responses read from a replica that may lag a recent write are not
+    stored (see ``utils.db_routing``). The view may be async.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            view = current_app.ensure_sync(f)
+            if request.method != 'GET' or not current_app.config.get('RESPONSE_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            backend = get_cache()
+            resolved = [tag(**kwargs) if callable(tag) else tag for tag in tags]
+            key = versioned_key(backend, cache_key_for_request(), resolved)
+
+            cached = backend.get(key)
+            if cached is not None:
+                body, status, mimetype = cached
+                response = current_app.response_class(body, status=status, mimetype=mimetype)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough and cache_fill_allowed():
+                backend.set(key, (response.get_data(), response.status_code, response.mimetype))
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorated_function
+    return decorator
+
+def _is_not_modified(etag, last_modified) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+def tag_validator(*tags):
+    """
+    Build a ``conditional_response`` validator from cache tag versions.
+
+    ``tags`` are resolved like ``cached_response``'s. The state is the
+    tags' current versions, so it costs no query and changes whenever a
+    committed write bumps one of them. It also includes the current
+    ``CACHE_TTL`` window: other worker processes don't see this process's
+    bumps, and the window bounds how long they keep answering 304.
+    """
+    def validator(**kwargs):
+        backend = get_cache()
+        resolved = sorted(tag(**kwargs) if callable(tag) else tag for tag in tags)
+        window = current_app.config.get('CACHE_TTL', 60)
+        epoch = int(time.time() // window) if window else None
+        return (tuple(backend.get_version(tag) for tag in resolved), epoch), None
+    return validator
+
+def conditional_response(validator):
+    """
+    Decorator adding strong ETag and Last-Modified validators to GET endpoints.
+
+    ``validator(**view_kwargs)`` returns ``(state, last_modified)`` from a
+    cheap query or from cache tag versions (see ``tag_validator``), or None
+    to skip validation (e.g. the resource is missing).
+    The ETag hashes the endpoint, normalized query args and ``state``, so a
+    ``304 Not Modified`` is answered before the view loads or serializes
+    anything. The view may be async.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            view = current_app.ensure_sync(f)
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            validated = validator(**kwargs)
+            if validated is None:
+                return view(*args, **kwargs)
+
+            state, last_modified = validated
+            etag = hashlib.sha1(f'{cache_key_for_request()}|{state!r}'.encode('utf-8')).hexdigest()
+            if last_modified is not None:
+                # HTTP dates have second precision; stored times are naive UTC
+                last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+
+            if _is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Let clients keep the body but revalidate on every use
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return decorated_function
+    return decorator
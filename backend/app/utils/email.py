@@ -1,33 +1,67 @@
-from flask import current_app
-from flask_mail import Mail, Message
+"""
+Email Module
+
+Emails are not sent from the request: they are written to the
+``email_outbox`` table and delivered by the outbox workers (see
+``services.outbox_service``), so request latency doesn't depend on the
+mail server.
+"""
+
+from typing import Iterable, Optional, Union
+from flask_mail import Mail
+from .. import db
+from ..models.email_outbox import EmailOutbox
 
 mail = Mail()
 
-def send_async_email(app, msg):
-    with app.app_context():
-        mail.send(msg)
+def enqueue_email(
+    subject: str,
+    recipients: Union[str, Iterable[str]],
+    body: Optional[str] = None,
+    html: Optional[str] = None,
+    sender: Optional[str] = None,
+    commit: bool = False
+) -> EmailOutbox:
+    """
+    Queue an email for delivery.
 
-def send_email(subject, recipient, html_body):
-    msg = Message(
-        subject,
-        sender=current_app.config['MAIL_DEFAULT_SENDER'],
-        recipients=[recipient]
+    The message is added to the caller's transaction, so it goes out only
+    if the business write it belongs to commits.
+
+    Args:
+        subject: Email subject
+        recipients: One address or an iterable of addresses
+        body: Plain-text body
+        html: HTML body
+        sender: Sender address (default: ``MAIL_DEFAULT_SENDER``)
+        commit: Commit right away, for emails not tied to another write
+
+    Returns:
+        The queued outbox row
+    """
+    if isinstance(recipients, str):
+        recipients = [recipients]
+    message = EmailOutbox(
+        sender=sender,
+        recipients=','.join(recipients),
+        subject=subject,
+        body=body,
+        html=html
     )
-    msg.html = html_body
-    
-    # Send email asynchronously
-    Thread(
-        target=send_async_email,
-        args=(current_app._get_current_object(), msg)
-    ).start()
+    db.session.add(message)
+    if commit:
+        db.session.commit()
+    return message
+
+def send_email(subject, recipient, html_body):
+    enqueue_email(subject, recipient, html=html_body, commit=True)
 
 def send_order_confirmation(order, user):
-    """Send order confirmation email to user"""
-    msg = Message(
+    """Queue the order confirmation email; it commits with the order."""
+    enqueue_email(
         'Order Confirmation - EdHaus Store',
-        recipients=[user.email]
-    )
-    msg.body = f'''
+        user.email,
+        body=f'''
     Dear {user.name},
 
     Thank you for your order! Here are your order details:
@@ -41,15 +75,14 @@ def send_order_confirmation(order, user):
     Best regards,
     EdHaus Store Team
     '''
-    mail.send(msg)
+    )
 
 def send_order_status_update(order, user):
-    """Send order status update email to user"""
-    msg = Message(
-        f'Order Status Update - EdHaus Store',
-        recipients=[user.email]
-    )
-    msg.body = f'''
+    """Queue the order status update email; it commits with the status change."""
+    enqueue_email(
+        'Order Status Update - EdHaus Store',
+        user.email,
+        body=f'''
     Dear {user.name},
 
     Your order (#{order.id}) status has been updated to: {order.status}
@@ -61,4 +94,4 @@ def send_order_status_update(order, user):
     Best regards,
     EdHaus Store Team
     '''
-    mail.send(msg)
+    )
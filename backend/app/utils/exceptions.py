@@ -41,3 +41,19 @@ class ConfigurationError(APIError):
     """Raised when there's a configuration-related error."""
     def __init__(self, message: str = "Configuration error"):
         super().__init__(message, status_code=500)
+
+class ServiceUnavailableError(APIError):
+    """Raised when the server is temporarily unable to handle the request."""
+    def __init__(self, message: str = "Service temporarily unavailable"):
+        super().__init__(message, status_code=503)
+
+class InsufficientStockError(APIError):
+    """Raised when a reservation asks for more stock than is available."""
+    def __init__(self, message: str = "Insufficient stock", shortfalls=None):
+        super().__init__(message, status_code=409)
+        self.shortfalls = shortfalls or []
+
+class ReservationLimitError(APIError):
+    """Raised when a user already holds as many reservations as allowed."""
+    def __init__(self, message: str = "Too many open reservations"):
+        super().__init__(message, status_code=429)
@@ -0,0 +1,94 @@
+"""
+Identity Module
+
+This module resolves the identity behind an access token. Tokens carry the
+user's role and ``token_version`` (see ``User.token_claims``), so role
+checks never touch the database. To honour revocation, the claimed version
+is compared against a small, bounded, TTL-based cache of user snapshots,
+which is dropped for a user as soon as a write to their row commits.
+"""
+
+from typing import Any, Dict, Optional
+from flask import current_app, has_app_context
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from ..models import User
+from .cache import LRUCache, on_invalidate
+from .exceptions import AuthenticationError, AuthorizationError
+
+# Cached in place of a snapshot for users that don't exist
+_MISSING = object()
+
+def get_identity_cache(app=None) -> LRUCache:
+    """Return the app's identity cache (``IDENTITY_CACHE_MAXSIZE``/``_TTL``)."""
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get('edhaus_identity_cache')
+    if cache is None:
+        cache = app.extensions.setdefault('edhaus_identity_cache', LRUCache(
+            maxsize=app.config.get('IDENTITY_CACHE_MAXSIZE', 4096),
+            ttl=app.config.get('IDENTITY_CACHE_TTL', 30)
+        ))
+    return cache
+
+@on_invalidate
+def _drop_changed_users(tags):
+    if not has_app_context():
+        return
+    cache = get_identity_cache()
+    for tag in tags:
+        if tag.startswith('user:'):
+            cache.delete(tag)
+
+def get_identity(user_id) -> Optional[Dict[str, Any]]:
+    """
+    Return a snapshot of the user's access state and profile.
+
+    Returns:
+        Dict with ``role``, ``is_active``, ``token_version`` and the
+        ``profile`` payload, or None if the user does not exist
+    """
+    cache = get_identity_cache()
+    key = f'user:{user_id}'
+    identity = cache.get(key)
+    if identity is None:
+        user = User.query.get(user_id)
+        identity = {
+            'role': user.role,
+            'is_active': user.is_active,
+            'token_version': user.token_version or 0,
+            'profile': user.to_dict()
+        } if user else _MISSING
+        cache.set(key, identity)
+    return None if identity is _MISSING else identity
+
+def current_identity() -> Dict[str, Any]:
+    """
+    Validate the current access token against the user's token version.
+
+    Must be called inside a ``jwt_required`` view.
+
+    Raises:
+        AuthenticationError: If the user is gone, inactive, or the token
+            was issued before their last access change
+    """
+    claims = get_jwt()
+    identity = get_identity(get_jwt_identity())
+    if identity is None or not identity['is_active']:
+        raise AuthenticationError("Account is inactive or no longer exists")
+    # Tokens issued before versioning carry no 'ver' and expire on their own
+    if 'ver' in claims and claims['ver'] != identity['token_version']:
+        raise AuthenticationError("Token has been revoked")
+    return identity
+
+def require_role(role: str) -> None:
+    """
+    Check the role claim of the current access token.
+
+    Raises:
+        AuthorizationError: If the token does not grant ``role``
+    """
+    claims = get_jwt()
+    # Legacy tokens without a role claim fall back to the cached identity
+    claimed_role = claims['role'] if 'role' in claims else current_identity()['role']
+    if claimed_role != role:
+        raise AuthorizationError(f"{role.capitalize()} access required")
+    current_identity()
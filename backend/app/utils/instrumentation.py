@@ -0,0 +1,164 @@
+"""
+SQL Instrumentation Module
+
+This module measures the SQL each request runs. Engine-wide
+``before_cursor_execute``/``after_cursor_execute`` listeners count
+statements and database time into per-request stats held in a context
+variable, so work done outside a request costs one lookup and nothing is
+shared between threads. At the end of the request the totals are sent as
+a ``Server-Timing`` header and a structured log line. Statements repeated
+with the same shape are flagged as likely N+1 queries, and a sample of
+slow statements is logged.
+
+Configuration:
+    SQL_INSTRUMENTATION_ENABLED: Turn the middleware on (default True)
+    SQL_SERVER_TIMING: Send the Server-Timing header (default True)
+    SQL_LOG_REQUESTS: Log every request's totals at INFO, not only the
+        ones with suspected N+1 queries (default False)
+    SQL_N_PLUS_ONE_THRESHOLD: Repeats of one statement shape that count as
+        a likely N+1 (default 5)
+    SQL_SLOW_QUERY_MS: Statement duration that counts as slow (default 100)
+    SQL_SLOW_QUERY_SAMPLE_RATE: Share of slow statements logged (default 0.1)
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('edhaus.sql')
+
+_SHAPE_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SHAPE_IN_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+class RequestSQLStats:
+    """Statement counters for one request."""
+
+    __slots__ = ('started', 'statements', 'db_seconds', 'shapes', 'slow_ms', 'sample_rate')
+
+    def __init__(self, slow_ms: float, sample_rate: float):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes = Counter()
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+
+    def repeated_shapes(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statement shapes run at least ``threshold`` times, most repeated first."""
+        if self.statements < threshold:
+            return []
+        merged = Counter()
+        for statement, count in self.shapes.items():
+            merged[statement_shape(statement)] += count
+        return [
+            {'statement': shape[:500], 'count': count}
+            for shape, count in merged.most_common() if count >= threshold
+        ]
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar('edhaus_sql_stats', default=None)
+
+def statement_shape(statement: str) -> str:
+    """Normalize literals and IN lists so statements differing only in values match."""
+    shape = _SHAPE_LITERALS.sub('?', statement)
+    shape = _SHAPE_IN_LISTS.sub('(?...)', shape)
+    return ' '.join(shape.split())
+
+def current_stats() -> Optional[RequestSQLStats]:
+    """Get the stats of the request being handled, if it is instrumented."""
+    return _current.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._edhaus_query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = getattr(context, '_edhaus_query_start', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats.statements += 1
+    stats.db_seconds += elapsed
+    stats.shapes[statement] += 1
+    if elapsed * 1000 >= stats.slow_ms and random.random() < stats.sample_rate:
+        logger.warning(json.dumps({
+            'event': 'slow_query',
+            'path': request.path,
+            'duration_ms': round(elapsed * 1000, 3),
+            'statement': ' '.join(statement.split())[:2000],
+        }))
+
+_listeners_installed = False
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    if not _listeners_installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listeners_installed = True
+
+def _start_request():
+    config = current_app.config
+    request.environ['edhaus.sql_stats_token'] = _current.set(RequestSQLStats(
+        config.get('SQL_SLOW_QUERY_MS', 100),
+        config.get('SQL_SLOW_QUERY_SAMPLE_RATE', 0.1)
+    ))
+
+def _finish_request(response):
+    stats = _current.get()
+    if stats is None:
+        return response
+    config = current_app.config
+    total_ms = (time.perf_counter() - stats.started) * 1000
+    db_ms = stats.db_seconds * 1000
+
+    if config.get('SQL_SERVER_TIMING', True):
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.3f};desc="{stats.statements} queries", app;dur={total_ms:.3f}'
+        )
+
+    repeated = stats.repeated_shapes(config.get('SQL_N_PLUS_ONE_THRESHOLD', 5))
+    if repeated or config.get('SQL_LOG_REQUESTS', False):
+        record = {
+            'event': 'request_sql',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'statements': stats.statements,
+            'db_ms': round(db_ms, 3),
+            'total_ms': round(total_ms, 3),
+        }
+        if repeated:
+            record['n_plus_one'] = repeated
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps(record))
+    return response
+
+def _end_request(exc):
+    token = request.environ.pop('edhaus.sql_stats_token', None)
+    if token is not None:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Torn down from another context, e.g. after a streamed response
+            _current.set(None)
+
+def init_app(app) -> None:
+    """Instrument every request of ``app`` unless ``SQL_INSTRUMENTATION_ENABLED`` is false."""
+    if not app.config.get('SQL_INSTRUMENTATION_ENABLED', True):
+        return
+    _install_listeners()
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
@@ -0,0 +1,75 @@
+"""
+Pagination Helpers
+
+This module contains helpers for keyset (cursor) pagination. A cursor is
+an opaque, URL-safe token that encodes the sort the page was produced with
+and the ``(sort_key, id)`` of the last row returned.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Tuple
+from .exceptions import ValidationError
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """Encode the position after ``(value, last_id)`` as an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, sort_order, value, last_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str, python_type: type) -> Tuple[Any, int]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: The opaque cursor from the previous page
+        sort_by: Sort field of the current request
+        sort_order: Sort direction of the current request
+        python_type: Python type of the sort column, used to restore values
+
+    Returns:
+        Tuple of (sort key value, id) of the last row of the previous page
+
+    Raises:
+        ValidationError: If the cursor is malformed or was issued for a
+            different sort than the current request, or its values don't
+            have the sort column's type.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort_by, cursor_sort_order, value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode('ascii'))
+        )
+        value = _restore(value, python_type)
+        if not _is_int(last_id):
+            raise ValueError(last_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise ValidationError("Invalid cursor")
+
+    if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+        raise ValidationError("Cursor does not match the requested sort order")
+    return value, last_id
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _restore(value: Any, python_type: type) -> Any:
+    """Convert a decoded JSON value back to ``python_type``, or raise ValueError."""
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value)
+    if python_type is float:
+        if not (_is_int(value) or isinstance(value, float)):
+            raise ValueError(value)
+        return float(value)
+    if python_type is int:
+        if not _is_int(value):
+            raise ValueError(value)
+        return value
+    if not isinstance(value, python_type):
+        raise ValueError(value)
+    return value
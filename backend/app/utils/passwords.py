@@ -0,0 +1,109 @@
+"""
+Password Hashing Module
+
+This module runs werkzeug's deliberately slow password hashing outside the
+request worker, in a bounded process pool:
+
+- ``PASSWORD_HASH_METHOD``: werkzeug hash method, e.g. ``pbkdf2:sha256:600000``
+  or ``scrypt:32768:8:1``. Hashes made with any other method are reported
+  by ``needs_rehash`` so they can be upgraded on the next login.
+- ``PASSWORD_HASH_POOL_SIZE``: worker processes (0 hashes inline).
+- ``PASSWORD_HASH_QUEUE_LIMIT``: operations allowed to wait for a worker;
+  beyond that requests fail fast with a 503 instead of piling up.
+- ``PASSWORD_HASH_TIMEOUT``: seconds to wait for a result.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+from .exceptions import ServiceUnavailableError
+
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+
+# Parameters werkzeug fills in when a method is given without them
+_METHOD_DEFAULTS = {
+    'pbkdf2': ('pbkdf2', 'sha256', '600000'),
+    'scrypt': ('scrypt', '32768', '8', '1'),
+}
+
+def normalize_method(method: str) -> str:
+    """Expand a method to the full prefix werkzeug writes into the hash."""
+    parts = method.split(':')
+    defaults = _METHOD_DEFAULTS.get(parts[0])
+    if defaults is None:
+        return method
+    return ':'.join(parts + list(defaults[len(parts):]))
+
+class PasswordHasher:
+    """Hash and verify passwords in a bounded pool of worker processes."""
+
+    def __init__(self, method=DEFAULT_METHOD, pool_size=2, queue_limit=32, timeout=5.0):
+        self.method = normalize_method(method)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(pool_size + queue_limit) if pool_size else None
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # A pool inherited through fork (e.g. gunicorn --preload) is unusable
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.pool_size:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError("Too many concurrent password operations, try again shortly")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the worker finishes, even if we stop waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ServiceUnavailableError("Password operation timed out, try again shortly")
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if ``password_hash`` was made with a different method or cost."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+def get_hasher(app=None) -> PasswordHasher:
+    """Return the app's password hasher, creating it from config on first use."""
+    app = app or current_app._get_current_object()
+    hasher = app.extensions.get('edhaus_password_hasher')
+    if hasher is None:
+        hasher = app.extensions.setdefault('edhaus_password_hasher', PasswordHasher(
+            method=app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+            pool_size=app.config.get('PASSWORD_HASH_POOL_SIZE', 2),
+            queue_limit=app.config.get('PASSWORD_HASH_QUEUE_LIMIT', 32),
+            timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 5.0)
+        ))
+    return hasher
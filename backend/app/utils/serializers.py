@@ -0,0 +1,235 @@
+"""
+Serializer Module
+
+This module contains bulk serializers used by the listing endpoints.
+They build API payloads from preloaded data so serializing a page of
+results costs a fixed number of queries regardless of its size.
+
+The ``Product``, ``Category`` and ``User`` payloads are produced by
+functions generated once per model (see ``compile_serializer``): one dict
+literal with direct attribute reads, no per-row key loop. When the JSON
+provider encodes datetimes itself (``utils.json_provider``) they are
+passed through instead of calling ``isoformat()`` per field.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only
+from ..models.product import Product
+from ..models.category import Category
+from .exceptions import ValidationError
+
+# Keys of ``Product.to_dict`` clients may select with ``fields=``, and the
+# columns each one needs
+PRODUCT_FIELD_COLUMNS = {
+    'id': (Product.id,),
+    'name': (Product.name,),
+    'description': (Product.description,),
+    'price': (Product.price,),
+    'stock': (Product.stock,),
+    'image_url': (Product.image_url,),
+    'category_id': (Product.category_id,),
+    'slug': (Product.slug,),
+    'is_active': (Product.is_active,),
+    'created_at': (Product.created_at,),
+    'updated_at': (Product.updated_at,),
+    'category': (Product.category_id,),
+}
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+# Getters take the product and its category, which the caller has loaded
+_PRODUCT_FIELD_GETTERS = {
+    'id': lambda product, category: product.id,
+    'name': lambda product, category: product.name,
+    'description': lambda product, category: product.description,
+    'price': lambda product, category: product.price,
+    'stock': lambda product, category: product.stock,
+    'image_url': lambda product, category: product.image_url,
+    'category_id': lambda product, category: product.category_id,
+    'slug': lambda product, category: product.slug,
+    'is_active': lambda product, category: product.is_active,
+    'created_at': lambda product, category: _isoformat(product.created_at),
+    'updated_at': lambda product, category: _isoformat(product.updated_at),
+    'category': lambda product, category: {
+        'id': category.id,
+        'name': category.name,
+        'slug': category.slug
+    } if category is not None else None,
+}
+
+# Payload keys per model, matching each model's ``to_dict``
+SERIALIZER_SPECS = {
+    'category_summary': {
+        'columns': ('id', 'name', 'slug'),
+    },
+    'product': {
+        'columns': (
+            'id', 'name', 'description', 'price', 'stock', 'image_url',
+            'category_id', 'slug', 'is_active', 'created_at', 'updated_at',
+        ),
+        'datetimes': ('created_at', 'updated_at'),
+        'nested': {'category': 'category_summary'},
+    },
+    'category': {
+        'columns': (
+            'id', 'name', 'description', 'image_url', 'parent_id', 'slug',
+            'is_active', 'display_order', 'path',
+        ),
+    },
+    'user': {
+        'columns': ('id', 'email', 'name', 'phone', 'address', 'role', 'is_active', 'created_at', 'updated_at'),
+        'datetimes': ('created_at', 'updated_at'),
+    },
+}
+
+_compiled: Dict[Tuple[str, bool], Callable[[Any], Dict[str, Any]]] = {}
+
+def compile_serializer(name: str, native_datetimes: bool = False) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Generate the serializer for ``SERIALIZER_SPECS[name]``.
+
+    The generated function reads each attribute once and builds the
+    payload in a single dict literal. Nested objects use the serializer
+    of their own spec and are None when missing. They can be passed as
+    keyword arguments (e.g. ``serialize(product, category=category)``);
+    otherwise they are read from the object.
+
+    Args:
+        native_datetimes: Leave datetimes for the JSON encoder instead of
+            converting them with ``isoformat()``
+    """
+    spec = SERIALIZER_SPECS[name]
+    datetimes = () if native_datetimes else spec.get('datetimes', ())
+    nested = spec.get('nested', {})
+    namespace = {'_unset': object()}
+    lines = ['def serialize(obj' + ''.join(f', {key}=_unset' for key in nested) + '):']
+    items = []
+    for column in spec['columns']:
+        if column in datetimes:
+            lines.append(f'    {column} = obj.{column}')
+            items.append(f"'{column}': {column}.isoformat() if {column} is not None else None")
+        else:
+            items.append(f"'{column}': obj.{column}")
+    for key, nested_name in nested.items():
+        namespace[f'_serialize_{key}'] = get_serializer(nested_name, native_datetimes)
+        lines.append(f'    if {key} is _unset:')
+        lines.append(f'        {key} = obj.{key}')
+        items.append(f"'{key}': _serialize_{key}({key}) if {key} is not None else None")
+    lines.append('    return {' + ', '.join(items) + '}')
+    exec('\n'.join(lines), namespace)
+    return namespace['serialize']
+
+def get_serializer(name: str, native_datetimes: Optional[bool] = None) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Get the compiled serializer for a model, building it on first use.
+
+    ``native_datetimes`` defaults to what the current app's JSON provider
+    supports.
+    """
+    if native_datetimes is None:
+        native_datetimes = has_app_context() and getattr(current_app.json, 'native_datetimes', False)
+    key = (name, native_datetimes)
+    serializer = _compiled.get(key)
+    if serializer is None:
+        serializer = _compiled[key] = compile_serializer(name, native_datetimes)
+    return serializer
+
+def with_category(query):
+    """Eager-load each product's category in the same SELECT."""
+    return query.options(joinedload(Product.category))
+
+def parse_product_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated ``fields=`` value.
+
+    Returns:
+        The requested keys in request order, or None for the full payload
+
+    Raises:
+        ValidationError: If a key is unknown
+    """
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PRODUCT_FIELD_COLUMNS]
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(names)) or None
+
+def product_load_options(fields: Optional[Sequence[str]], extra_columns: Sequence = ()) -> List[Any]:
+    """
+    Loader options fetching only the columns ``fields`` needs.
+
+    The category is joined (and only its serialized columns loaded) when
+    ``category`` is requested; otherwise no category is touched at all.
+
+    Args:
+        extra_columns: Further columns the caller reads, e.g. a sort key
+    """
+    if fields is None:
+        return [joinedload(Product.category)]
+    columns = {Product.id, *extra_columns}
+    for name in fields:
+        columns.update(PRODUCT_FIELD_COLUMNS[name])
+    options = [load_only(*columns)]
+    if 'category' in fields:
+        options.append(joinedload(Product.category).load_only(Category.id, Category.name, Category.slug))
+    return options
+
+def preload_categories(products: Iterable[Product]) -> Dict[int, Category]:
+    """
+    Get the category of every product, keyed by id.
+
+    Categories already loaded on the products (see ``with_category``) are
+    reused; the rest are fetched with a single ``IN`` query.
+    """
+    categories = {}
+    missing_ids = set()
+    for product in products:
+        if 'category' in inspect(product).unloaded:
+            missing_ids.add(product.category_id)
+        elif product.category is not None:
+            categories[product.category.id] = product.category
+
+    missing_ids.difference_update(categories)
+    missing_ids.discard(None)
+    if missing_ids:
+        for category in Category.query.filter(Category.id.in_(missing_ids)):
+            categories[category.id] = category
+    return categories
+
+def serialize_products(products: Iterable[Product], fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Serialize a batch of products without a category lookup per row.
+
+    Args:
+        fields: Keys to output (see ``parse_product_fields``); None gives
+            the full ``Product.to_dict`` payload
+    """
+    products = list(products)
+    if fields is not None:
+        getters = [(name, _PRODUCT_FIELD_GETTERS[name]) for name in fields]
+        categories = preload_categories(products) if 'category' in fields else {}
+        payloads = []
+        for product in products:
+            # category_id is only loaded when the category was requested
+            category = categories.get(product.category_id) if 'category' in fields else None
+            payloads.append({name: getter(product, category) for name, getter in getters})
+        return payloads
+    categories = preload_categories(products)
+    serialize = get_serializer('product')
+    return [serialize(product, category=categories.get(product.category_id)) for product in products]
+
+def serialize_category(category: Category) -> Dict[str, Any]:
+    """Serialize a category with its subcategories and products, like ``Category.to_dict``."""
+    payload = get_serializer('category')(category)
+    payload['subcategories'] = [serialize_category(child) for child in category.subcategories]
+    payload['products'] = serialize_products(category.products)
+    return payload
+
+def serialize_user(user) -> Dict[str, Any]:
+    """Serialize a user like ``User.to_dict``."""
+    return get_serializer('user')(user)
@@ -0,0 +1,99 @@
+"""
+Async Read Path Benchmark
+
+Runs the same catalog reads through the sync endpoints (``/api/products``)
+and the async ones (``/api/async``) under concurrent load, side by side,
+and reports p50/p95/p99 latency and throughput for each. A listing with
+facets runs its page, count and facet queries sequentially on the sync
+path and concurrently on the async one. The response cache is off.
+
+    python -m benchmarks.bench_async_reads --products 20000 --workers 16
+    python -m benchmarks.bench_async_reads --database-url postgresql://...
+"""
+
+import argparse
+import json
+import sys
+from flask_jwt_extended import JWTManager
+from sqlalchemy import select
+from app import db
+from app.models import Category, Product
+from app.routes.product import product_bp
+from app.routes.product_async import product_async_bp
+from app.utils import async_db, json_provider
+from .bench_endpoints import StatementCounter, run_endpoint
+from .common import create_bench_app, seed_catalog
+
+def build_app(args):
+    app = create_bench_app(
+        args.database_url,
+        RESPONSE_CACHE_ENABLED=False,
+        ASYNC_READS_ENABLED=True,
+        ASYNC_POOL_SIZE=args.workers,
+    )
+    JWTManager(app)
+    app.register_blueprint(product_bp, url_prefix='/api/products')
+    app.register_blueprint(product_async_bp, url_prefix='/api/async')
+    json_provider.init_app(app)
+    async_db.init_app(app)
+    return app
+
+def scenarios(ids):
+    """Scenario name -> function(prefix) returning a request factory."""
+    return {
+        'list': lambda prefix: lambda rng: (
+            'GET', f'{prefix}?per_page=20&page={rng.randint(1, 20)}', {}
+        ),
+        'list_facets': lambda prefix: lambda rng: (
+            'GET', f"{prefix}?per_page=20&include_facets=true&search={rng.choice(('steel', 'pipe', 'tile'))}", {}
+        ),
+        'list_category_facets': lambda prefix: lambda rng: (
+            'GET', f"{prefix}?per_page=20&include_facets=true&category_id={rng.choice(ids['roots'])}", {}
+        ),
+        'detail': lambda prefix: lambda rng: (
+            'GET', f"{prefix}/{rng.choice(ids['products'])}", {}
+        ),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Defaults to a temporary SQLite file.')
+    parser.add_argument('--products', type=int, default=20_000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario and path.')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    app = build_app(args)
+    with app.app_context():
+        seed_catalog(args.products, args.categories, seed=args.seed)
+        ids = {
+            'roots': db.session.execute(select(Category.id).where(Category.parent_id.is_(None))).scalars().all(),
+            'products': db.session.execute(select(Product.id)).scalars().all(),
+        }
+        counter = StatementCounter(db.engine)
+
+    paths = {'sync': '/api/products/products', 'async': '/api/async/products'}
+    results = {}
+    for name, make_factory in scenarios(ids).items():
+        results[name] = {}
+        for path, prefix in paths.items():
+            result = run_endpoint(app, counter, make_factory(prefix), args.requests, args.workers, args.seed)
+            if path == 'async':
+                # Async statements run on the loop thread and aren't counted
+                result.pop('statements_max')
+                result.pop('statements_mean')
+            results[name][path] = result
+            print(f"{name:22} {path:5} p95 {result['p95_ms']:>9.3f}ms  "
+                  f"{result['throughput_rps']:>8.1f} req/s  {result['errors']} errors", file=sys.stderr)
+
+    print(json.dumps({
+        'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+        'products': args.products,
+        'workers': args.workers,
+        'results': results,
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Endpoint Benchmark
+
+Drives the product and auth blueprints through the Flask test client with
+a pool of concurrent workers against a seeded database, and reports per
+endpoint: p50/p95/p99 latency, throughput and SQL statements per request.
+
+The run fails (exit code 1) when an endpoint exceeds its statement or p95
+budget in ``budgets.json``, or when its p95 regresses more than
+``--tolerance`` against the baseline file. ``--update-baseline`` records
+the current results as the new baseline.
+
+    python -m benchmarks.bench_endpoints --products 20000 --workers 8
+    python -m benchmarks.bench_endpoints --update-baseline
+    python -m benchmarks.bench_endpoints --database-url postgresql://... --only products_list
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from flask_jwt_extended import JWTManager
+from sqlalchemy import event, select
+from app import db
+from app.models import Category, Product, User
+from app.routes.auth import auth_bp
+from app.routes.product import product_bp
+from app.utils import json_provider
+from .common import create_bench_app, seed_catalog, summarize
+
+HERE = os.path.dirname(__file__)
+DEFAULT_BUDGETS = os.path.join(HERE, 'budgets.json')
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+PASSWORD = 'correct horse battery staple'
+
+class StatementCounter:
+    """Counts SQL statements executed by the current thread."""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self):
+        return getattr(self._local, 'count', 0)
+
+def build_app(args):
+    app = create_bench_app(
+        args.database_url,
+        RESPONSE_CACHE_ENABLED=args.cache,
+        PASSWORD_HASH_POOL_SIZE=0,
+    )
+    JWTManager(app)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(product_bp, url_prefix='/api/products')
+    json_provider.init_app(app)
+    return app
+
+def seed(app, args):
+    """Seed the catalog and a user; return the ids the endpoints need."""
+    with app.app_context():
+        seed_catalog(args.products, args.categories, seed=args.seed)
+        user = User(email='bench@example.com', name='Bench')
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        roots = db.session.execute(select(Category.id).where(Category.parent_id.is_(None))).scalars().all()
+        leaves = db.session.execute(
+            select(Category.id).where(~Category.id.in_(
+                select(Category.parent_id).where(Category.parent_id.is_not(None))
+            ))
+        ).scalars().all()
+        product_ids = db.session.execute(select(Product.id)).scalars().all()
+    return {'roots': roots, 'leaves': leaves, 'products': product_ids}
+
+def endpoints(ids, token):
+    """Endpoint name -> function(rng) returning (method, url, kwargs)."""
+    auth = {'headers': {'Authorization': f'Bearer {token}'}}
+    return {
+        'products_list': lambda rng: ('GET', f'/api/products/products?per_page=20&page={rng.randint(1, 20)}', {}),
+        'products_list_sparse': lambda rng: (
+            'GET', f'/api/products/products?per_page=20&page={rng.randint(1, 20)}&fields=id,name,price,image_url', {}
+        ),
+        'products_search': lambda rng: (
+            'GET', f"/api/products/products?per_page=20&search={rng.choice(('steel', 'pipe', 'galv', 'cement primer'))}", {}
+        ),
+        'products_category': lambda rng: (
+            'GET', f"/api/products/products?per_page=20&category_id={rng.choice(ids['roots'])}", {}
+        ),
+        'products_cursor': lambda rng: ('GET', '/api/products/products?per_page=20&cursor=', {}),
+        'products_facets': lambda rng: (
+            'GET', f"/api/products/products/facets?search={rng.choice(('steel', 'pipe', 'tile'))}", {}
+        ),
+        'product_detail': lambda rng: ('GET', f"/api/products/products/{rng.choice(ids['products'])}", {}),
+        'products_batch': lambda rng: (
+            'GET', f"/api/products/products/batch?ids={','.join(map(str, rng.sample(ids['products'], 30)))}", {}
+        ),
+        'cart_quote': lambda rng: ('POST', '/api/products/products/cart/quote', {'json': {'items': [
+            {'product_id': product_id, 'quantity': rng.randint(1, 5)} for product_id in rng.sample(ids['products'], 30)
+        ]}}),
+        'products_suggest': lambda rng: (
+            'GET', f"/api/products/products/suggest?q={rng.choice(('st', 'galv pi', 'cement prim', 'stainles', 'pvc 2'))}", {}
+        ),
+        'categories': lambda rng: ('GET', '/api/products/categories', {}),
+        'category_tree': lambda rng: ('GET', '/api/products/categories?tree=true', {}),
+        'category_detail': lambda rng: ('GET', f"/api/products/categories/{rng.choice(ids['leaves'])}", {}),
+        'auth_profile': lambda rng: ('GET', '/api/auth/profile', auth),
+        'auth_login': lambda rng: (
+            'POST', '/api/auth/login', {'json': {'email': 'bench@example.com', 'password': PASSWORD}}
+        ),
+    }
+
+def run_endpoint(app, counter, make_request, requests, workers, seed):
+    """Issue ``requests`` requests from ``workers`` threads; return the measurements."""
+    local = threading.local()
+
+    def one(index):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        method, url, kwargs = make_request(random.Random(seed + index))
+        counter.reset()
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, counter.count, response.status_code
+
+    # Warm up connections, caches and lazily built state
+    for index in range(min(5, requests)):
+        one(-index - 1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(one, range(requests)))
+    wall = time.perf_counter() - start
+
+    latencies = [latency for latency, _, _ in results]
+    statements = [count for _, count, _ in results]
+    errors = sum(1 for _, _, status in results if status >= 400)
+    return {
+        'requests': requests,
+        'errors': errors,
+        'throughput_rps': round(requests / wall, 2),
+        **summarize(latencies),
+        'statements_max': max(statements),
+        'statements_mean': round(statistics.fmean(statements), 2),
+    }
+
+def check(results, budgets, baseline, tolerance):
+    """Return a list of budget and regression violations."""
+    violations = []
+    defaults = budgets.get('defaults', {})
+    for name, result in results.items():
+        budget = {**defaults, **budgets.get('endpoints', {}).get(name, {})}
+        if result['errors']:
+            violations.append(f"{name}: {result['errors']} error response(s)")
+        if 'max_statements' in budget and result['statements_max'] > budget['max_statements']:
+            violations.append(
+                f"{name}: {result['statements_max']} statements > budget {budget['max_statements']}"
+            )
+        if 'p95_ms' in budget and result['p95_ms'] > budget['p95_ms']:
+            violations.append(f"{name}: p95 {result['p95_ms']}ms > budget {budget['p95_ms']}ms")
+        previous = (baseline or {}).get('endpoints', {}).get(name)
+        if previous and result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            violations.append(
+                f"{name}: p95 {result['p95_ms']}ms regressed from baseline {previous['p95_ms']}ms"
+            )
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Defaults to a temporary SQLite file.')
+    parser.add_argument('--products', type=int, default=20_000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache on.')
+    parser.add_argument('--only', nargs='+', help='Endpoint names to run.')
+    parser.add_argument('--budgets', default=DEFAULT_BUDGETS)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed p95 regression vs baseline.')
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    with open(args.budgets) as f:
+        budgets = json.load(f)
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    app = build_app(args)
+    ids = seed(app, args)
+    with app.test_client() as client:
+        token = client.post('/api/auth/login', json={
+            'email': 'bench@example.com', 'password': PASSWORD
+        }).get_json()['access_token']
+    with app.app_context():
+        counter = StatementCounter(db.engine)
+
+    results = {}
+    for name, make_request in endpoints(ids, token).items():
+        if args.only and name not in args.only:
+            continue
+        requests = budgets.get('endpoints', {}).get(name, {}).get('requests', args.requests)
+        results[name] = run_endpoint(app, counter, make_request, requests, args.workers, args.seed)
+        print(f"{name:20} p95 {results[name]['p95_ms']:>9.3f}ms  "
+              f"{results[name]['throughput_rps']:>8.1f} req/s  "
+              f"{results[name]['statements_max']} stmt", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':', 1)[0],
+            'products': args.products,
+            'categories': args.categories,
+            'workers': args.workers,
+            'cache': args.cache,
+            'json_provider': type(app.json).__name__,
+            'python': platform.python_version(),
+        },
+        'endpoints': results,
+    }
+    violations = check(results, budgets, baseline, args.tolerance)
+    report['violations'] = violations
+    print(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+    if violations:
+        for violation in violations:
+            print(f'BUDGET EXCEEDED: {violation}', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Password Pool Benchmark
+
+Measures login throughput under concurrency with password hashing inline
+in the request thread versus offloaded to the process pool.
+
+    python -m benchmarks.bench_password_pool --concurrency 16 --logins 200
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask_jwt_extended import JWTManager
+from app import db
+from app.models import User
+from app.routes.auth import auth_bp
+from app.utils.passwords import get_hasher
+from .common import create_bench_app, summarize
+
+def run(pool_size, concurrency, logins):
+    app = create_bench_app(PASSWORD_HASH_POOL_SIZE=pool_size, PASSWORD_HASH_QUEUE_LIMIT=logins)
+    JWTManager(app)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+
+    with app.app_context():
+        db.create_all()
+        user = User(email='bench@example.com', name='Bench')
+        user.set_password('correct horse battery staple')
+        db.session.add(user)
+        db.session.commit()
+
+    def login(_):
+        with app.test_client() as client:
+            start = time.perf_counter()
+            response = client.post('/api/auth/login', json={
+                'email': 'bench@example.com',
+                'password': 'correct horse battery staple'
+            })
+            assert response.status_code == 200, response.get_data(as_text=True)
+            return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        get_hasher().shutdown()
+
+    return {
+        'pool_size': pool_size,
+        'logins_per_sec': round(logins / elapsed, 2),
+        **summarize(samples),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[0, 2, 4])
+    args = parser.parse_args()
+
+    results = [run(size, args.concurrency, args.logins) for size in args.pool_sizes]
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
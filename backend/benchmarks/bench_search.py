@@ -0,0 +1,40 @@
+"""
+Search Benchmark
+
+Compares the ``ilike`` scan with the full-text index for product search
+on a large synthetic catalog.
+
+    python -m benchmarks.bench_search --products 100000
+"""
+
+import argparse
+import json
+from app.services.product_service import ProductService
+from .common import create_bench_app, seed_catalog, summarize, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.database_url)
+    terms = ['steel', 'pipe', 'galv', 'cement primer', 'silicone seal']
+    results = {}
+    with app.app_context():
+        seed_catalog(args.products)
+        for backend in ('ilike', 'fulltext'):
+            app.config['PRODUCT_SEARCH_BACKEND'] = backend
+            results[backend] = {
+                term: summarize(timed(
+                    lambda: ProductService.get_products(search=term, per_page=20),
+                    args.repeat
+                ))
+                for term in terms
+            }
+
+    print(json.dumps({'products': args.products, 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
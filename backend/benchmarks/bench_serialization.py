@@ -0,0 +1,99 @@
+"""
+Serialization Benchmark
+
+Times turning 1k-item payloads into JSON responses three ways:
+
+- ``to_dict``: the models' ``to_dict()`` with Flask's default provider
+- ``compiled``: the generated serializers with Flask's default provider
+- ``compiled+orjson``: the generated serializers with the orjson provider,
+  leaving datetimes to the encoder
+
+No database is needed; the objects are built in memory.
+
+    python -m benchmarks.bench_serialization --items 1000 --repeat 50
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from flask import Flask
+from app.models import Category, Product, User
+from app.utils import json_provider
+from app.utils.serializers import get_serializer
+from .common import summarize, timed
+
+def build_objects(n, seed):
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    categories = [
+        Category(id=i, name=f'Category {i}', slug=f'category-{i}', description='Materials',
+                 parent_id=None, is_active=True, display_order=i, path=f'/{i}/')
+        for i in range(1, 21)
+    ]
+    products = []
+    for i in range(1, n + 1):
+        category = rng.choice(categories)
+        created_at = start + timedelta(minutes=rng.randint(0, 500_000))
+        products.append(Product(
+            id=i, name=f'Galvanized Steel Pipe {i}', description='Heavy duty pipe for water supply lines. ' * 4,
+            price=round(rng.uniform(50, 50_000), 2), stock=rng.randint(0, 500), image_url=None,
+            category_id=category.id, category=category, slug=f'pipe-{i}', is_active=True,
+            created_at=created_at, updated_at=created_at
+        ))
+    users = [
+        User(id=i, email=f'user{i}@example.com', name=f'User {i}', phone='0700000000', address='Nairobi',
+             role='user', is_active=True, created_at=start, updated_at=start)
+        for i in range(1, n + 1)
+    ]
+    return {'product': products, 'category': categories * (n // len(categories)), 'user': users}
+
+def category_to_dict(category):
+    # Category.to_dict recurses into products; compare the flat columns only
+    return {key: getattr(category, key) for key in (
+        'id', 'name', 'description', 'image_url', 'parent_id', 'slug', 'is_active', 'display_order', 'path'
+    )}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    objects = build_objects(args.items, args.seed)
+    default_app = Flask('bench_default')
+    orjson_app = Flask('bench_orjson')
+    json_provider.init_app(orjson_app)
+
+    to_dict = {
+        'product': lambda product: product.to_dict(),
+        'category': category_to_dict,
+        'user': lambda user: user.to_dict(),
+    }
+    variants = {
+        'to_dict': (default_app, lambda name: to_dict[name]),
+        'compiled': (default_app, lambda name: get_serializer(name, native_datetimes=False)),
+    }
+    if json_provider.orjson is not None and isinstance(orjson_app.json, json_provider.OrjsonProvider):
+        variants['compiled+orjson'] = (orjson_app, lambda name: get_serializer(name, native_datetimes=True))
+
+    results = {}
+    for model, items in objects.items():
+        results[model] = {}
+        for variant, (app, serializer_for) in variants.items():
+            serialize = serializer_for(model)
+            with app.app_context():
+                def render():
+                    return app.json.response([serialize(item) for item in items]).get_data()
+                size = len(render())
+                results[model][variant] = {'bytes': size, **summarize(timed(render, args.repeat))}
+
+    print(json.dumps({
+        'items': args.items,
+        'orjson': json_provider.orjson is not None,
+        'results': results,
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
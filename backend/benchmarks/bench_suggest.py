@@ -0,0 +1,47 @@
+"""
+Suggest Index Benchmark
+
+Builds the in-memory suggest index over a large synthetic catalog and
+reports the build time, the index size and its memory footprint, and
+lookup latency for prefixes, multi-word queries, queries that match
+nothing and misspelt ones.
+
+    python -m benchmarks.bench_suggest --products 100000
+"""
+
+import argparse
+import json
+from app.services.suggest_service import SuggestService
+from .common import create_bench_app, seed_catalog, summarize, timed
+
+QUERIES = {
+    'prefix': ['s', 'st', 'galv', 'cem', 'porc'],
+    'multi_word': ['galv pi', 'cement prim', 'stainless steel 25', 'pvc elbow 2in'],
+    'no_match': ['heavy duty steel pipe 12m', 'zinc sink 2', 'xyz'],
+    'typo': ['stainles', 'galvnized pipe', 'cemnet primr'],
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=1000)
+    parser.add_argument('--database-url', default=None)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.database_url, SUGGEST_SYNC_INTERVAL=3600)
+    results = {}
+    with app.app_context():
+        seed_catalog(args.products)
+        service = SuggestService(app)
+        service.build()
+        for group, queries in QUERIES.items():
+            results[group] = {
+                query: summarize(timed(lambda: service.suggest(query), args.repeat))
+                for query in queries
+            }
+        stats = service.stats()
+
+    print(json.dumps({'products': args.products, 'index': stats, 'results': results}, indent=2))
+
+if __name__ == '__main__':
+    main()
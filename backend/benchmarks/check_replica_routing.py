@@ -0,0 +1,119 @@
+"""
+Replica Routing Check
+
+Seeds a primary SQLite database, copies it to stand in for a replica, and
+renames one product on the copy only, so every response shows which
+engine served it. Then it checks the routing rules and exits non-zero if
+one is broken:
+
+- catalog GETs read from the replica;
+- a write goes to the primary and pins the client to the primary for
+  ``REPLICA_STICKY_SECONDS`` (header and cookie);
+- a pinned client reads its own write; a fresh client still gets the replica;
+- reads fall back to the primary when the replica lags too far behind.
+
+    python -m benchmarks.check_replica_routing
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy import select, text
+from app import db
+from app.models import Product, User
+from app.routes.product import product_bp
+from app.utils import db_routing
+from .common import create_bench_app, seed_catalog
+
+REPLICA_NAME = 'Served by the replica'
+
+def prepare(args):
+    """Seed the primary, copy it to the replica; return (primary_url, replica_url, product_id)."""
+    directory = tempfile.mkdtemp(prefix='edhaus-replica-')
+    primary = os.path.join(directory, 'primary.db')
+    replica = os.path.join(directory, 'replica.db')
+
+    app = create_bench_app(f'sqlite:///{primary}')
+    with app.app_context():
+        seed_catalog(args.products, n_categories=5, seed=args.seed)
+        admin = User(email='admin@example.com', name='Admin', role='admin')
+        admin.set_password('bench')
+        db.session.add(admin)
+        db.session.commit()
+        product_id = db.session.execute(select(Product.id).order_by(Product.id).limit(1)).scalar_one()
+        db.engine.dispose()
+
+    shutil.copyfile(primary, replica)
+    app = create_bench_app(f'sqlite:///{replica}')
+    with app.app_context():
+        db.session.execute(
+            text('UPDATE products SET name = :name WHERE id = :id'), {'name': REPLICA_NAME, 'id': product_id}
+        )
+        db.session.commit()
+        db.engine.dispose()
+    return f'sqlite:///{primary}', f'sqlite:///{replica}', product_id
+
+def build_app(primary_url, replica_url):
+    config = db_routing.database_config(primary_url, replica_url)
+    app = create_bench_app(
+        config.pop('SQLALCHEMY_DATABASE_URI'),
+        RESPONSE_CACHE_ENABLED=False,
+        PASSWORD_HASH_POOL_SIZE=0,
+        REPLICA_LAG_CHECK_INTERVAL=0,
+        **config
+    )
+    JWTManager(app)
+    app.register_blueprint(product_bp, url_prefix='/api/products')
+    db_routing.init_app(app)
+    return app
+
+def run(args):
+    primary_url, replica_url, product_id = prepare(args)
+    app = build_app(primary_url, replica_url)
+    with app.app_context():
+        admin = db.session.execute(select(User).where(User.email == 'admin@example.com')).scalar_one()
+        token = create_access_token(identity=admin.id, additional_claims=admin.token_claims())
+    url = f'/api/products/products/{product_id}'
+    failures = []
+
+    def expect(label, response, replica):
+        name = (response.get_json() or {}).get('name')
+        served = 'replica' if name == REPLICA_NAME else 'primary'
+        wanted = 'replica' if replica else 'primary'
+        status = 'ok' if served == wanted and response.status_code == 200 else 'FAIL'
+        print(f'{status:4}  {label}: served by {served} (status {response.status_code})')
+        if status != 'ok':
+            failures.append(label)
+
+    client = app.test_client()
+    expect('GET reads from the replica', client.get(url), replica=True)
+
+    response = client.put(url, json={'stock': 7}, headers={'Authorization': f'Bearer {token}'})
+    expect('PUT writes to the primary', response, replica=False)
+    if db_routing.PRIMARY_UNTIL not in response.headers:
+        print(f'FAIL  PUT response carries {db_routing.PRIMARY_UNTIL}')
+        failures.append('sticky header')
+
+    expect('GET after a write reads from the primary', client.get(url), replica=False)
+    expect('GET from another client reads from the replica', app.test_client().get(url), replica=True)
+
+    app.extensions['edhaus_replica'].lag_query = 'SELECT 100'
+    expect('GET falls back to the primary when the replica lags', app.test_client().get(url), replica=False)
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    failures = run(args)
+    if failures:
+        print(f'{len(failures)} routing check(s) failed', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
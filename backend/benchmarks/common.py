@@ -0,0 +1,62 @@
+"""
+Benchmark Helpers
+
+Shared setup for the scripts in this package: a minimal app bound to a
+throwaway database, a synthetic catalog and timing utilities. Run the
+benchmarks from the ``backend`` directory, e.g.
+``python -m benchmarks.bench_search``.
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from flask import Flask
+from app import db
+from app.utils.catalog_generator import generate_catalog
+
+def create_bench_app(database_url=None, **config):
+    """Create a bare app bound to ``database_url`` (a temp SQLite file by default)."""
+    if database_url is None:
+        fd, path = tempfile.mkstemp(prefix='edhaus-bench-', suffix='.db')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+    app = Flask('edhaus_bench')
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=database_url,
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SECRET_KEY='bench',
+        JWT_SECRET_KEY='bench',
+        TESTING=True,
+    )
+    app.config.update(config)
+    db.init_app(app)
+    return app
+
+def seed_catalog(n_products, n_categories=20, seed=42, batch_size=5000):
+    """Recreate the tables and generate a synthetic catalog. Must run in an app context."""
+    db.drop_all()
+    db.create_all()
+    return generate_catalog(n_products, n_categories, seed=seed, batch_size=batch_size)
+
+def timed(fn, repeat):
+    """Call ``fn`` ``repeat`` times and return per-call latencies in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples):
+    return {
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+    }
@@ -0,0 +1,146 @@
+"""
+Stock Reservation Stress Test
+
+Runs a simulated flash sale: many threads reserve, commit and release
+random baskets against a handful of low-stock products, while one thread
+sweeps expired reservations. At the end it checks the invariants and exits
+non-zero if one is broken:
+
+- no product's stock ever goes negative (no oversell);
+- for every product, stock + quantity held by active or committed
+  reservations equals the initial stock (no stock lost or created).
+
+    python -m benchmarks.stress_reservations --threads 32 --checkouts 2000
+    python -m benchmarks.stress_reservations --database-url postgresql://...
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from app import db
+from app.models import Product, StockReservation
+from app.services.inventory_service import InventoryService
+from app.utils.exceptions import InsufficientStockError
+from .common import create_bench_app, seed_catalog, summarize
+
+def check_invariants(initial):
+    """Return a list of invariant violations (empty when consistent)."""
+    stock = dict(db.session.execute(select(Product.id, Product.stock)).all())
+    held = dict(db.session.execute(
+        select(StockReservation.product_id, func.sum(StockReservation.quantity))
+        .where(StockReservation.status.in_(('active', 'committed')))
+        .group_by(StockReservation.product_id)
+    ).all())
+    problems = []
+    for product_id, start in initial.items():
+        if stock[product_id] < 0:
+            problems.append(f'product {product_id}: negative stock {stock[product_id]}')
+        if stock[product_id] + (held.get(product_id) or 0) != start:
+            problems.append(
+                f'product {product_id}: stock {stock[product_id]} + held {held.get(product_id) or 0} != {start}'
+            )
+    return problems
+
+def run(args):
+    engine_options = {}
+    if not args.database_url:
+        # SQLite serializes writers; wait for the lock instead of failing
+        engine_options = {'connect_args': {'timeout': 30}}
+    app = create_bench_app(args.database_url, SQLALCHEMY_ENGINE_OPTIONS=engine_options)
+
+    with app.app_context():
+        seed_catalog(args.products, n_categories=2, seed=args.seed)
+        db.session.execute(Product.__table__.update().values(stock=args.stock, is_active=True))
+        db.session.commit()
+        initial = dict(db.session.execute(select(Product.id, Product.stock)).all())
+        product_ids = sorted(initial)
+
+    counters = {'reserved': 0, 'rejected': 0, 'committed': 0, 'released': 0, 'errors': 0}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def count(key):
+        with lock:
+            counters[key] += 1
+
+    def checkout(index):
+        rng = random.Random(args.seed + index)
+        basket = [
+            {'product_id': product_id, 'quantity': rng.randint(1, args.max_quantity)}
+            for product_id in rng.sample(product_ids, rng.randint(1, min(4, len(product_ids))))
+        ]
+        with app.app_context():
+            start = time.perf_counter()
+            try:
+                reservation = InventoryService.reserve(basket, ttl_seconds=rng.choice((1, 60)))
+                count('reserved')
+                outcome = rng.random()
+                if outcome < 0.5:
+                    InventoryService.commit(reservation['reservation_id'], order_id=index)
+                    count('committed')
+                elif outcome < 0.8:
+                    InventoryService.release(reservation['reservation_id'])
+                    count('released')
+                # The rest are abandoned and left to the sweeper
+            except InsufficientStockError:
+                count('rejected')
+            except Exception as e:
+                count('errors')
+                print(f'checkout {index}: {type(e).__name__}: {e}', file=sys.stderr)
+            finally:
+                db.session.remove()
+            return (time.perf_counter() - start) * 1000
+
+    def sweep():
+        with app.app_context():
+            while not done.is_set():
+                InventoryService.release_expired()
+                db.session.remove()
+                done.wait(0.2)
+
+    sweeper = threading.Thread(target=sweep, daemon=True)
+    sweeper.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        samples = list(executor.map(checkout, range(args.checkouts)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    sweeper.join()
+
+    with app.app_context():
+        problems = check_invariants(initial)
+
+    return {
+        'threads': args.threads,
+        'checkouts': args.checkouts,
+        'checkouts_per_sec': round(args.checkouts / elapsed, 2),
+        **counters,
+        **summarize(samples),
+    }, problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database-url', help='Defaults to a temporary SQLite file.')
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--checkouts', type=int, default=2000)
+    parser.add_argument('--products', type=int, default=5)
+    parser.add_argument('--stock', type=int, default=200)
+    parser.add_argument('--max-quantity', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    result, problems = run(args)
+    print(json.dumps(result, indent=2))
+    if problems or result['errors']:
+        for problem in problems:
+            print(f'INVARIANT BROKEN: {problem}', file=sys.stderr)
+        sys.exit(1)
+    print('Invariants hold: no oversell, stock conserved.')
+
+if __name__ == '__main__':
+    main()
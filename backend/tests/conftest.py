@@ -0,0 +1,38 @@
+"""
+Shared fixtures: a bare app with the product and auth blueprints on a
+throwaway SQLite database, seeded with a small synthetic catalog.
+"""
+
+import pytest
+from flask_jwt_extended import JWTManager
+from app import db
+from app.routes.auth import auth_bp
+from app.routes.product import product_bp
+from app.utils import json_provider
+from benchmarks.bench_endpoints import StatementCounter
+from benchmarks.common import create_bench_app, seed_catalog
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_bench_app(
+        RESPONSE_CACHE_ENABLED=False,
+        PASSWORD_HASH_POOL_SIZE=0,
+        SUGGEST_WARM_ON_STARTUP=False,
+    )
+    JWTManager(app)
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(product_bp, url_prefix='/api/products')
+    json_provider.init_app(app)
+    with app.app_context():
+        seed_catalog(500, 10)
+    return app
+
+@pytest.fixture(scope='session')
+def statements(app):
+    """Counts the SQL statements the current thread runs."""
+    with app.app_context():
+        return StatementCounter(db.engine)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
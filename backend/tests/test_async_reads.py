@@ -0,0 +1,42 @@
+"""
+Async read path: the async endpoints answer like the sync ones, including
+sparse field sets, whose products are detached by the time they are
+serialized.
+"""
+
+from argparse import Namespace
+import pytest
+from sqlalchemy import select
+from app import db
+from app.models import Product
+from benchmarks.bench_async_reads import build_app
+from benchmarks.common import seed_catalog
+
+@pytest.fixture(scope='module')
+def async_client():
+    app = build_app(Namespace(database_url=None, workers=4))
+    with app.app_context():
+        seed_catalog(200, 8)
+        product_id = db.session.execute(select(Product.id).order_by(Product.id)).scalars().first()
+    return app.test_client(), product_id
+
+@pytest.mark.parametrize('query', [
+    '?per_page=20',
+    '?per_page=20&fields=id,name',
+    '?per_page=20&fields=id,name,category',
+    '?per_page=20&search=steel&include_facets=true&fields=id,price',
+])
+def test_listing_matches_the_sync_endpoint(async_client, query):
+    client, _ = async_client
+    sync = client.get(f'/api/products/products{query}')
+    response = client.get(f'/api/async/products{query}')
+    assert response.status_code == 200
+    assert response.get_json() == sync.get_json()
+
+@pytest.mark.parametrize('fields', ['', '?fields=name', '?fields=id,category'])
+def test_detail_matches_the_sync_endpoint(async_client, fields):
+    client, product_id = async_client
+    sync = client.get(f'/api/products/products/{product_id}{fields}')
+    response = client.get(f'/api/async/products/{product_id}{fields}')
+    assert response.status_code == 200
+    assert response.get_json() == sync.get_json()
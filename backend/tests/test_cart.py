@@ -0,0 +1,29 @@
+"""
+Cart quotes: anonymous clients can't send unbounded carts, and missing
+products stay missing when served from the snapshot cache.
+"""
+
+from sqlalchemy import select
+from app import db
+from app.models import Product
+from app.services.cart_service import MAX_CART_LINES
+
+def _product_id(app):
+    with app.app_context():
+        return db.session.execute(select(Product.id).order_by(Product.id)).scalars().first()
+
+def test_quote_lines_are_capped(app, client):
+    line = {'product_id': _product_id(app), 'quantity': 1}
+    response = client.post('/api/products/products/cart/quote', json={'items': [line] * MAX_CART_LINES})
+    assert response.status_code == 200
+
+    response = client.post('/api/products/products/cart/quote', json={'items': [line] * (MAX_CART_LINES + 1)})
+    assert response.status_code == 400
+
+def test_missing_products_are_cached_as_missing(app, client):
+    items = [{'product_id': _product_id(app), 'quantity': 1}, {'product_id': 10 ** 9, 'quantity': 1}]
+    for _ in range(2):
+        response = client.post('/api/products/products/cart/quote', json={'items': items})
+        assert response.status_code == 200
+        assert response.get_json()['missing'] == [10 ** 9]
+        assert len(response.get_json()['lines']) == 1
@@ -0,0 +1,43 @@
+"""
+Catalog import: blank optional cells keep the stored values, and prices
+must be finite.
+"""
+
+import io
+import pytest
+from app import db
+from app.models import Category, Product
+from app.services.import_service import ProductImportService
+from benchmarks.common import create_bench_app
+
+@pytest.fixture
+def catalog():
+    app = create_bench_app(PASSWORD_HASH_POOL_SIZE=0)
+    with app.app_context():
+        db.create_all()
+        category = Category(name='Pipes', slug='pipes')
+        db.session.add(category)
+        db.session.commit()
+        yield category.id
+        db.session.remove()
+
+def import_csv(text):
+    return ProductImportService.import_products(io.BytesIO(text.encode()), 'csv')
+
+def test_blank_optional_cells_keep_existing_values(catalog):
+    header = 'name,slug,price,category_id,stock,is_active,description\n'
+    report = import_csv(header + f'Pipe,pipe,10.5,{catalog},7,false,Galvanised\n')
+    assert report['upserted'] == 1
+
+    report = import_csv(header + f'Pipe 2m,pipe,12,{catalog},,,\n')
+    assert report['upserted'] == 1
+    product = Product.query.filter_by(slug='pipe').one()
+    assert (product.name, product.price) == ('Pipe 2m', 12)
+    assert (product.stock, product.is_active, product.description) == (7, False, 'Galvanised')
+
+@pytest.mark.parametrize('price', ['nan', 'inf', '-inf'])
+def test_non_finite_prices_are_rejected(catalog, price):
+    report = import_csv(f'name,slug,price,category_id\nPipe,pipe,{price},{catalog}\n')
+    assert report['upserted'] == 0
+    assert report['failed'] == 1
+    assert Product.query.count() == 0
@@ -0,0 +1,55 @@
+"""
+The product listing runs a fixed number of statements whatever the page
+size, batch lookups take one round trip, and the catalog endpoints stay
+within their statement budgets.
+"""
+
+import json
+import pytest
+from benchmarks.bench_endpoints import DEFAULT_BUDGETS as BUDGETS
+
+PAGE_SIZES = (1, 10, 100)
+
+def count_statements(client, statements, url):
+    statements.reset()
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return statements.count
+
+@pytest.mark.parametrize('query', [
+    '',
+    '&fields=id,name,price',
+    '&fields=id,name,category',
+    '&cursor=',
+    '&include_facets=true',
+    '&search=steel',
+])
+def test_listing_statements_do_not_grow_with_page_size(client, statements, query):
+    # Fill the category and facet caches first
+    count_statements(client, statements, f'/api/products/products?per_page=1{query}')
+
+    counts = {
+        per_page: count_statements(client, statements, f'/api/products/products?per_page={per_page}{query}')
+        for per_page in PAGE_SIZES
+    }
+    assert len(set(counts.values())) == 1, counts
+
+@pytest.mark.parametrize('query', ['&view=availability', '&fields=id,name,price', ''])
+def test_batch_lookup_is_one_statement(client, statements, query):
+    ids = ','.join(str(product_id) for product_id in range(1, 11))
+    assert count_statements(client, statements, f'/api/products/products/batch?ids={ids}{query}') == 1
+
+@pytest.mark.parametrize('name, url', [
+    ('categories', '/api/products/categories'),
+    ('category_tree', '/api/products/categories?tree=true'),
+    ('category_detail', '/api/products/categories/1'),
+])
+def test_category_endpoints_meet_their_statement_budget(client, statements, name, url):
+    with open(BUDGETS) as f:
+        budget = json.load(f)['endpoints'][name]['max_statements']
+    assert count_statements(client, statements, url) <= budget
+
+def test_warm_category_menu_runs_no_statements(client, statements):
+    count_statements(client, statements, '/api/products/categories?tree=true')
+    # The validator reads cache tag versions and the tree comes from the row cache
+    assert count_statements(client, statements, '/api/products/categories?tree=true') == 0
@@ -0,0 +1,104 @@
+"""
+The email outbox against a local SMTP stand-in (aiosmtpd): messages
+commit with the caller's transaction, are delivered in a batch over one
+connection, and failures back off and dead-letter.
+"""
+
+import socket
+from datetime import datetime, timedelta
+import pytest
+from aiosmtpd.controller import Controller
+from app import db
+from app.models.email_outbox import EmailOutbox
+from app.services.outbox_service import OutboxService
+from app.utils.email import enqueue_email, mail
+from benchmarks.common import create_bench_app
+
+class RecordingHandler:
+    def __init__(self):
+        self.envelopes = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return '250 Message accepted for delivery'
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def smtp():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+@pytest.fixture
+def outbox_app(smtp):
+    controller, _ = smtp
+    app = create_bench_app(
+        MAIL_SERVER=controller.hostname,
+        MAIL_PORT=controller.port,
+        MAIL_USE_TLS=False,
+        MAIL_SUPPRESS_SEND=False,
+        MAIL_DEFAULT_SENDER='shop@example.com',
+        OUTBOX_MAX_ATTEMPTS=2,
+    )
+    mail.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+def test_messages_commit_with_the_callers_transaction(outbox_app, smtp):
+    _, handler = smtp
+    enqueue_email('Rolled back', 'a@example.com', body='never sent')
+    db.session.rollback()
+    enqueue_email('Committed', 'b@example.com', body='sent')
+    db.session.commit()
+
+    assert OutboxService.run_once() == 1
+    assert [envelope.rcpt_tos for envelope in handler.envelopes] == [['b@example.com']]
+    message = EmailOutbox.query.one()
+    assert (message.status, message.attempts) == ('sent', 1)
+
+def test_batch_is_delivered_over_one_connection(outbox_app, smtp):
+    _, handler = smtp
+    for index in range(5):
+        enqueue_email(f'Message {index}', f'user{index}@example.com', body='hi')
+    db.session.commit()
+
+    assert OutboxService.run_once() == 5
+    assert len(handler.envelopes) == 5
+    assert EmailOutbox.query.filter_by(status='sent').count() == 5
+
+def test_failures_back_off_then_dead_letter(outbox_app):
+    outbox_app.config['MAIL_PORT'] = free_port()  # nothing listens here
+    # Flask-Mail copies its settings at init_app
+    mail.init_app(outbox_app)
+    enqueue_email('Unreachable', 'c@example.com', body='hi', commit=True)
+
+    assert OutboxService.run_once() == 1
+    message = EmailOutbox.query.one()
+    assert (message.status, message.attempts) == ('pending', 1)
+    assert message.next_attempt_at > datetime.utcnow()
+
+    message.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    OutboxService.run_once()
+    db.session.refresh(message)
+    assert (message.status, message.attempts) == ('dead', 2)
+
+def test_claims_count_as_attempts(outbox_app):
+    enqueue_email('Crashing worker', 'd@example.com', body='hi', commit=True)
+    for _ in range(2):
+        # A worker claims the message and dies before recording a result
+        assert len(OutboxService.claim_batch()) == 1
+        EmailOutbox.query.update({'next_attempt_at': datetime.utcnow() - timedelta(seconds=1)})
+        db.session.commit()
+
+    assert OutboxService.claim_batch() == []
+    message = EmailOutbox.query.one()
+    assert (message.status, message.attempts) == ('dead', 3)
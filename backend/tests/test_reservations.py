@@ -0,0 +1,83 @@
+"""
+Stock reservations: a concurrent flash sale never oversells, and
+per-user limits stop one account from holding the stock.
+"""
+
+from argparse import Namespace
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from app import db
+from app.models import Product, StockReservation, User
+from app.services.inventory_service import InventoryService
+from app.utils.exceptions import ReservationLimitError, ResourceNotFoundError, ValidationError
+from benchmarks.common import create_bench_app, seed_catalog
+from benchmarks.stress_reservations import run
+
+def test_flash_sale_never_oversells():
+    result, problems = run(Namespace(
+        database_url=None, threads=16, checkouts=400, products=3,
+        stock=40, max_quantity=3, seed=7,
+    ))
+    assert problems == []
+    assert result['errors'] == 0
+    # The sale sold out, so checkouts really competed for the last units
+    assert result['rejected'] > 0
+
+@pytest.fixture
+def shop():
+    app = create_bench_app(
+        PASSWORD_HASH_POOL_SIZE=0,
+        RESERVATION_MAX_LINES=2,
+        RESERVATION_MAX_QUANTITY=5,
+        RESERVATION_MAX_OPEN=2,
+    )
+    with app.app_context():
+        seed_catalog(5, n_categories=2)
+        db.session.execute(Product.__table__.update().values(stock=100, is_active=True))
+        user = User(email='buyer@example.com', name='Buyer')
+        db.session.add(user)
+        db.session.commit()
+        product_ids = db.session.execute(select(Product.id).order_by(Product.id)).scalars().all()
+        yield user.id, product_ids
+        db.session.remove()
+
+def test_lines_and_quantities_are_capped(shop):
+    user_id, product_ids = shop
+    with pytest.raises(ValidationError):
+        InventoryService.reserve(
+            [{'product_id': product_id, 'quantity': 1} for product_id in product_ids[:3]], user_id=user_id
+        )
+    with pytest.raises(ValidationError):
+        InventoryService.reserve([{'product_id': product_ids[0], 'quantity': 6}], user_id=user_id)
+    # Repeated lines are merged before the cap applies
+    with pytest.raises(ValidationError):
+        InventoryService.reserve([{'product_id': product_ids[0], 'quantity': 3}] * 2, user_id=user_id)
+    assert db.session.get(Product, product_ids[0]).stock == 100
+
+def test_open_reservations_are_capped_per_user(shop):
+    user_id, product_ids = shop
+    line = [{'product_id': product_ids[0], 'quantity': 5}]
+    first = InventoryService.reserve(line, user_id=user_id)
+    InventoryService.reserve(line, user_id=user_id)
+    with pytest.raises(ReservationLimitError):
+        InventoryService.reserve(line, user_id=user_id)
+
+    # Other users are not affected, and releasing frees a slot
+    InventoryService.reserve(line, user_id=None)
+    InventoryService.release(first['reservation_id'], user_id=user_id)
+    InventoryService.reserve(line, user_id=user_id)
+    assert db.session.get(Product, product_ids[0]).stock == 85
+
+def test_expired_reservations_cannot_be_committed(shop):
+    user_id, product_ids = shop
+    reservation = InventoryService.reserve([{'product_id': product_ids[0], 'quantity': 2}], user_id=user_id)
+    StockReservation.query.filter_by(reservation_id=reservation['reservation_id']).update(
+        {'expires_at': datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.session.commit()
+
+    with pytest.raises(ResourceNotFoundError):
+        InventoryService.commit(reservation['reservation_id'])
+    statuses = {row.status for row in StockReservation.query.filter_by(reservation_id=reservation['reservation_id'])}
+    assert statuses == {'active'}
@@ -0,0 +1,54 @@
+"""
+Suggest index: concurrent first lookups share one build, and the app only
+warms the index once it serves a request.
+"""
+
+import threading
+from app import db
+from app.services import suggest_service
+from app.services.suggest_service import SuggestService
+from benchmarks.common import create_bench_app, seed_catalog
+
+class CountingSuggestService(SuggestService):
+    def __init__(self, app):
+        super().__init__(app)
+        self.builds = 0
+
+    def _build(self):
+        self.builds += 1
+        super()._build()
+
+def test_concurrent_lookups_build_the_index_once(app):
+    service = CountingSuggestService(app)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def lookup():
+        with app.app_context():
+            barrier.wait()
+            results.append(service.suggest('s'))
+            db.session.remove()
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.builds == 1
+    assert len(results) == 8
+    assert all(result['suggestions'] for result in results)
+
+def test_index_is_warmed_on_the_first_request():
+    app = create_bench_app(PASSWORD_HASH_POOL_SIZE=0)
+    with app.app_context():
+        seed_catalog(50, 5)
+    suggest_service.init_app(app)
+    # Creating the app (as CLI commands do) starts no build
+    assert 'edhaus_suggest' not in app.extensions
+
+    app.test_client().get('/')
+    for thread in threading.enumerate():
+        if thread.name == 'suggest-warm':
+            thread.join(timeout=10)
+    assert app.extensions['edhaus_suggest'].index is not None
@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useReducer, useEffect } from 'react';
+import { productService } from '../services/productService';
 
 export const CartContext = createContext(null);
 
@@ -74,6 +75,25 @@ const cartReducer = (state, action) => {
       };
     }
 
+    case 'REFRESH_ITEMS': {
+      // Drop products that no longer exist and take current prices and stock
+      const latest = new Map(action.payload.items.map(product => [product.id, product]));
+      const missing = new Set(action.payload.missing);
+      const newItems = state.items
+        .filter(item => !missing.has(item.id))
+        .map(item => {
+          const product = latest.get(item.id);
+          return product
+            ? { ...item, price: product.price, stock: product.stock, available: product.available }
+            : item;
+        });
+
+      return {
+        items: newItems,
+        ...calculateTotals(newItems)
+      };
+    }
+
     case 'CLEAR_CART':
       return initialState;
 
@@ -91,14 +111,29 @@ const cartReducer = (state, action) => {
 export const CartProvider = ({ children }) => {
   const [state, dispatch] = useReducer(cartReducer, initialState);
 
-  // Load cart from localStorage on mount
+  // Load cart from localStorage on mount, then refresh it in one request
   useEffect(() => {
     const savedCart = localStorage.getItem('cart');
     if (savedCart) {
-      dispatch({ type: 'LOAD_CART', payload: JSON.parse(savedCart) });
+      const cart = JSON.parse(savedCart);
+      dispatch({ type: 'LOAD_CART', payload: cart });
+      refreshCart(cart.items);
     }
   }, []);
 
+  const refreshCart = async (items = state.items) => {
+    if (!items.length) return;
+    try {
+      const data = await productService.getProductsBatch(
+        items.map(item => item.id),
+        { view: 'availability' }
+      );
+      dispatch({ type: 'REFRESH_ITEMS', payload: data });
+    } catch (error) {
+      console.error('Error refreshing cart:', error);
+    }
+  };
+
   // Save cart to localStorage whenever it changes
   useEffect(() => {
     localStorage.setItem('cart', JSON.stringify(state));
@@ -142,7 +177,8 @@ export const CartProvider = ({ children }) => {
         addToCart,
         updateQuantity,
         removeFromCart,
-        clearCart
+        clearCart,
+        refreshCart
       }}
     >
       {children}
@@ -23,6 +23,45 @@ export const productService = {
     }
   },
 
+  // Get many products in one request; missing ids are listed, not errors
+  getProductsBatch: async (ids, params = {}) => {
+    try {
+      const response = await api.get('/products/batch', {
+        params: { ...params, ids: ids.join(',') }
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching products batch:', error);
+      throw error;
+    }
+  },
+
+  // Price the cart on the server: line totals, subtotal and stock shortfalls
+  quoteCart: async (items) => {
+    try {
+      const response = await api.post('/products/cart/quote', {
+        items: items.map(item => ({ product_id: item.id, quantity: item.quantity }))
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error quoting cart:', error);
+      throw error;
+    }
+  },
+
+  // Autocomplete the search box; `corrected` is set when a typo was fixed
+  suggest: async (q, limit = 8) => {
+    try {
+      const response = await api.get('/products/suggest', {
+        params: { q, limit }
+      });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching suggestions:', error);
+      throw error;
+    }
+  },
+
   // Get products by category
   getProductsByCategory: async (categoryId, params = {}) => {
     try {